@@ -0,0 +1,365 @@
+from collections import OrderedDict
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView, QLabel, QSpinBox, QSizePolicy
+)
+from PyQt5.QtGui import QFont, QImage, QPixmap, QPainter, QColor
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QObject, QThread, QRectF, pyqtSignal
+
+from MemoryTracker import format_bytes
+
+
+
+TILE_ROWS = 64
+TILE_COLS = 32
+CHUNK_BYTES = 64 * 1024 * 1024
+THUMBNAIL_SIZE = 128
+HISTOGRAM_BINS = 64
+
+# stats threads outlive a closed viewer until their current chunk is done
+_running_threads = set()
+
+class ArrayTableModel(QAbstractTableModel):
+    """
+    Windowed grid over a 2-D slice of a NumPy array (or memmap).
+
+    Qt only asks for visible cells; the model reads them in TILE_ROWS x TILE_COLS
+    tiles with one vectorized slice per tile and keeps the last tiles in a small
+    LRU, so scrolling a memmap touches only the pages on screen.
+    1-D arrays are shown as a single column, arrays with more dimensions show the
+    slice selected by `leading` (indices of all but the last two axes).
+    """
+
+    max_tiles = 64
+
+    def __init__(self, array, parent=None):
+        super().__init__(parent)
+        self.array = array
+        self.leading = (0,) * max(array.ndim - 2, 0)
+        self.tiles = OrderedDict()
+
+    def view(self):
+        if self.array.ndim == 0:
+            return self.array.reshape(1, 1)
+        if self.array.ndim == 1:
+            return self.array.reshape(-1, 1)
+        if self.array.size == 0 and 0 in self.array.shape[:-2]:
+            return self.array.reshape(0, 0)  # no slice to select
+        return self.array[self.leading]
+
+    def set_leading(self, leading):
+        self.beginResetModel()
+        self.leading = tuple(leading)
+        self.tiles.clear()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.view().shape[0]
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.view().shape[1]
+
+    def tile(self, row, col):
+        key = (row // TILE_ROWS, col // TILE_COLS)
+        tile = self.tiles.get(key)
+        if tile is None:
+            r0, c0 = key[0] * TILE_ROWS, key[1] * TILE_COLS
+            tile = self.view()[r0:r0 + TILE_ROWS, c0:c0 + TILE_COLS].tolist()
+            self.tiles[key] = tile
+            if len(self.tiles) > self.max_tiles:
+                self.tiles.popitem(last=False)
+        else:
+            self.tiles.move_to_end(key)
+        return tile[row % TILE_ROWS][col % TILE_COLS]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            value = self.tile(index.row(), index.column())
+            return f"{value:.6g}" if isinstance(value, float) else str(value)
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignRight | Qt.AlignVCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            return str(section)
+        return None
+
+class ArrayStatsWorker(QObject):
+    """
+    Computes the array summary off the GUI thread.
+
+    - Pass 1 walks axis 0 in chunks of about CHUNK_BYTES and reduces each chunk
+      with vectorized min / max / sum over its finite values, so a memmap is
+      streamed from disk once instead of being loaded whole.
+    - Pass 2 accumulates a fixed-bin histogram over the same chunks.
+    - The heatmap thumbnail is a strided sample of at most THUMBNAIL_SIZE^2 values
+      of the 2-D slice, normalized to a grayscale QImage (QImage is safe to build
+      outside the GUI thread, QPixmap is not).
+    """
+
+    progress = pyqtSignal(float)
+    finished = pyqtSignal(object)
+
+    def __init__(self, array, leading=()):
+        super().__init__()
+        self.array = array
+        self.leading = leading
+        self._stop_request = False
+
+    def stop(self):
+        self._stop_request = True
+
+    def chunks(self):
+        array = self.array.reshape(-1) if self.array.ndim == 0 else self.array
+        # chunks are converted to float64, so size them by that, not by the stored dtype
+        row_bytes = max(array[:1].size * 8, 1)
+        step = max(1, CHUNK_BYTES // row_bytes)
+        for start in range(0, array.shape[0], step):
+            if self._stop_request:
+                return
+            yield start / max(array.shape[0], 1), array[start:start + step]
+
+    def run(self):
+        import numpy as np
+
+        result = {"shape": self.array.shape, "dtype": str(self.array.dtype), "nbytes": self.array.nbytes}
+        try:
+            # complex values have no order; casting them to float would drop the imaginary part
+            numeric = np.issubdtype(self.array.dtype, np.number) or self.array.dtype == np.bool_
+            if not numeric or np.iscomplexobj(self.array) or self.array.size == 0:
+                self.finished.emit(result)
+                return
+
+            low, high, total, count, nans = None, None, 0.0, 0, 0
+            for done, chunk in self.chunks():
+                chunk = np.asarray(chunk, dtype=np.float64)
+                finite = np.isfinite(chunk)
+                n = int(finite.sum())
+                nans += chunk.size - n
+                if n:
+                    values = chunk[finite]
+                    low = values.min() if low is None else min(low, values.min())
+                    high = values.max() if high is None else max(high, values.max())
+                    total += float(values.sum())
+                    count += n
+                self.progress.emit(done / 2)
+            if self._stop_request:
+                self.finished.emit(result)
+                return
+
+            result.update({
+                "min": low, "max": high,
+                "mean": total / count if count else None,
+                "non_finite": nans,
+            })
+
+            if count and high > low:
+                histogram = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+                for done, chunk in self.chunks():
+                    chunk = np.asarray(chunk, dtype=np.float64)
+                    histogram += np.histogram(chunk[np.isfinite(chunk)], bins=HISTOGRAM_BINS, range=(low, high))[0]
+                    self.progress.emit(0.5 + done / 2)
+                if self._stop_request:
+                    self.finished.emit(result)
+                    return
+                result["histogram"] = histogram.tolist()
+                result["heatmap"] = self.heatmap(low, high)
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+
+        self.finished.emit(result)
+
+    def heatmap(self, low, high):
+        import numpy as np
+
+        if self.array.ndim < 2:
+            return None
+        view = self.array[self.leading]
+        step_r = max(1, -(-view.shape[0] // THUMBNAIL_SIZE))
+        step_c = max(1, -(-view.shape[1] // THUMBNAIL_SIZE))
+        sample = np.asarray(view[::step_r, ::step_c], dtype=np.float64)
+        scaled = np.nan_to_num((sample - low) / (high - low) * 255.0, nan=0.0, posinf=255.0, neginf=0.0)
+        pixels = np.ascontiguousarray(np.clip(scaled, 0, 255).astype(np.uint8))
+        h, w = pixels.shape
+        return QImage(pixels.data, w, h, w, QImage.Format_Grayscale8).copy()
+
+class HistogramChart(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.counts = []
+        self.setFixedSize(220, THUMBNAIL_SIZE)
+
+    def set_counts(self, counts):
+        self.counts = counts
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#f8f8f8"))
+        if not self.counts:
+            return
+        peak = max(self.counts) or 1
+        w = self.width() / len(self.counts)
+        for i, c in enumerate(self.counts):
+            h = (c / peak) * (self.height() - 4)
+            painter.fillRect(QRectF(i * w, self.height() - h, max(w - 1, 1), h), QColor("#1e88e5"))
+
+class ArrayViewer(QWidget):
+    """
+    Viewer for numpy.ndarray / numpy.memmap values, used as the array output of
+    code cells and from the variable inspector.
+
+    Shows shape / dtype / size at once, a windowed grid (ArrayTableModel), and
+    min / max / mean with a histogram and a downsampled heatmap once the
+    ArrayStatsWorker is done. For arrays with more than two dimensions, spin
+    boxes pick the 2-D slice that is shown.
+
+    Methods:
+    - set_array(array): Shows another array and restarts the statistics.
+    """
+
+    def __init__(self, array=None, parent=None, title=""):
+        super().__init__(parent)
+        if title:
+            self.setWindowTitle(title)
+        self.worker = None
+        self.array = None
+        self.stats_stale = False  # the statistics were stopped by hiding the viewer
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(4, 4, 4, 4)
+
+        self.info = QLabel()
+        self.info.setFont(QFont("Segoe UI", 10, QFont.Bold))
+        layout.addWidget(self.info)
+
+        previews = QHBoxLayout()
+        self.heatmap = QLabel()
+        self.heatmap.setFixedSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+        self.heatmap.setAlignment(Qt.AlignCenter)
+        self.heatmap.setStyleSheet("background:#f8f8f8;")
+        self.histogram = HistogramChart()
+        self.stats = QLabel("Computing statistics ...")
+        self.stats.setFont(QFont("Segoe UI", 10))
+        self.stats.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        previews.addWidget(self.heatmap)
+        previews.addWidget(self.histogram)
+        previews.addWidget(self.stats, 1)
+        layout.addLayout(previews)
+
+        self.slice_bar = QHBoxLayout()
+        layout.addLayout(self.slice_bar)
+        self.slice_spins = []
+
+        self.table = QTableView()
+        self.table.setFont(QFont("Consolas", 10))
+        self.table.setAlternatingRowColors(True)
+        self.table.verticalHeader().setDefaultSectionSize(20)
+        self.table.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+
+        if array is not None:
+            self.set_array(array)
+
+    def set_array(self, array):
+        self.array = array
+        self.model = ArrayTableModel(array, self)
+        self.table.setModel(self.model)
+
+        kind = "memmap" if type(array).__name__ == "memmap" else "ndarray"
+        self.info.setText(f"{kind}  shape={array.shape}  dtype={array.dtype}  size={format_bytes(array.nbytes)}")
+
+        while self.slice_spins:
+            spin = self.slice_spins.pop()
+            self.slice_bar.removeWidget(spin)
+            spin.deleteLater()
+        # an empty leading axis leaves nothing to pick, ArrayTableModel shows an empty grid
+        slice_axes = max(array.ndim - 2, 0) if 0 not in array.shape[:-2] else 0
+        for axis in range(slice_axes):
+            spin = QSpinBox()
+            spin.setPrefix(f"axis {axis}: ")
+            spin.setRange(0, array.shape[axis] - 1)
+            spin.valueChanged.connect(self.slice_changed)
+            self.slice_bar.addWidget(spin)
+            self.slice_spins.append(spin)
+
+        self.start_worker()
+
+    def slice_changed(self):
+        self.model.set_leading(spin.value() for spin in self.slice_spins)
+        self.start_worker()
+
+    def stop_worker(self):
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
+
+    def closeEvent(self, event):
+        self.stop_worker()
+        super().closeEvent(event)
+
+    def hideEvent(self, event):
+        if self.worker is not None:
+            self.stop_worker()
+            self.stats_stale = True
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.stats_stale and self.array is not None:
+            self.start_worker()
+
+    def start_worker(self):
+        self.stop_worker()
+        self.stats_stale = False
+        self.stats.setText("Computing statistics ...")
+        self.heatmap.clear()
+        self.histogram.set_counts([])
+
+        worker = ArrayStatsWorker(self.array, self.model.leading)
+        thread = QThread()
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self.show_progress)
+        worker.finished.connect(self.show_stats)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(lambda t=thread, w=worker: _running_threads.discard((t, w)))
+        _running_threads.add((thread, worker))
+        # a lambda runs in the emitting thread; worker.stop itself would be queued behind run()
+        self.destroyed.connect(lambda *_, w=worker: w.stop())
+        self.worker = worker
+        thread.start()
+
+    def show_progress(self, fraction):
+        if self.sender() is self.worker:
+            self.stats.setText(f"Computing statistics ... {fraction:.0%}")
+
+    def show_stats(self, result):
+        if self.sender() is not self.worker:
+            return  # a previous slice or array
+        self.worker = None
+
+        if "error" in result:
+            self.stats.setText(f"Statistics failed: {result['error']}")
+            return
+        if "min" not in result:
+            self.stats.setText("Empty array" if 0 in result["shape"] else "No numeric statistics for this dtype")
+            return
+
+        lines = [
+            f"min:  {result['min']:.6g}" if result["min"] is not None else "min:  n/a",
+            f"max:  {result['max']:.6g}" if result["max"] is not None else "max:  n/a",
+            f"mean: {result['mean']:.6g}" if result["mean"] is not None else "mean: n/a",
+        ]
+        if result["non_finite"]:
+            lines.append(f"NaN/inf: {result['non_finite']:,}")
+        self.stats.setText("\n".join(lines))
+
+        self.histogram.set_counts(result.get("histogram") or [])
+        heatmap = result.get("heatmap")
+        if heatmap is not None:
+            self.heatmap.setPixmap(QPixmap.fromImage(heatmap).scaled(
+                THUMBNAIL_SIZE, THUMBNAIL_SIZE, Qt.KeepAspectRatio, Qt.FastTransformation))
@@ -0,0 +1,197 @@
+import io, sys, math, time, statistics, hashlib
+from contextlib import redirect_stdout, redirect_stderr
+from nbformat.v4 import new_output
+from PyQt5.QtCore import pyqtSignal, QObject
+from ResourceLimits import CellGuard
+
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "n/a"
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+def compute_statistics(timings):
+    """
+    Returns min / median / p95 / mean / stddev of a list of per-loop timings (seconds).
+    p95 uses linear interpolation between the closest ranks.
+    """
+    ordered = sorted(timings)
+    n = len(ordered)
+    rank = 0.95 * (n - 1)
+    low = int(math.floor(rank))
+    high = min(low + 1, n - 1)
+    p95 = ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+    return {
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "p95": p95,
+        "mean": statistics.fmean(ordered) if hasattr(statistics, "fmean") else statistics.mean(ordered),
+        "stddev": statistics.stdev(ordered) if n > 1 else 0.0,
+    }
+
+class BenchmarkRunner(QObject):
+    """
+    timeit-style replacement for CodeRunner used when a code cell is marked as a benchmark.
+
+    Behavior:
+    - Runs the cell once through the kernel so its normal outputs and definitions appear.
+    - Executes the compiled cell `warmup` more times, then auto-scales the loop count
+      (1, 2, 5, 10, 20, 50, ...) until one measurement takes at least `min_time` seconds,
+      exactly like timeit.Timer.autorange().
+    - Repeats the measurement `repeat` times and reports min / median / p95 / stddev
+      of the per-loop time as a stream output.
+
+    Signals and the stop() contract are the same as CodeRunner, so Cell can drive both
+    through the same QThread plumbing. The statistics are left in `benchmark_result`.
+    Like CodeRunner, the reference run and every timed repetition run under a
+    CellGuard, so Stop and the cell limits (timeout and memory per repetition,
+    output for the reference run) apply the same way; see `violation`.
+    """
+
+    finished = pyqtSignal(list)
+    stream = pyqtSignal(object)
+
+    def __init__(self, kernel, code, repeat=7, warmup=1, min_time=0.2, limits=None, deadline=None):
+        super().__init__()
+        self.kernel = kernel
+        self.code = code
+        self.repeat = max(1, int(repeat))
+        self.warmup = max(0, int(warmup))
+        self.min_time = min_time
+        self._stop_request = False
+        self.track_memory = False
+        self.memory_stats = None
+        self.benchmark_result = None
+        self.guard = CellGuard(limits, deadline)
+
+    def stop(self):
+        self._stop_request = True
+        self.guard.request_stop()
+
+    @property
+    def violation(self):
+        return self.guard.violation
+
+    def _time_loops(self, code_obj, user_ns, loops):
+        if self._stop_request:
+            raise KeyboardInterrupt("Execution stopped by user")
+        # the watchdog interrupts from another thread, the timed loop itself carries no checks
+        with self.guard.watching():
+            start = time.perf_counter()
+            for _ in range(loops):
+                exec(code_obj, user_ns)
+            return time.perf_counter() - start
+
+    def run(self):
+        shell = self.kernel.shell
+
+        # the guard reports a violation as an error output, which ends the benchmark here
+        outputs = self.guard.run(self.kernel, self.code, self.stream.emit)
+
+        try:
+            if any(out.output_type == "error" for out in outputs) or self._stop_request or self.violation:
+                self.finished.emit(outputs)
+                return
+
+            source = shell.transform_cell(self.code)
+            code_obj = compile(source, "<benchmark>", "exec")
+            user_ns = shell.user_ns
+            sink = io.StringIO()
+
+            with redirect_stdout(sink), redirect_stderr(sink):
+                for _ in range(self.warmup):
+                    self._time_loops(code_obj, user_ns, 1)
+
+                loops = 1
+                while True:
+                    for factor in (1, 2, 5):
+                        number = loops * factor
+                        elapsed = self._time_loops(code_obj, user_ns, number)
+                        if elapsed >= self.min_time:
+                            break
+                    else:
+                        loops *= 10
+                        continue
+                    break
+
+                timings = [elapsed / number]
+                for _ in range(self.repeat - 1):
+                    sink.seek(0)
+                    sink.truncate()
+                    timings.append(self._time_loops(code_obj, user_ns, number) / number)
+
+            stats = compute_statistics(timings)
+            stats.update({
+                "timestamp": time.time(),
+                "loops": number,
+                "repeat": self.repeat,
+                "warmup": self.warmup,
+                "source_hash": hashlib.sha1(self.code.encode("utf-8")).hexdigest()[:8],
+                "python": sys.version.split()[0],
+            })
+            self.benchmark_result = stats
+
+            report = (
+                f"⏱ Benchmark: {self.repeat} runs x {number} loops | "
+                f"min {format_duration(stats['min'])} | median {format_duration(stats['median'])} | "
+                f"p95 {format_duration(stats['p95'])} | std {format_duration(stats['stddev'])}"
+            )
+            out = new_output("stream", name="stdout", text=report)
+            outputs.append(out)
+            self.stream.emit(out)
+
+        except KeyboardInterrupt:
+            if self.violation is not None:
+                out = self.guard.error_output()
+                outputs.append(out)
+                self.stream.emit(out)
+        except Exception as e:
+            out = new_output("error", ename=type(e).__name__, evalue=str(e),
+                             traceback=[f"Benchmark failed: {type(e).__name__}: {e}"])
+            outputs.append(out)
+            self.stream.emit(out)
+
+        self.finished.emit(outputs)
+
+class BenchmarkStore:
+    """
+    Keeps benchmark history inside the notebook metadata (metadata.uranus.benchmarks).
+
+    History is keyed by the benchmark id stored on the cell, not by the source hash,
+    so a trend survives edits to the cell - which is the whole point when measuring
+    an optimization. Each record keeps the source hash it was measured with.
+
+    A run is flagged as a regression when its best time (min) is slower than the best
+    previous min by more than `threshold` (fraction, e.g. 0.10 for 10%).
+    """
+
+    max_records = 50
+
+    def __init__(self, notebook_metadata):
+        self.notebook_metadata = notebook_metadata
+
+    def _benchmarks(self):
+        return self.notebook_metadata.setdefault("uranus", {}).setdefault("benchmarks", {})
+
+    def history(self, bench_id):
+        return list(self._benchmarks().get(bench_id, []))
+
+    def record(self, bench_id, stats, threshold=0.10):
+        history = self._benchmarks().setdefault(bench_id, [])
+        record = dict(stats)
+        if history:
+            best = min(r["min"] for r in history)
+            record["change"] = (record["min"] - best) / best if best else 0.0
+            record["regression"] = record["change"] > threshold
+        else:
+            record["change"] = None
+            record["regression"] = False
+
+        history.append(record)
+        del history[:-self.max_records]
+        return record
@@ -0,0 +1,162 @@
+import os, re, base64, hashlib
+import nbformat
+
+
+
+MIME_EXT = {
+    "image/png": "png", "image/jpeg": "jpg", "image/gif": "gif",
+    "image/webp": "webp", "image/bmp": "bmp",
+}
+EXT_MIME = {ext: mime for mime, ext in MIME_EXT.items()}
+
+DATA_URI = re.compile(r"data:(image/(?:png|jpeg|gif|webp|bmp));base64,([A-Za-z0-9+/=\s]+)")
+BLOB_REF = re.compile(r"uranus-blob:([0-9a-f]{64})\.(\w+)")
+
+class BlobStore:
+    """
+    Content-addressed sidecar storage for notebook images.
+
+    With "Image Sidecar Storage" enabled, saving replaces every embedded image -
+    image outputs, markdown attachments and data: URIs inside doc cell HTML - by a
+    reference `uranus-blob:<sha256>.<ext>` and writes the bytes once to
+    `<notebook>.uranus_blobs/<sha256>.<ext>`. Identical images across cells and
+    saves are stored once, and unchanged images are not written again.
+
+    Cells always keep inline base64 in memory; inline_notebook() resolves the
+    references when a notebook is opened, and export (or saving with the option
+    off) writes a plain, Jupyter-compatible notebook.
+
+    Methods:
+    - externalize_notebook(nb, write=True): Replaces images by references in a freshly
+      built notebook; with write=False the references are computed but no blob is written.
+    - inline_notebook(nb): Replaces references by base64 (in place).
+    - prune(refs): Deletes blobs no longer referenced by the last save.
+    """
+
+    prefix = "uranus-blob:"
+    suffix = ".uranus_blobs"
+
+    def __init__(self, notebook_path=None):
+        self.directory = None
+        self._refs = {}   # base64 string -> reference, so unchanged images are not re-hashed
+        self.set_notebook_path(notebook_path)
+
+    def set_notebook_path(self, notebook_path):
+        self.directory = os.path.splitext(notebook_path)[0] + self.suffix if notebook_path else None
+
+    # ---- writing ----
+    def put(self, base64_data, mime, write=True):
+        ref = self._refs.get(base64_data)
+        if ref is not None and (not write or os.path.exists(self.blob_path(ref))):
+            return ref
+
+        raw = base64.b64decode(base64_data)
+        ref = f"{self.prefix}{hashlib.sha256(raw).hexdigest()}.{MIME_EXT[mime]}"
+        path = self.blob_path(ref)
+        if write and not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            temp = path + ".tmp"
+            with open(temp, "wb") as f:
+                f.write(raw)
+            os.replace(temp, path)
+        self._refs[base64_data] = ref
+        return ref
+
+    def blob_path(self, ref):
+        return os.path.join(self.directory, ref[len(self.prefix):])
+
+    def externalize_notebook(self, nb, write=True):
+        """
+        Returns the set of references used. Output and attachment containers are
+        copied before they are changed, since they are shared with the live cells.
+        write=False gives the same notebook without touching the blob folder, for
+        copies that are not a save (the modified check).
+        """
+        used = set()
+
+        def put(data, mime):
+            ref = self.put(data, mime, write)
+            used.add(ref)
+            return ref
+
+        def replace_uris(text):
+            return DATA_URI.sub(lambda m: put(re.sub(r"\s", "", m.group(2)), m.group(1)), text)
+
+        for cell in nb.cells:
+            if cell.cell_type == "code":
+                outputs = []
+                for out in cell.get("outputs", []):
+                    data = out.get("data")
+                    if data and any(mime in MIME_EXT and isinstance(v, str) for mime, v in data.items()):
+                        data = {mime: put(v, mime) if mime in MIME_EXT and isinstance(v, str) else v
+                                for mime, v in data.items()}
+                        out = nbformat.from_dict(dict(out, data=data))
+                    outputs.append(out)
+                cell["outputs"] = outputs
+            else:
+                if isinstance(cell.get("source"), str) and "data:image/" in cell.source:
+                    cell["source"] = replace_uris(cell.source)
+                attachments = cell.get("attachments")
+                if attachments:
+                    cell["attachments"] = {
+                        name: {mime: put(v, mime) if mime in MIME_EXT and isinstance(v, str) else v
+                               for mime, v in bundle.items()}
+                        for name, bundle in attachments.items()
+                    }
+        return used
+
+    def prune(self, used):
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        keep = {ref[len(self.prefix):] for ref in used}
+        for name in os.listdir(self.directory):
+            if name not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    # ---- reading ----
+    def get(self, ref):
+        try:
+            with open(self.blob_path(ref), "rb") as f:
+                data = base64.b64encode(f.read()).decode("ascii")
+        except OSError as e:
+            print(f"[BlobStore] Missing image blob {ref}: {e}")
+            return None
+        self._refs[data] = ref
+        return data
+
+    def inline_notebook(self, nb):
+        if not self.directory:
+            return nb
+        resolved = {}
+
+        def resolve(ref):
+            if ref not in resolved:
+                resolved[ref] = self.get(ref)
+            return resolved[ref]
+
+        def inline_value(value):
+            if isinstance(value, str) and value.startswith(self.prefix):
+                return resolve(value) or value
+            return value
+
+        def inline_uri(match):
+            data = resolve(match.group(0))
+            if data is None:
+                return match.group(0)
+            return f"data:{EXT_MIME.get(match.group(2), 'image/png')};base64,{data}"
+
+        for cell in nb.cells:
+            for out in cell.get("outputs", []):
+                data = out.get("data")
+                if data:
+                    for mime in list(data):
+                        data[mime] = inline_value(data[mime])
+            for bundle in (cell.get("attachments") or {}).values():
+                for mime in list(bundle):
+                    bundle[mime] = inline_value(bundle[mime])
+            if isinstance(cell.get("source"), str) and self.prefix in cell.source:
+                cell["source"] = BLOB_REF.sub(inline_uri, cell.source)
+        return nb
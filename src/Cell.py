@@ -1,10 +1,9 @@
-import re ,  hashlib ,os ,markdown2 ,time ,sys
-from nbformat.v4 import  new_code_cell, new_markdown_cell
+import re ,  hashlib ,os ,time ,uuid
 
 # PyQT Methods Import
-from PyQt5.QtGui import QFont, QTextCursor , QTextDocument, QTextImageFormat , QTextOption 
+from PyQt5.QtGui import QFont, QTextCursor , QTextDocument, QTextImageFormat , QTextOption , QPainter , QPen , QColor 
 from PyQt5.QtCore import Qt, pyqtSignal, QThread, QObject , QTimer
-from PyQt5.QtWidgets import QFrame, QHBoxLayout,QSizePolicy, QRadioButton, QButtonGroup, QVBoxLayout , QLabel, QScrollArea , QApplication
+from PyQt5.QtWidgets import QFrame, QHBoxLayout,QSizePolicy, QRadioButton, QButtonGroup, QVBoxLayout , QLabel, QScrollArea , QCheckBox
 from PyQt5.QtPrintSupport import QPrinter, QPrintDialog
 
 # Uranus Calss Import
@@ -13,8 +12,16 @@ from DocumentEditor import DocumentEditor
 from OutputEditor import OutputEditor
 from CodeEditor import CodeEditor
 from DataOutputEditor import DataFrameWidget
+from ArrayViewer import ArrayViewer
 from ImageOutput import ImageOutput
 from MarkdownEditor import MarkdownEditor
+from RenderCache import render_markdown, inline_attachments
+from ReflowScheduler import schedule_reflow
+from NotebookModel import CellModel
+from MemoryTracker import MemoryTracker, format_bytes
+from ResourceLimits import CellGuard, ResourceLimits
+from BenchmarkRunner import BenchmarkRunner, format_duration
+from HistoryReportWindow import Sparkline
 
 
 
@@ -22,40 +29,36 @@ class CodeRunner(QObject):
     finished = pyqtSignal(list)
     stream = pyqtSignal(object)
 
-    def __init__(self, kernel, code):
+    def __init__(self, kernel, code, track_memory=False, limits=None, deadline=None):
         super().__init__()
         self.kernel = kernel
         self.code = code
-        self._stop_request = False 
+        self.track_memory = track_memory
+        self.memory_stats = None
+        # timeout / memory / output limits and the user stop are all enforced by the guard
+        self.guard = CellGuard(limits, deadline)
 
     def stop(self):
-        self._stop_request = True
+        self.guard.request_stop()
+
+    @property
+    def violation(self):
+        return self.guard.violation
 
     def run(self):
-        shell = self.kernel.shell        
-        old_showtb = shell.showtraceback        
-        def dummy_showtb(*args, **kwargs):
-            if len(args) > 1 and args[1] is KeyboardInterrupt:
-                return 
-            old_showtb(*args, **kwargs)
-
-        def trace_func(frame, event, arg):
-            if self._stop_request:
-                self._stop_request = False
-                raise KeyboardInterrupt("Execution stopped by user")
-            return trace_func
-
-        old_trace = sys.settrace(trace_func)        
+        tracker = MemoryTracker() if self.track_memory else None
+        outputs = []
         try:
-            shell.showtraceback = dummy_showtb            
-            outputs = self.kernel.run_cell(self.code, self.stream.emit)           
+            if tracker:
+                tracker.start()
+            outputs = self.guard.run(self.kernel, self.code, self.stream.emit)
 
         except:
                 pass
 
         finally:
-            sys.settrace(old_trace)
-            shell.showtraceback = old_showtb            
+            if tracker:
+                self.memory_stats = tracker.stop()
         self.finished.emit(outputs)
 
 class Cell(QFrame):
@@ -68,7 +71,7 @@ class Cell(QFrame):
 
     def __init__(self,nb_cell ,editor_type=None, src_content=None, border_color=None,
         kernel=None, notify_done=None, origin='uranus', outputs=None,
-        status_c=None, status_r=None, height=0 ):
+        status_c=None, status_r=None, height=0 , benchmark_store=None , execution_history=None , image_budget=None ):
         super().__init__()
 
         os.environ["QT_LOGGING_RULES"] = "*.debug=false"        
@@ -76,7 +79,11 @@ class Cell(QFrame):
         if self.debug: print('[Cell->init]')
 
 
-        self.outputs = outputs or []
+        # source, outputs and metadata live in the model; widgets write into it
+        uranus_meta = (nb_cell or {}).get("metadata", {}).get("uranus", {})
+        self.model = CellModel(editor_type, src_content, outputs, cell_id=uranus_meta.get("uid"))
+        self.source_dirty = True  # the editor has text the model has not pulled yet
+        self.pending_outputs = None
         self.origin = origin
         self.editor_type = editor_type
         self.notify_done = notify_done
@@ -94,6 +101,15 @@ class Cell(QFrame):
         self._stop_time = None
         self._duration = None
         self._delta_time = None
+        self.memory_stats = None
+        self.limit_violation = None  # {"kind", "threshold", "value"} when the last run hit a limit
+        self.benchmark_store = benchmark_store
+        self.benchmark_id = None
+        self.benchmark_record = None
+        self.execution_history = execution_history
+        self.image_budget = image_budget
+        self.cell_uid = self.model.id  # stable across edits, keys the execution history
+        self._run_source = None
         self.led_permission = True # Permission to chane led color 
         self.output_editor_enable = True
 
@@ -109,14 +125,8 @@ class Cell(QFrame):
 
 
 
-        self.setStyleSheet(f"""
-            QFrame {{
-                border: 2px solid {self.bg_border_color_default};
-                border-radius: 5px;
-                background-color: {self.bg_main_window};
-                padding: 6px;
-            }}
-        """)
+        self.focused = False
+        self.apply_frame_style(self.bg_border_color_default)
 
         self.setFrameStyle(QFrame.Panel | QFrame.Raised)
         self.setLineWidth(2)
@@ -148,6 +158,25 @@ class Cell(QFrame):
         self.toggle_output_button_data.mousePressEvent = lambda event: self.toggle_output_data()
 
 
+        # Array Output toggle button
+        self.toggle_output_button_array = QLabel("⮞⮞   ARRAY OUTPUT    ⮞⮞")
+        self.toggle_output_button_array.setFixedHeight(16)
+        self.toggle_output_button_array.setAlignment(Qt.AlignCenter)
+        self.toggle_output_button_array.setCursor(Qt.PointingHandCursor)
+        self.toggle_output_button_array.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.toggle_output_button_array.setContentsMargins(0, 0, 0, 0)
+        self.toggle_output_button_array.setStyleSheet("""
+                    QLabel {
+                        background-color: white;
+                        border: 1px solid #aaa;
+                        border-radius: 0px;
+                        font-size: 12px;
+                        color: #555;
+                        padding: 0px;
+                    }
+                """)
+        self.toggle_output_button_array.mousePressEvent = lambda event: self.toggle_output_array()
+
         # Image Output toggle button
         self.toggle_output_button_image = QLabel("⮞⮞   IMAGE OUTPUT    ⮞⮞")
         self.toggle_output_button_image.setFixedHeight(16)
@@ -268,6 +297,35 @@ class Cell(QFrame):
         self.task_layout.addWidget(self.line_number)        
         self.task_layout.addWidget(self.timing)
 
+        # Benchmark mode check box (timeit-style execution)
+        self.benchmark_check = QCheckBox("Bench")
+        self.benchmark_check.setFont(font)
+        self.benchmark_check.setToolTip("Run this cell as a statistical micro-benchmark\n"
+                                        "(warmup + auto-scaled loops, min / median / p95 / stddev)")
+        self.benchmark_check.toggled.connect(self.set_benchmark_mode)
+        self.task_layout.addWidget(self.benchmark_check)
+
+        # Execution time trend of this cell
+        self.sparkline = Sparkline()
+        self.task_layout.addWidget(self.sparkline)
+
+        # restore memory statistics and benchmark mode persisted by a previous run
+        if self.nb_cell:
+            uranus_meta = self.nb_cell.get("metadata", {}).get("uranus", {})
+            self.memory_stats = uranus_meta.get("memory")
+            self.limit_violation = uranus_meta.get("limit")
+            benchmark = uranus_meta.get("benchmark")
+            if benchmark:
+                self.benchmark_id = benchmark.get("id")
+                self.benchmark_check.setChecked(True)
+                if self.benchmark_store:
+                    history = self.benchmark_store.history(self.benchmark_id)
+                    self.benchmark_record = history[-1] if history else None
+            if self.memory_stats or self.benchmark_record:
+                self.update_timing_label()
+
+        self.update_sparkline()
+
 
         self.main_layout.addSpacing(5)
 
@@ -300,7 +358,8 @@ class Cell(QFrame):
         else :
             self.initialize_editor(editor_type = self.editor_type)
 
-    def run(self):
+    def run(self, deadline=None):
+        """`deadline` (time.monotonic()) bounds the run together with the cell timeout, for Run All."""
         self.output_editor_enable = True
         if self.editor_type != 'code':
             return
@@ -309,12 +368,25 @@ class Cell(QFrame):
         # the indentaion error mast fixed
         self.editor.fix_indentation()
         code = self.editor.toPlainText()
+        self._run_source = code
+        self.pending_outputs = None
         if hasattr(self,'output_editor'):
                 self.output_editor.clear()   
                 self.set_led_color('orange')     
         self.outputs = []
+        self.limit_violation = None
 
-        self.runner = CodeRunner(self.kernel, code)
+        setting = load_setting()
+        self.memory_profiling = setting.get("Memory Profiling", False)
+        limits = ResourceLimits.from_settings(setting)
+        if self.benchmark_id:
+            self.runner = BenchmarkRunner(self.kernel, code,
+                                          repeat=setting.get("Benchmark Repeat", 7),
+                                          warmup=setting.get("Benchmark Warmup", 1),
+                                          limits=limits, deadline=deadline)
+        else:
+            self.runner = CodeRunner(self.kernel, code, track_memory=self.memory_profiling,
+                                     limits=limits, deadline=deadline)
         self._start_time = time.perf_counter()
 
 
@@ -345,12 +417,21 @@ class Cell(QFrame):
         self.scroll.setVisible(not is_visible)
         self.toggle_output_button_data.setText("⮞⮞   TABEL OUTPUT    ⮞⮞" if is_visible else "⮟⮟   TABLE OUTPUT    ⮟⮟")
 
+    def toggle_output_array(self):
+        is_visible = self.output_array.isVisible()
+        self.output_array.setVisible(not is_visible)
+        self.toggle_output_button_array.setText("⮞⮞   ARRAY OUTPUT    ⮞⮞" if is_visible else "⮟⮟   ARRAY OUTPUT    ⮟⮟")
+
     def toggle_output_image(self):
+        if self.hydrate_outputs():
+            return
         is_visible = self.output_image.isVisible()
         self.output_image.setVisible(not is_visible)
         self.toggle_output_button_image.setText("⮞⮞   IMAGE OUTPUT    ⮞⮞" if is_visible else "⮟⮟   IMAGE OUTPUT    ⮟⮟")
 
     def toggle_output_editor(self):
+            if self.hydrate_outputs():
+                return
             is_visible = self.output_editor.isVisible()
             self.output_editor.setVisible(not is_visible)
             self.toggle_output_button.setText("⮞⮞   TEXT OUTPUT    ⮞⮞" if is_visible else "⮟⮟   TEXT OUTPUT    ⮟⮟")
@@ -358,19 +439,32 @@ class Cell(QFrame):
     def set_color(self, color):
         if self.debug :print('[Cell->set_color]')
         self.border_color = color or self.bg_border_color_default
+        self.apply_frame_style(self.border_color)
+
+    def apply_frame_style(self, color):
+        # the stylesheet only changes with the border color; focus is painted in paintEvent,
+        # since setStyleSheet re-parses CSS and re-polishes the whole cell subtree
         self.setStyleSheet(f"""
                 QFrame {{
-                    border: 5px solid {self.border_color};
+                    border: 2px solid {color};
                     border-radius: 5px;
                     padding: 6px;
                     background-color: {self.bg_main_window}
                 }}
             """)
         if hasattr(self, 'output_data'):
-            self.output_data.setStyleSheet("border: 1px solid black; padding: 0px;")
-            if hasattr(self.output_data, 'table'): # if pandas is installed
-                self.output_data.table.setStyleSheet("border: 1px solid gray; padding: 0px;")
-                self.output_data.table.horizontalHeader().setStyleSheet("border: 0px solid gray; padding: 0px;")
+            self.style_output_data()
+
+    def style_output_data(self):
+        self.output_data.setStyleSheet("border: 1px solid black; padding: 0px;")
+        if hasattr(self.output_data, 'table'): # if pandas is installed
+            self.output_data.table.setStyleSheet("border: 1px solid gray; padding: 0px;")
+            self.output_data.table.horizontalHeader().setStyleSheet("border: 0px solid gray; padding: 0px;")
+
+    def set_focused(self, focused):
+        if focused != self.focused:
+            self.focused = focused
+            self.update()
 
     @staticmethod
 
@@ -418,42 +512,27 @@ class Cell(QFrame):
             if self.src_content:
                 self.editor.setPlainText(self.src_content)
             self.set_color(self.border_color)
-            self.editor.adjust_height_code()
-            self.editor.textChanged.connect(self.editor.adjust_height_code)
+            schedule_reflow(self.editor.adjust_height_code)
+            self.editor.textChanged.connect(lambda: schedule_reflow(self.editor.adjust_height_code))
+            self.editor.textChanged.connect(self.mark_source_dirty)
             self.editor.setFocus()
 
             if self.outputs:
-                self.inject_outputs(self.outputs)
+                self.defer_outputs(self.outputs)
 
         # Document Cell
         elif self.editor_type == "doc_editor":
-            self.d_editor = DocumentEditor()
+            self.d_editor = DocumentEditor(image_budget=self.image_budget)
             self.main_layout.addWidget(self.d_editor)
 
             if self.src_content:
                 if getattr(self, "origin", None) == "uranus":
-                    # 1) تبدیل doc_editor به HTML
-                    html = markdown2.markdown(self.src_content)
+                    # 1) تبدیل doc_editor به HTML (from the persistent render cache when possible)
+                    html = render_markdown(self.src_content)
 
                     # 2) جایگزینی attachment:image.png با data URL از nb_cell.attachments
                     attachments = getattr(self.nb_cell, "attachments", {}) or {}
-                    # attachments شکل: {"image.png": {"image/png": "base64string", ...}, ...}
-                    for name, mime_map in attachments.items():
-                        # اولویت با image/png
-                        b64 = None
-                        if "image/png" in mime_map:
-                            b64 = mime_map["image/png"]
-                            html = html.replace(
-                                f"attachment:{name}",
-                                f"data:image/png;base64,{b64}"
-                            )
-                        elif "image/jpeg" in mime_map:
-                            b64 = mime_map["image/jpeg"]
-                            html = html.replace(
-                                f"attachment:{name}",
-                                f"data:image/jpeg;base64,{b64}"
-                            )
-                        # سایر MIMEها هم قابل اضافه شدن‌اند
+                    html = inline_attachments(html, attachments)
 
                     self.d_editor.editor.setHtml(html)
                 else:
@@ -466,9 +545,7 @@ class Cell(QFrame):
 
             if self.editor_height < 100 :
 
-                self.d_editor.editor.document().adjustSize()
-                QApplication.processEvents()          
-                QTimer.singleShot(0, self.d_editor.adjust_height_document_editor) # adjust after cell rendering
+                schedule_reflow(self.d_editor.adjust_height_document_editor) # adjust after cell rendering
 
             else :
 
@@ -478,7 +555,8 @@ class Cell(QFrame):
             self.d_editor.clicked.connect(lambda: self.doc_editor_clicked.emit(self))
             self.d_editor.editor.clicked.connect(lambda: self.doc_editor_clicked.emit(self))
             self.d_editor.editor.doubleClicked.connect(lambda: self.doc_editor_editor_clicked.emit(self))                
-            self.d_editor.editor.textChanged.connect(self.d_editor.adjust_height_document_editor)
+            self.d_editor.editor.textChanged.connect(lambda: schedule_reflow(self.d_editor.adjust_height_document_editor))
+            self.d_editor.editor.textChanged.connect(self.mark_source_dirty)
             self.d_editor.editor.setFocus(True)
 
 
@@ -521,9 +599,7 @@ class Cell(QFrame):
 
             if self.editor_height < 100 :
 
-                self.m_editor.editor.document().adjustSize()
-                QApplication.processEvents()          
-                QTimer.singleShot(0, self.m_editor.adjust_height_document_editor) # adjust after cell rendering
+                schedule_reflow(self.m_editor.adjust_height_document_editor) # adjust after cell rendering
 
             else :
 
@@ -531,7 +607,7 @@ class Cell(QFrame):
 
 
 
-            self.m_editor.editor.textChanged.connect(self.m_editor.adjust_height_document_editor)
+            self.m_editor.editor.textChanged.connect(lambda: schedule_reflow(self.m_editor.adjust_height_document_editor))
             self.m_editor.editor.setFocus(True)
 
     def append_output(self, out):
@@ -545,7 +621,7 @@ class Cell(QFrame):
                 self.output_image.show_image_from_base64(out.data["image/png"])
                 self.toggle_output_button_image.setVisible(True)
                 self.output_image.setVisible(True)
-                self.outputs.append(out)  # ✅ ذخیره مجاز
+                self.model.append_output(out)  # ✅ ذخیره مجاز
 
             # 📊 Table 
             elif editor_target == "output_data" and "text/html" in out.data:
@@ -562,8 +638,21 @@ class Cell(QFrame):
                         self.output_data.set_dataframe(obj)
                         self.toggle_output_button_data.setVisible(True)
                         self.scroll.setVisible(True)
+                        self.model.append_output(out)  # not saved, but kept across hibernation
                         return  
 
+            # 🔢 Array
+            elif editor_target == "output_array":
+                obj = self.kernel.object_store.get(out.metadata.get("object_ref"))
+                if obj is not None:
+                    if not hasattr(self, 'output_array'):
+                        self.create_output_array()
+                    self.output_array.set_array(obj)
+                    self.toggle_output_button_array.setVisible(True)
+                    self.output_array.setVisible(True)
+                # kept even when the kernel no longer has the array (after a reload), so saving keeps it
+                self.model.append_output(out)
+
 
 
         elif out.output_type == "error":
@@ -581,8 +670,8 @@ class Cell(QFrame):
                 cursor.insertBlock()
             self.toggle_output_button.setVisible(True)
             self.output_editor.setVisible(True)
-            self.output_editor.adjust_height()
-            self.outputs.append(out)  
+            schedule_reflow(self.output_editor.adjust_height)
+            self.model.append_output(out)  
 
 
 
@@ -612,19 +701,30 @@ class Cell(QFrame):
 
             self.toggle_output_button.setVisible(True)
             self.output_editor.setVisible(True)
-            self.output_editor.adjust_height()
-            self.outputs.append(out)  
+            schedule_reflow(self.output_editor.adjust_height)
+            self.model.append_output(out)  
 
     def finalize(self):
         self._stop_time = time.perf_counter()
         if self.thread:
             self.thread.quit()
             self.thread.wait()
+            # None when this run was not profiled, so no stale "Mem" is shown or saved
+            self.memory_stats = self.runner.memory_stats
+            violation = getattr(self.runner, "violation", None)
+            if violation is not None:
+                self.limit_violation = violation.to_metadata()
+            benchmark_result = getattr(self.runner, "benchmark_result", None)
+            if benchmark_result and self.benchmark_store:
+                threshold = load_setting().get("Benchmark Regression Threshold", 10) / 100.0
+                self.benchmark_record = self.benchmark_store.record(self.benchmark_id, benchmark_result, threshold)
+            elif benchmark_result:
+                self.benchmark_record = benchmark_result
             self.compute_execution_time()
 
 
 
-
+        outcome = "ok"
         # 🔑 بررسی کل متن خروجی در ادیتور
         if hasattr(self, 'output_editor'):
             full_text = self.output_editor.text_output.toPlainText()
@@ -633,12 +733,22 @@ class Cell(QFrame):
 
             if has_traceback and has_error_term:
                 self.set_led_color("red")
+                outcome = "error"
             else:
                 self.set_led_color("green")
         else:
             # اگر ادیتور خروجی ساخته نشده بود، فرض بر موفقیت
             self.set_led_color("green")
 
+        if any(out.output_type == "error" for out in self.outputs):
+            outcome = "error"
+        if not self.led_permission:  # stopped by the user
+            outcome = "interrupted"
+        if self.limit_violation:
+            self.set_led_color("red")
+            outcome = self.limit_violation["kind"]
+        self.record_execution(outcome)
+
         if callable(self.notify_done):
             self.notify_done()
 
@@ -646,40 +756,64 @@ class Cell(QFrame):
             self.line_number.setText(f"Line: {line:^5} | Char: {column:^5}")
             self.status_r(f"Line: {line:^5} | Char: {column:^5}     ")
 
-    def get_nb_code_cell(self):
-        code = self.editor.toPlainText()
-        cell = new_code_cell(source=code)
-
+    @property
+    def outputs(self):
+        return self.model.outputs
 
-        filtered_outputs = []
-        for out in self.outputs:
-            if out.output_type == "stream":
-                filtered_outputs.append(out)
+    @outputs.setter
+    def outputs(self, outputs):
+        self.model.set_outputs(outputs)
 
-            elif out.output_type == "error":
-                filtered_outputs.append(out)
-
-            elif out.output_type == "display_data":
-                editor_target = out.metadata.get("editor", "")
-                if editor_target == "output_image" and "image/png" in out.data:
-                    filtered_outputs.append(out)
+    def mark_source_dirty(self):
+        # pulling toPlainText()/toHtml() on every keystroke is what the model avoids
+        self.source_dirty = True
 
+    def sync_model(self):
+        """
+        Brings the model up to date with the widgets: the source only if the editor
+        changed since the last sync, the (cheap) metadata always. Returns the model.
+        """
+        # tags from the file (e.g. "parameters" for uranus sweep) survive saving
+        tags = (self.nb_cell or {}).get("metadata", {}).get("tags")
+        extra = {"tags": list(tags)} if tags else {}
 
-        cell.outputs = filtered_outputs
-        cell.execution_count = 1
-
-        # metadata
-        cell['metadata']['bg'] = self.border_color
-        cell['metadata']['uranus'] = {
-            "origin": self.origin
-        }
+        if self.editor_type == "code":
+            if self.source_dirty:
+                self.model.set_source(self.editor.toPlainText())
+            uranus = {"origin": self.origin}
+            if self.memory_stats:
+                uranus["memory"] = self.memory_stats
+            if self.benchmark_id:
+                uranus["benchmark"] = {"id": self.benchmark_id}
+            if self.limit_violation:
+                uranus["limit"] = self.limit_violation
+            uranus["uid"] = self.cell_uid
+            self.model.set_metadata({"bg": self.border_color, "uranus": uranus, **extra})
 
+        elif self.editor_type == "doc_editor":
+            if self.source_dirty:
+                self.model.set_source(self.d_editor.editor.toHtml())
+            # height of editor in pixcel, recalculted by the document editor once it laid out
+            height = self.d_editor.editor_height if self.d_editor.flag_doc_height_adjust else self.editor_height
+            self.model.set_metadata({"bg": self.border_color, "uranus": {"origin": "uranus", "uid": self.cell_uid},
+                                     "height": height, **extra})
 
-        # Generate md5 static hash code acording to context of cell
-        hash_id = hashlib.sha1(code.encode("utf-8")).hexdigest()[:8]
-        cell['id'] = hash_id
+        elif self.editor_type == "markdown":
+            # raw_text and images change without textChanged, always pulled
+            self.model.set_source(str(self.m_editor.editor.raw_text or self.m_editor.editor.toPlainText()))
+            attachments = {}
+            for filename, b64 in self.m_editor.editor.images.items():
+                # اگر b64 خودش دیکشنری بود، فقط مقدار رشته را بردار
+                data = b64.get("image/png", "") if isinstance(b64, dict) else b64
+                attachments[filename] = {"image/png": data}
+            self.model.set_metadata({"bg": self.border_color, "uranus": {"origin": "jupyter", "uid": self.cell_uid},
+                                     **extra}, attachments)
+
+        self.source_dirty = False
+        return self.model
 
-        return cell
+    def get_nb_code_cell(self):
+        return self.sync_model().snapshot().to_nbformat()
 
     def create_output_editor (self):
         self.output_editor = OutputEditor()
@@ -695,8 +829,17 @@ class Cell(QFrame):
         self.main_layout.addWidget(self.toggle_output_button_image)
         self.main_layout.addWidget(self.output_image)
 
+    def create_output_array(self):
+        self.output_array = ArrayViewer()
+        self.output_array.setFixedHeight(400)
+        self.output_array.setVisible(False)
+        self.toggle_output_button_array.setVisible(False)
+        self.main_layout.addWidget(self.toggle_output_button_array)
+        self.main_layout.addWidget(self.output_array)
+
     def create_output_data(self):
         self.output_data = DataFrameWidget()
+        self.style_output_data()
         #Scroll Widget
         self.scroll = QScrollArea()
         self.scroll.setWidgetResizable(True)
@@ -708,69 +851,89 @@ class Cell(QFrame):
         self.main_layout.addWidget(self.toggle_output_button_data)
         self.main_layout.addWidget(self.scroll)
 
+    def defer_outputs(self, outputs):
+        """
+        Keeps loaded outputs serialized until the cell is painted (scrolled into view)
+        or one of its output toggles is clicked; only the collapsed toggles are shown.
+        """
+        self.outputs = outputs
+        self.pending_outputs = outputs
+
+        if any(out.output_type in ("stream", "error") for out in outputs):
+            if not hasattr(self, 'output_editor'):
+                self.create_output_editor()
+            self.toggle_output_button.setVisible(True)
+        if any(out.output_type == "display_data" and out.metadata.get("editor", "") == "output_image"
+               and "image/png" in out.data for out in outputs):
+            if not hasattr(self, 'output_image'):
+                self.create_output_image()
+            self.toggle_output_button_image.setVisible(True)
+
+    def hydrate_outputs(self):
+        if self.pending_outputs is None:
+            return False
+        outputs, self.pending_outputs = self.pending_outputs, None
+        self.inject_outputs(outputs)
+        return True
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.focused:
+            # thick focus border over the 2px stylesheet border
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(QPen(QColor(self.border_color or self.bg_border_color_default), 5))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRoundedRect(self.rect().adjusted(2, 2, -3, -3), 5, 5)
+            painter.end()
+        # only cells intersecting the viewport get painted
+        if self.pending_outputs is not None:
+            QTimer.singleShot(0, self.hydrate_outputs)
+
     def inject_outputs(self, outputs):
+        text_parts = []
         for out in outputs:
             if out.output_type == "display_data":
                 editor_target = out.metadata.get("editor", "")
                 if editor_target == "output_image" and "image/png" in out.data:
                     if not hasattr(self, 'output_image'):
                         self.create_output_image()
-                    self.output_image.show_image_from_base64(out.data["image/png"])
+                    self.output_image.load_base64_async(out.data["image/png"])
                     self.toggle_output_button_image.setVisible(True)
-                    self.output_image.setVisible(True)
+                    self.toggle_output_button_image.setText("⮟⮟   IMAGE OUTPUT    ⮟⮟")
+                elif editor_target in ("output_data", "output_array"):
+                    # only after hibernation: the object still lives in the kernel's object_store
+                    self.append_output(out)
 
             elif out.output_type == "error":
-                if not hasattr(self, 'output_editor'):
-                    self.create_output_editor()
-                editor = self.output_editor.text_output
-                cursor = editor.textCursor()
-                cursor.movePosition(QTextCursor.End)
                 for line in out.traceback:
                     clean_line = self.strip_ansi(line.rstrip())
                     if "site-packages" in clean_line or "interactiveshell.py" in clean_line or "exec(code_obj" in clean_line:
                         continue
-                    cursor.insertText(clean_line)
-                    cursor.insertBlock()
-                self.toggle_output_button.setVisible(True)
-                self.output_editor.setVisible(True)
-                self.output_editor.adjust_height()
+                    text_parts.append(clean_line)
 
             elif out.output_type == "stream":
-                if not hasattr(self, 'output_editor'):
-                    self.create_output_editor()
-                editor = self.output_editor.text_output
-                cursor = editor.textCursor()
-                cursor.movePosition(QTextCursor.End)
-                clean = self.strip_ansi(out.text)
-                for line in clean.splitlines():
-                    cursor.insertText(line)
-                    cursor.insertBlock()
-                self.toggle_output_button.setVisible(True)
-                self.output_editor.setVisible(True)
-                self.output_editor.adjust_height()
+                text_parts.extend(self.strip_ansi(out.text).splitlines())
+
+        if text_parts:
+            if not hasattr(self, 'output_editor'):
+                self.create_output_editor()
+            # one insert instead of insertText/insertBlock per line
+            cursor = self.output_editor.text_output.textCursor()
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertText("\n".join(text_parts) + "\n")
+            self.toggle_output_button.setVisible(True)
+            self.toggle_output_button.setText("⮟⮟   TEXT OUTPUT    ⮟⮟")
+            self.output_editor.setVisible(True)
+            schedule_reflow(self.output_editor.adjust_height)
 
         self.outputs = outputs
 
     def get_nb_doc_editor_cell(self):
-        content = self.d_editor.editor.toHtml()    
-
-        origin = "uranus"       
-
-        # 🎯 تولید ID پایدار بر اساس محتوای سلول
-        hash_id = hashlib.md5(content.encode("utf-8")).hexdigest()[:8]     
-        cell = new_markdown_cell(source=content)        
-        cell['id'] = hash_id  # ✅ تثبیت ID
-        cell['metadata']['bg'] = self.border_color
-        cell['metadata']['uranus'] = {"origin": origin} 
-        if self.d_editor.flag_doc_height_adjust : # if is recalculted height in document editor 
-            cell['metadata']['height'] = self.d_editor.editor_height  # height of editor in pixcel
-
-        else :
-            cell['metadata']['height'] = self.editor_height  # height of editor in pixcel
-
-        return cell
+        return self.sync_model().snapshot().to_nbformat()
 
     def print_full_cell(self, parent=None):
+        self.hydrate_outputs()
         printer = QPrinter(QPrinter.HighResolution)
         dialog = QPrintDialog(printer, parent or self)
         if dialog.exec_() != QPrintDialog.Accepted:
@@ -821,32 +984,7 @@ class Cell(QFrame):
         doc.print_(printer)
 
     def get_nb_markdown_cell(self):
-        content = self.m_editor.editor.raw_text or self.m_editor.editor.toPlainText()
-
-
-        cell = new_markdown_cell(source=str(content))
-
-        # build attachments correctly
-        attachments = {}
-        for filename, b64 in self.m_editor.editor.images.items():
-            # اگر b64 خودش دیکشنری بود، فقط مقدار رشته را بردار
-            if isinstance(b64, dict):
-                # معمولاً {"image/png": "..."} است
-                data = b64.get("image/png", "")
-            else:
-                data = b64
-            attachments[filename] = {"image/png": data}
-
-        if attachments:
-            cell["attachments"] = attachments
-
-        # stable metadata
-        hash_id = hashlib.md5(content.encode("utf-8")).hexdigest()[:8]
-        cell["id"] = hash_id
-        cell["metadata"]["bg"] = self.border_color
-        cell["metadata"]["uranus"] = {"origin": "jupyter"}
-
-        return cell
+        return self.sync_model().snapshot().to_nbformat()
 
     def set_led_color(self, color):
         if self.led_permission :
@@ -862,4 +1000,63 @@ class Cell(QFrame):
     def compute_execution_time(self):
         self._duration = self._stop_time - self._start_time
         self._delta_time = self._duration 
-        self.timing.setText(f'Elapsed : {self._duration:.3f} ')
\ No newline at end of file
+        self.update_timing_label()
+
+    def update_timing_label(self):
+        text = f'Elapsed : {self._duration:.3f} ' if self._duration is not None else ''
+        tooltip = []
+
+        stats = self.memory_stats
+        if stats and stats.get("rss_after") is not None:
+            text += (f"| Mem : {format_bytes(stats.get('rss_delta'), signed=True)} "
+                     f"(Peak {format_bytes(stats.get('rss_peak'))}) ")
+
+            tooltip += [
+                f"RSS before : {format_bytes(stats.get('rss_before'))}",
+                f"RSS after  : {format_bytes(stats.get('rss_after'))}",
+                f"RSS peak   : {format_bytes(stats.get('rss_peak'))}",
+            ]
+            if stats.get("py_peak") is not None:
+                tooltip.append(f"Python heap peak : {format_bytes(stats.get('py_peak'))}")
+            for site in stats.get("top_allocations") or []:
+                tooltip.append(f"{site['file']}:{site['line']}  {format_bytes(site['size_diff'], signed=True)}")
+
+        record = self.benchmark_record
+        if record and self.benchmark_id:
+            text += f"| Bench : {format_duration(record['median'])} "
+            change = record.get("change")
+            if change is not None:
+                text += f"({change:+.0%}{' REGRESSION' if record.get('regression') else ''}) "
+
+            if tooltip:
+                tooltip.append("")
+            history = self.benchmark_store.history(self.benchmark_id) if self.benchmark_store else [record]
+            tooltip.append("Benchmark trend (min / median / p95):")
+            for past in history[-10:]:
+                ran_at = time.strftime("%Y-%m-%d %H:%M", time.localtime(past["timestamp"]))
+                flag = "  ⚠ regression" if past.get("regression") else ""
+                tooltip.append(f"{ran_at}  [{past['source_hash']}]  {format_duration(past['min'])} / "
+                               f"{format_duration(past['median'])} / {format_duration(past['p95'])}{flag}")
+
+        self.timing.setToolTip("\n".join(tooltip))
+        self.timing.setText(text)
+
+    def record_execution(self, outcome):
+        if not self.execution_history or self._duration is None or self._run_source is None:
+            return
+        run_stats = getattr(self.runner, "memory_stats", None)
+        peak = run_stats.get("rss_peak") if run_stats else None
+        source_hash = hashlib.sha1(self._run_source.encode("utf-8")).hexdigest()[:8]
+        self.execution_history.record(self.cell_uid, source_hash, self._duration, peak, outcome)
+        self.update_sparkline()
+
+    def update_sparkline(self):
+        durations = self.execution_history.durations(self.cell_uid) if self.execution_history else []
+        self.sparkline.set_values(durations)
+        self.sparkline.setVisible(len(durations) > 1)
+
+    def set_benchmark_mode(self, checked):
+        if checked and not self.benchmark_id:
+            self.benchmark_id = uuid.uuid4().hex[:8]
+        elif not checked:
+            self.benchmark_id = None
\ No newline at end of file
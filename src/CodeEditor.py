@@ -15,9 +15,10 @@ from PyQt5.QtWidgets import (
 
 
 from CodeHighlight import CodeHighlighter
-from auto_complete_system import AutoCompleteSystem
+from auto_complete_system import completion_controller
 
 from SettingWindow import load_setting  
+from ReflowScheduler import schedule_reflow
 
         
     
@@ -63,7 +64,7 @@ class CodeEditor(QPlainTextEdit):
 
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)       
         self.highlighter = CodeHighlighter(self.document())
-        self.autocomplete = AutoCompleteSystem(self)
+        self.autocomplete = completion_controller()  # shared, attached on focus
 
     @staticmethod
 
@@ -81,9 +82,13 @@ class CodeEditor(QPlainTextEdit):
     def eventFilter(self, obj, event):
             if obj == self and event.type() == QEvent.KeyPress:
                 if event.key() in (Qt.Key_Return, Qt.Key_Enter):
-                    self.adjust_height_code()
+                    schedule_reflow(self.adjust_height_code)
             return super().eventFilter(obj, event)
 
+    def focusInEvent(self, event):
+        self.autocomplete.attach(self)
+        super().focusInEvent(event)
+
     def keyPressEvent(self, event):
         def delayed_emit():
             QApplication.processEvents() 
@@ -93,7 +98,13 @@ class CodeEditor(QPlainTextEdit):
             self.cursorPositionInfo.emit(line, column)
 
 
-        if hasattr(self, 'autocomplete') and self.autocomplete.active:
+        # Ctrl+Space برای فعال‌سازی دستی
+        if event.key() == Qt.Key_Space and event.modifiers() & Qt.ControlModifier:
+            self.autocomplete.attach(self)
+            self.autocomplete.activate_and_show()
+            return
+
+        if hasattr(self, 'autocomplete') and self.autocomplete.is_active_for(self):
                 if event.key() == Qt.Key_Escape:
                     self.autocomplete.keyPressEvent(event)
                     delayed_emit()
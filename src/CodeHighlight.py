@@ -1,21 +1,23 @@
 from PyQt5.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont
 from PyQt5.QtCore import QRegExp,QRegularExpression
-from SettingWindow import load_setting
+from SettingWindow import load_setting, settings_version
 
 
 
 
 
-class CodeHighlighter(QSyntaxHighlighter):
+class HighlightTheme:
+    """
+    Compiled rules (QRegExp, QTextCharFormat) of CodeHighlighter for one set of
+    syntax colors and code font size.
 
-    def __init__(self, document):
-        super().__init__(document)
-        self.rules = []
-        self._triple_quote_ranges = []
-        self._cached_text = ""
-        self._dirty = True
+    Built once and shared by every highlighter through highlight_theme(); highlighting
+    runs on the GUI thread only, so sharing the stateful QRegExp objects is safe.
+    """
 
-        setting = load_setting()
+    def __init__(self, setting):
+        self.rules = []
+        self.key = self.theme_key(setting)
 
         # ------ Setting 
         code_font_size  = setting['Code Font Size']
@@ -204,6 +206,42 @@ class CodeHighlighter(QSyntaxHighlighter):
         # دکوراتور 
         self.rules.append((QRegExp(r"^\s*@\w+(\(.*\))?"), decorator_format))
 
+    @staticmethod
+    def theme_key(setting):
+        return (setting['Code Font Size'], tuple(sorted(setting['colors_syntax'].items())))
+
+_theme = None
+_theme_version = None
+
+def highlight_theme():
+    """
+    The shared HighlightTheme. Settings are only re-read after SettingsWindow saved,
+    and the rules only recompiled when the syntax colors or code font size changed.
+    """
+    global _theme, _theme_version
+    version = settings_version()
+    if _theme is None or _theme_version != version:
+        setting = load_setting()
+        if _theme is None or _theme.key != HighlightTheme.theme_key(setting):
+            _theme = HighlightTheme(setting)
+        _theme_version = version
+    return _theme
+
+class CodeHighlighter(QSyntaxHighlighter):
+
+    def __init__(self, document):
+        super().__init__(document)
+        self._triple_quote_ranges = []
+        self._cached_text = ""
+        self._dirty = True
+
+        theme = highlight_theme()
+        self.rules = theme.rules
+        self.string_format = theme.string_format
+        self.comment_format = theme.comment_format
+        self.comment_h2_format = theme.comment_h2_format
+        self.comment_h3_format = theme.comment_h3_format
+
     def line_index_to_offset(self, lines, line_num, char_index):
         res = sum(len(lines[i]) + 1 for i in range(line_num)) + char_index
         return res
@@ -1,9 +1,75 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableView,QHeaderView
-from PyQt5.QtCore import Qt, QAbstractTableModel
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView, QLineEdit, QLabel
+from PyQt5.QtCore import Qt, QAbstractTableModel, QObject, QThread, pyqtSignal
 from PyQt5.QtGui import QFont
 
 
 
+# worker threads finish their current job even if the widget was closed meanwhile
+_running_threads = set()
+
+class FrameTask(QObject):
+    """
+    Runs one pandas/numpy job (argsort, query mask, column stats) on a QThread.
+    """
+    finished = pyqtSignal(object)
+
+    def __init__(self, func):
+        super().__init__()
+        self.func = func
+
+    def run(self):
+        try:
+            result = self.func()
+        except Exception as e:
+            result = e
+        self.finished.emit(result)
+
+def run_frame_task(func, callback):
+    task = FrameTask(func)
+    thread = QThread()
+    task.moveToThread(thread)
+    thread.started.connect(task.run)
+    task.finished.connect(callback)
+    task.finished.connect(thread.quit)
+    thread.finished.connect(lambda t=thread, w=task: _running_threads.discard((t, w)))
+    _running_threads.add((thread, task))
+    thread.start()
+
+def column_argsort(df, column, ascending):
+    import pandas as pd
+
+    values = pd.Series(df.iloc[:, column].to_numpy())  # positional RangeIndex
+    order = values.sort_values(ascending=ascending, kind="stable", na_position="last").index
+    return order.to_numpy()
+
+def query_mask(df, expression):
+    import numpy as np
+
+    mask = df.eval(expression)
+    mask = np.asarray(mask)
+    if mask.dtype != bool or mask.shape != (len(df),):
+        raise ValueError("Filter must be a boolean expression over the columns, e.g. price > 100")
+    return mask
+
+def column_stats(df, column):
+    import pandas as pd
+
+    series = df.iloc[:, column]
+    lines = [f"{series.name}  ({series.dtype})", f"count: {series.count():,}", f"nulls: {series.isna().sum():,}"]
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        lines += [
+            f"mean: {series.mean():.6g}",
+            f"std: {series.std():.6g}",
+            f"min: {series.min():.6g}",
+            f"max: {series.max():.6g}",
+        ]
+    else:
+        counts = series.value_counts(dropna=True)
+        lines.append(f"unique: {len(counts):,}")
+        if len(counts):
+            lines.append(f"top: {counts.index[0]!s:.40} ({counts.iloc[0]:,})")
+    return "\n".join(lines)
+
 class DataFrameModel(QAbstractTableModel):
     """
         A Qt-compatible table model for displaying pandas DataFrames in QTableView.
@@ -12,22 +78,37 @@ class DataFrameModel(QAbstractTableModel):
         - Maps DataFrame rows and columns to Qt's model-view architecture.
         - Supports dynamic updates via set_dataframe().
         - Displays string representations of cell values.
+        - Sorting and filtering never copy the frame: the visible rows are a NumPy
+          array of positions (argsort permutation, restricted by the filter mask).
+          Permutations are cached per (column, order) and computed on a worker.
+        - Header tooltips show per-column summary stats, computed on a worker on first hover.
 
         Parameters:
         - df (pd.DataFrame): Optional initial DataFrame to display.
 
         Methods:
-        - rowCount(): Returns number of rows in the DataFrame.
+        - rowCount(): Returns number of visible rows (after filtering).
         - columnCount(): Returns number of columns.
         - data(): Returns string value for each cell.
-        - headerData(): Returns column or index labels for headers.
+        - headerData(): Returns column or index labels for headers, and column stats as tooltip.
+        - sort(column, order): Reorders rows through a cached argsort permutation.
+        - set_filter(expression): Keeps the rows where a DataFrame.eval expression is True.
 
         Usage:
         Used internally by DataFrameWidget to render tabular data in the Uranus IDE.
         """
 
+    filter_applied = pyqtSignal(object)  # None or the error of the last filter
+
     def __init__(self, df=None, parent=None):
         super().__init__(parent)
+        self._rows = None   # None: frame order, otherwise positions into self._df
+        self._order = None
+        self._mask = None
+        self._sort_cache = {}
+        self._stats = {}
+        self._filter_generation = 0
+        self._sort_generation = 0
         try :
             import pandas as pd
         except ImportError :
@@ -35,27 +116,113 @@ class DataFrameModel(QAbstractTableModel):
         else :
             self._df = df if df is not None else pd.DataFrame()
 
-    def rowCount(self, parent=None):
+    @property
+    def total_rows(self):
         return len(self._df)
 
+    def rowCount(self, parent=None):
+        return len(self._df) if self._rows is None else len(self._rows)
+
     def columnCount(self, parent=None):
         return len(self._df.columns)
 
+    def position(self, row):
+        return row if self._rows is None else int(self._rows[row])
+
     def data(self, index, role=Qt.DisplayRole):
         if not index.isValid():
             return None
         if role == Qt.DisplayRole:
-            value = self._df.iloc[index.row(), index.column()]
+            value = self._df.iat[self.position(index.row()), index.column()]
             return str(value)
         return None
 
     def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.ToolTipRole:
+            return self.column_tooltip(section)
         if role != Qt.DisplayRole:
             return None
         if orientation == Qt.Horizontal:
             return str(self._df.columns[section])
         else:
-            return str(self._df.index[section])
+            return str(self._df.index[self.position(section)])
+
+    def column_tooltip(self, column):
+        if column not in self._stats:
+            self._stats[column] = "Computing column statistics ..."
+            df = self._df
+            run_frame_task(lambda: column_stats(df, column),
+                           lambda result, c=column: self.stats_ready(c, result))
+        return self._stats[column]
+
+    def stats_ready(self, column, result):
+        self._stats[column] = f"Statistics failed: {result}" if isinstance(result, Exception) else result
+        self.headerDataChanged.emit(Qt.Horizontal, column, column)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if column < 0 or column >= self.columnCount():
+            return
+        key = (column, order == Qt.AscendingOrder)
+        self._sort_generation += 1
+        if key in self._sort_cache:
+            self.apply_order(self._sort_cache[key])
+            return
+
+        df, generation = self._df, self._sort_generation
+        run_frame_task(lambda: column_argsort(df, column, key[1]),
+                       lambda result: self.sort_ready(key, generation, result))
+
+    def sort_ready(self, key, generation, result):
+        if isinstance(result, Exception):
+            print(f"[DataFrameModel->sort] {result}")
+            return
+        self._sort_cache[key] = result
+        if generation == self._sort_generation:  # a newer header click wins
+            self.apply_order(result)
+
+    def set_filter(self, expression):
+        self._filter_generation += 1
+        expression = expression.strip()
+        if not expression:
+            self.apply_mask(None)
+            self.filter_applied.emit(None)
+            return
+
+        df, generation = self._df, self._filter_generation
+        run_frame_task(lambda: query_mask(df, expression),
+                       lambda result: self.filter_ready(generation, result))
+
+    def filter_ready(self, generation, result):
+        if generation != self._filter_generation:
+            return
+        if isinstance(result, Exception):
+            self.filter_applied.emit(result)
+            return
+        self.apply_mask(result)
+        self.filter_applied.emit(None)
+
+    def apply_order(self, order):
+        self._order = order
+        self.update_rows()
+
+    def apply_mask(self, mask):
+        self._mask = mask
+        self.update_rows()
+
+    def update_rows(self):
+        import numpy as np
+
+        self.layoutAboutToBeChanged.emit()
+        if self._order is not None and self._mask is not None:
+            rows = self._order[self._mask[self._order]]
+        elif self._order is not None:
+            rows = self._order
+        elif self._mask is not None:
+            rows = np.flatnonzero(self._mask)
+        else:
+            rows = None
+        self._rows = rows
+        self.layoutChanged.emit()
 
 class DataFrameWidget(QWidget):
     """
@@ -65,9 +232,10 @@ class DataFrameWidget(QWidget):
         - Automatically wraps a DataFrameModel and connects it to a sortable QTableView.
         - Supports alternating row colors and responsive layout.
         - Provides set_dataframe() method to update or clear the displayed data.
+        - Filter bar: a DataFrame.query-style expression evaluated on a worker thread.
 
         Components:
-        - QVBoxLayout: Contains the table view.
+        - QVBoxLayout: Contains the filter bar and the table view.
         - QTableView: Displays the DataFrame with headers and sorting enabled.
         - DataFrameModel: Custom model for mapping pandas data to Qt view.
 
@@ -87,6 +255,18 @@ class DataFrameWidget(QWidget):
         self.setStyleSheet("background:white;")
         self.layout = QVBoxLayout()
         self.layout.setContentsMargins(0, 0, 0, 0)
+
+        filter_bar = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter rows, e.g.  price > 100 and city == 'Paris'   (Enter to apply)")
+        self.filter_edit.setFont(QFont("Consolas", 10))
+        self.filter_edit.returnPressed.connect(self.apply_filter)
+        self.filter_status = QLabel()
+        self.filter_status.setFont(QFont("Segoe UI", 9))
+        filter_bar.addWidget(self.filter_edit, 1)
+        filter_bar.addWidget(self.filter_status)
+        self.layout.addLayout(filter_bar)
+
         self.table = QTableView()
         self.table.setAlternatingRowColors(True)
         self.table.setSortingEnabled(True)
@@ -109,8 +289,16 @@ class DataFrameWidget(QWidget):
         self.layout.addWidget(self.table)
         self.setLayout(self.layout)
 
-        self.model = DataFrameModel()
+        self.set_model(DataFrameModel())
+
+    def set_model(self, model):
+        self.model = model
+        self.model.filter_applied.connect(self.filter_done)
+        self.model.layoutChanged.connect(self.update_row_count)
+        # setSortingEnabled(True) sorts right away; keep a fresh frame in its own order
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
         self.table.setModel(self.model)
+        self.update_row_count()
 
     def set_dataframe(self, df = None):
         try :
@@ -118,5 +306,24 @@ class DataFrameWidget(QWidget):
         except ImportError:
             return None
         else :
-            self.model = DataFrameModel(df)
-            self.table.setModel(self.model)
\ No newline at end of file
+            self.set_model(DataFrameModel(df))
+            if self.filter_edit.text().strip():
+                self.apply_filter()
+
+    def apply_filter(self):
+        self.filter_status.setStyleSheet("color: #555;")
+        self.filter_status.setText("Filtering ...")
+        self.model.set_filter(self.filter_edit.text())
+
+    def filter_done(self, error):
+        if error is not None:
+            self.filter_status.setStyleSheet("color: #c62828;")
+            self.filter_status.setText(f"{type(error).__name__}: {error}"[:120])
+        else:
+            self.update_row_count()
+
+    def update_row_count(self):
+        total = self.model.total_rows if hasattr(self.model, "_df") else 0
+        shown = self.model.rowCount()
+        self.filter_status.setStyleSheet("color: #555;")
+        self.filter_status.setText(f"{total:,} rows" if shown == total else f"{shown:,} of {total:,} rows")
@@ -1,10 +1,11 @@
 
-import os , base64
+import os
 from PyQt5.QtGui import QIcon, QTextCharFormat, QFont, QFontMetrics, QTextImageFormat, QTextCursor, QColor , QMouseEvent , QPixmap  
-from PyQt5.QtCore import  QSize , QEvent ,pyqtSignal, QBuffer, Qt 
+from PyQt5.QtCore import  QSize , QEvent ,pyqtSignal, Qt 
 from PyQt5.QtWidgets import (QDialog, QToolBar, QDialogButtonBox, QLabel, QWidget, QVBoxLayout, QTextEdit,QAction , QScrollArea, QPlainTextEdit
 , QFileDialog, QMessageBox, QSlider, QComboBox, QHBoxLayout, QPushButton)
 from SettingWindow import load_setting
+from ImageIngest import ingest_image
 
 
 
@@ -18,6 +19,7 @@ class RichTextEditor(QTextEdit):
         self.setCursor(Qt.IBeamCursor)
         self.setAcceptRichText(True)
         self.installEventFilter(self)
+        self.image_budget = None  # ImageBudget of the notebook, set by DocumentEditor
 
     def wheelEvent(self, event):
         if self.hasFocus() and not self.isReadOnly():
@@ -32,16 +34,21 @@ class RichTextEditor(QTextEdit):
 
     def insertFromMimeData(self, source):
         if source.hasImage():
-            image = source.imageData()
-            buffer = QBuffer()
-            buffer.open(QBuffer.WriteOnly)
-            image.save(buffer, "PNG")
-            img_base64 = base64.b64encode(buffer.data()).decode("utf-8")
-            html = f'<img src="data:image/png;base64,{img_base64}"><br>'
-            self.insertHtml(html)
+            self.insert_image_async(source.imageData())
         else:
             super().insertFromMimeData(source)
 
+    def insert_image_async(self, image):
+        # downscaling and encoding run on the thread pool; the image lands where the
+        # cursor was, even if the user keeps typing meanwhile
+        ingest_image(image, self.textCursor(), load_setting(), self.image_budget,
+                     on_rejected=self.image_rejected)
+
+    def image_rejected(self):
+        QMessageBox.warning(self, "Insert Failed",
+                            "The image does not fit the notebook image budget "
+                            "(Settings > Performance > Notebook Image Budget).")
+
     def mouseDoubleClickEvent(self, event):
         self.doubleClicked.emit()
         super().mouseDoubleClickEvent(event)
@@ -50,7 +57,7 @@ class DocumentEditor(QWidget):
     doc_returnPressed = pyqtSignal()  
     clicked = pyqtSignal()  
 
-    def __init__(self, parent=None ):
+    def __init__(self, parent=None , image_budget=None ):
         super().__init__(parent)
 
         # Load settings
@@ -72,6 +79,7 @@ class DocumentEditor(QWidget):
 
         # Editor
         self.editor = RichTextEditor()
+        self.editor.image_budget = image_budget
         self.editor.setAcceptRichText(True)
         self.editor.setFont(QFont(metadata_font, metadata_font_size))
         self.editor.setStyleSheet(f"""
@@ -424,23 +432,16 @@ class DocumentEditor(QWidget):
         self.toolbar.addAction(ltr_action)
 
     def insert_image(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Select Image", "", "Images (*.png *.jpg *.bmp)")
+        path, _ = QFileDialog.getOpenFileName(self, "Select Image", "", "Images (*.png *.jpg *.jpeg *.bmp *.webp)")
         if path:
             from PyQt5.QtGui import QImage
-            from PyQt5.QtCore import QBuffer
 
             image = QImage(path)
             if image.isNull():
                 QMessageBox.warning(self, "Insert Failed", "Could not load image.")
                 return
 
-            buffer = QBuffer()
-            buffer.open(QBuffer.WriteOnly)
-            image.save(buffer, "PNG")
-            img_base64 = base64.b64encode(buffer.data()).decode("utf-8")
-            html = f'<img src="data:image/png;base64,{img_base64}"><br>'
-
-            self.editor.insertHtml(html)
+            self.editor.insert_image_async(image)
 
     def selected_image_format(self):
         # print('[DocumentEditor->selected_image_format]')
@@ -0,0 +1,121 @@
+import json, os, statistics, time
+
+
+
+class ExecutionHistory:
+    """
+    Append-only execution log of a notebook, stored as a JSON-lines sidecar file.
+
+    The sidecar lives next to the notebook (`<name>.uranus_history.jsonl`) so the
+    .ipynb itself does not grow with every run. Each line is one execution with
+    short keys to keep the file compact:
+
+        {"t": timestamp, "c": cell uid, "h": source hash, "d": duration (s),
+         "m": peak RSS (bytes or null), "o": "ok" | "error" | "interrupted" | "timeout" | "memory" | "output"}
+
+    Methods:
+    - record(cell_uid, source_hash, duration, peak_memory, outcome): Appends one line.
+    - durations(cell_uid, last): Recent durations of a cell (for sparklines).
+    - regressions(threshold, min_runs, min_delta): Cells whose latest run of a source
+      is slower than the median of the previous runs of the same source.
+    """
+
+    suffix = ".uranus_history.jsonl"
+
+    def __init__(self, notebook_path=None):
+        self.path = None
+        self._records = None
+        self._by_cell = {}
+        self.set_notebook_path(notebook_path)
+
+    def set_notebook_path(self, notebook_path):
+        self.path = os.path.splitext(notebook_path)[0] + self.suffix if notebook_path else None
+        self._records = None
+        self._by_cell = {}
+
+    def _load(self):
+        if self._records is not None:
+            return self._records
+
+        self._records = []
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue  # a torn last line must not hide the rest of the history
+                        self._records.append(entry)
+                        self._by_cell.setdefault(entry.get("c"), []).append(entry)
+            except OSError as e:
+                print(f"[ExecutionHistory] Cannot read {self.path}: {e}")
+        return self._records
+
+    def record(self, cell_uid, source_hash, duration, peak_memory=None, outcome="ok"):
+        entry = {
+            "t": round(time.time(), 3),
+            "c": cell_uid,
+            "h": source_hash,
+            "d": round(duration, 6),
+            "m": peak_memory,
+            "o": outcome,
+        }
+        self._load().append(entry)
+        self._by_cell.setdefault(cell_uid, []).append(entry)
+
+        if self.path:
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            except OSError as e:
+                print(f"[ExecutionHistory] Cannot write {self.path}: {e}")
+        return entry
+
+    def records(self, cell_uid=None):
+        records = self._load()
+        if cell_uid is None:
+            return list(records)
+        return list(self._by_cell.get(cell_uid, []))
+
+    def durations(self, cell_uid, last=20):
+        return [r["d"] for r in self.records(cell_uid) if r["o"] == "ok"][-last:]
+
+    def regressions(self, threshold=0.25, min_runs=3, min_delta=0.05):
+        """
+        Returns one summary dict per (cell, source) pair that ran at least `min_runs` times.
+        `regressed` is True when the latest successful run is slower than the median of
+        the previous successful runs of the same source by more than `threshold`
+        (fraction) and by at least `min_delta` seconds, which filters timer noise on
+        very fast cells.
+        """
+        groups = {}
+        for r in self._load():
+            if r["o"] != "ok":
+                continue
+            groups.setdefault((r["c"], r["h"]), []).append(r)
+
+        summary = []
+        for (cell_uid, source_hash), runs in groups.items():
+            if len(runs) < min_runs:
+                continue
+            latest = runs[-1]["d"]
+            baseline = statistics.median(r["d"] for r in runs[:-1])
+            change = (latest - baseline) / baseline if baseline else 0.0
+            summary.append({
+                "cell": cell_uid,
+                "source_hash": source_hash,
+                "runs": len(runs),
+                "latest": latest,
+                "baseline": baseline,
+                "change": change,
+                "last_run": runs[-1]["t"],
+                "durations": [r["d"] for r in runs[-20:]],
+                "regressed": change > threshold and (latest - baseline) >= min_delta,
+            })
+
+        summary.sort(key=lambda s: (not s["regressed"], -s["change"]))
+        return summary
@@ -0,0 +1,283 @@
+import os, sys, json, time, argparse, tempfile, multiprocessing
+from multiprocessing.connection import wait
+import nbformat
+
+
+
+PARAMETERS_TAG = "parameters"
+INJECTED_TAG = "injected-parameters"
+
+def inject_parameters(model, parameters):
+    """
+    Papermill-style: adds a code cell tagged "injected-parameters" that assigns
+    `parameters` right after the cell tagged "parameters" (which keeps the defaults),
+    or first if there is none. Values must have a literal repr (numbers, strings,
+    lists, dicts, ...). An injected cell left by a previous run is replaced.
+    """
+    from NotebookModel import CellModel
+
+    for index in reversed(range(len(model.cells))):
+        if INJECTED_TAG in model.cells[index].metadata.get("tags", []):
+            model.remove(index)
+    position = 0
+    for index, cell in enumerate(model.cells):
+        if cell.cell_type == "code" and PARAMETERS_TAG in cell.metadata.get("tags", []):
+            position = index + 1
+            break
+    source = "# Parameters\n" + "".join(f"{name} = {value!r}\n" for name, value in parameters.items())
+    cell = CellModel("code", source, metadata={"tags": [INJECTED_TAG], "uranus": {"origin": "uranus"}})
+    model.insert(position, cell)
+    return cell
+
+def collect_variables(kernel, names):
+    """Values of `names` from the kernel namespace, as JSON values when possible, otherwise their repr."""
+    results = {}
+    for name in names:
+        if name not in kernel.shell.user_ns:
+            results[name] = None
+            continue
+        value = kernel.shell.user_ns[name]
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            value = repr(value)
+        results[name] = value
+    return results
+
+def execute_notebook(path, output_path=None, stop_on_error=False, report=None, parameters=None, collect=(),
+                     limits=None, process_limit=False):
+    """
+    Runs every code cell of the notebook at `path` in a fresh IPythonKernel, with the
+    GUI's execution semantics (matplotlib capture, DataFrame / array mapping, output
+    filtering), and writes it back in Uranus format to `output_path` (default: in place).
+
+    input() raises EOFError and event-loop code (Tk, Qt, asyncio) is reported as an
+    error instead of being sent to a terminal. `report(record)` is called after each
+    cell. `parameters` are injected with inject_parameters(), and the variables named
+    in `collect` are read from the namespace once the notebook ran.
+    Each cell runs under `limits` (ResourceLimits, see CellGuard); a violation is
+    reported as a CellTimeout / CellMemoryExceeded / CellOutputExceeded error and
+    recorded in the cell metadata and its record. With `process_limit` (worker
+    processes) the memory limit is also enforced with RLIMIT_AS.
+    Returns the notebook summary: {"path", "output", "status", "duration", "cells"},
+    plus "parameters" and "results" when those were given.
+    """
+    from IPythonKernel import IPythonKernel
+    from NotebookLoader import parse_notebook
+    from NotebookModel import NotebookModel
+    from BlobStore import BlobStore
+    from ResourceLimits import CellGuard, apply_process_limit
+
+    started = time.perf_counter()
+    output_path = output_path or path
+    nb = parse_notebook(path)
+    blob_store = BlobStore(path)
+    blob_store.inline_notebook(nb)
+    model = NotebookModel.from_notebook(nb)
+    if parameters:
+        inject_parameters(model, parameters)
+
+    kernel = IPythonKernel()
+    kernel.terminal_fallback = False
+    kernel.plot_path = os.path.join(tempfile.gettempdir(), f"uranus_plot_{os.getpid()}.png")
+    # cells see the notebook folder as working directory, as in the GUI
+    os.chdir(os.path.dirname(os.path.abspath(path)))
+    if process_limit and limits is not None:
+        apply_process_limit(limits.memory_mb)
+    deadline = limits.notebook_deadline() if limits is not None else None
+
+    records = []
+    status = "ok"
+    for index, cell in enumerate(model.cells):
+        if cell.cell_type != "code" or not cell.source.strip():
+            continue
+        start = time.perf_counter()
+        outputs = []
+        guard = CellGuard(limits, deadline)
+        guard.run(kernel, cell.source, outputs.append)  # every output, streams included, goes through the callback
+        duration = time.perf_counter() - start
+
+        cell.set_outputs(outputs)
+        uranus = dict(cell.metadata.get("uranus", {}))
+        uranus.setdefault("origin", "jupyter")
+        uranus["uid"] = cell.id
+        uranus.pop("limit", None)
+        if guard.violation is not None:
+            uranus["limit"] = guard.violation.to_metadata()
+        cell.set_metadata(dict(cell.metadata, uranus=uranus), cell.attachments)
+
+        record = {"index": index, "id": cell.id, "duration": round(duration, 6), "status": "ok"}
+        # IPython prints tracebacks to stdout, the exception itself is on the ExecutionResult
+        result = kernel.last_result
+        exception = result and (result.error_before_exec or result.error_in_exec)
+        error = next((out for out in outputs if out.output_type == "error"), None)
+        if guard.violation is not None:
+            record.update(status="error", ename=type(guard.violation).__name__, evalue=guard.violation.describe(),
+                          limit=guard.violation.to_metadata())
+        elif exception is not None:
+            record.update(status="error", ename=type(exception).__name__, evalue=str(exception))
+        elif error is not None:
+            record.update(status="error", ename=error.get("ename", ""), evalue=error.get("evalue", ""))
+        if record["status"] == "error":
+            status = "failed"
+        records.append(record)
+        if report:
+            report(record)
+        if record["status"] == "error" and stop_on_error:
+            break
+        if deadline and time.monotonic() > deadline:
+            break  # notebook time limit, the remaining cells are not run
+
+    out_nb = model.snapshot().to_notebook()
+    # keep images in the sidecar folder if the notebook already uses one
+    if os.path.abspath(output_path) == os.path.abspath(path) and os.path.isdir(blob_store.directory):
+        blob_store.externalize_notebook(out_nb)
+    temp = output_path + ".tmp"
+    with open(temp, "w", encoding="utf-8") as f:
+        nbformat.write(out_nb, f)
+    os.replace(temp, output_path)
+
+    summary = {
+        "path": path,
+        "output": output_path,
+        "status": status,
+        "duration": round(time.perf_counter() - started, 6),
+        "cells": records,
+    }
+    if parameters:
+        summary["parameters"] = parameters
+    if collect:
+        summary["results"] = collect_variables(kernel, collect)
+    return summary
+
+def _run_worker(task, stop_on_error, conn):
+    try:
+        summary = execute_notebook(task["path"], task["output"], stop_on_error,
+                                   report=lambda record: conn.send(("cell", record)),
+                                   parameters=task.get("parameters"), collect=task.get("collect", ()),
+                                   limits=task.get("limits"), process_limit=True)
+    except Exception as e:
+        conn.send(("failed", f"{type(e).__name__}: {e}"))
+    else:
+        conn.send(("done", summary))
+    finally:
+        conn.close()
+
+def run_notebooks(paths, jobs=None, timeout=None, output_dir=None, stop_on_error=False, log=None, limits=None):
+    tasks = [{"path": path, "output": os.path.join(output_dir, os.path.basename(path)) if output_dir else path,
+              "limits": limits} for path in paths]
+    return run_tasks(tasks, jobs, timeout, stop_on_error, log)
+
+def run_tasks(tasks, jobs=None, timeout=None, stop_on_error=False, log=None):
+    """
+    Executes `tasks` ({"path", "output"} and optionally "parameters", "collect" and "limits", see
+    execute_notebook) across at most `jobs` worker processes (default: CPU count), one
+    process per task so a crash or a timeout only loses that run. Returns the
+    JSON-ready summary: {"jobs", "duration", "failed", "notebooks": [...]} in task
+    order. A run past `timeout` seconds is killed; the cells it finished are still
+    reported.
+    """
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    context = multiprocessing.get_context("spawn")  # no inherited Qt or IPython state
+    started = time.perf_counter()
+    pending = list(enumerate(tasks))
+    running = {}  # connection -> state
+    results = [None] * len(tasks)
+
+    def finish(conn, status, summary=None, error=None):
+        state = running.pop(conn)
+        state["process"].join(1)
+        if state["process"].is_alive():
+            state["process"].kill()
+        task = state["task"]
+        result = summary or {
+            "path": task["path"], "output": task["output"], "status": status,
+            "duration": round(time.perf_counter() - state["start"], 6), "cells": state["cells"],
+        }
+        if summary is None and task.get("parameters"):
+            result["parameters"] = task["parameters"]
+        if error:
+            result["error"] = error
+        results[state["order"]] = result
+        if log:
+            log(f"[{result['status']:>7}] {task['output']} ({result['duration']:.1f}s)")
+
+    while pending or running:
+        while pending and len(running) < jobs:
+            order, task = pending.pop(0)
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=_run_worker, args=(task, stop_on_error, sender), daemon=True)
+            process.start()
+            sender.close()
+            running[receiver] = {"order": order, "task": task, "process": process,
+                                 "start": time.perf_counter(), "cells": []}
+
+        for conn in wait(list(running), timeout=0.2):
+            try:
+                kind, payload = conn.recv()
+            except EOFError:
+                process = running[conn]["process"]
+                process.join(5)
+                finish(conn, "crashed", error=f"worker exited with code {process.exitcode}")
+                continue
+            if kind == "cell":
+                running[conn]["cells"].append(payload)
+            elif kind == "done":
+                finish(conn, payload["status"], summary=payload)
+            else:
+                finish(conn, "error", error=payload)
+
+        if timeout:
+            now = time.perf_counter()
+            for conn, state in list(running.items()):
+                if now - state["start"] > timeout:
+                    state["process"].kill()
+                    finish(conn, "timeout", error=f"killed after {timeout}s")
+
+    return {
+        "jobs": jobs,
+        "duration": round(time.perf_counter() - started, 6),
+        "failed": sum(1 for result in results if result["status"] != "ok"),
+        "notebooks": results,
+    }
+
+def add_limit_arguments(parser):
+    parser.add_argument("--cell-timeout", type=float, default=None, help="seconds per cell before it is interrupted")
+    parser.add_argument("--memory-mb", type=int, default=None,
+                        help="memory a cell may add, also the worker's address space headroom (RLIMIT_AS)")
+    parser.add_argument("--output-kb", type=int, default=None, help="output a cell may produce before it is cut off")
+
+def limits_from_args(args):
+    from ResourceLimits import ResourceLimits
+    return ResourceLimits(args.cell_timeout, args.memory_mb, args.output_kb)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="uranus run", description="Run notebooks without the GUI.")
+    parser.add_argument("notebooks", nargs="+", help=".ipynb files to execute")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="parallel notebooks (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds per notebook before it is killed")
+    parser.add_argument("--output-dir", default=None, help="write executed notebooks here instead of in place")
+    parser.add_argument("--summary", default=None, help="write the JSON summary to this file (default: stdout)")
+    parser.add_argument("--stop-on-error", action="store_true", help="stop a notebook at its first failing cell")
+    add_limit_arguments(parser)
+    args = parser.parse_args(argv)
+
+    missing = [path for path in args.notebooks if not os.path.isfile(path)]
+    if missing:
+        parser.error("no such notebook: " + ", ".join(missing))
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    summary = run_notebooks([os.path.abspath(path) for path in args.notebooks], args.jobs, args.timeout,
+                            args.output_dir and os.path.abspath(args.output_dir), args.stop_on_error,
+                            log=lambda line: print(line, file=sys.stderr), limits=limits_from_args(args))
+    text = json.dumps(summary, indent=2)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
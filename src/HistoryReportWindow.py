@@ -0,0 +1,137 @@
+import time
+from PyQt5.QtWidgets import (
+    QWidget, QTableWidget, QVBoxLayout, QTableWidgetItem, QHeaderView, QLabel
+)
+from PyQt5.QtGui import QFont, QColor, QBrush, QPainter, QPen
+from PyQt5.QtCore import Qt, QPointF
+
+from BenchmarkRunner import format_duration
+
+
+
+class Sparkline(QWidget):
+    """
+    Tiny line chart of recent execution times, shown in the cell header and in
+    the history report. The last point is drawn red when it is the slowest run.
+    """
+
+    def __init__(self, parent=None, width=90, height=18):
+        super().__init__(parent)
+        self.values = []
+        self.setFixedSize(width, height)
+
+    def set_values(self, values):
+        self.values = list(values)
+        if self.values:
+            self.setToolTip("Last runs: " + ", ".join(format_duration(v) for v in self.values[-10:]))
+        self.update()
+
+    def paintEvent(self, event):
+        if len(self.values) < 2:
+            return
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        low, high = min(self.values), max(self.values)
+        span = (high - low) or 1.0
+        w, h = self.width() - 4, self.height() - 4
+        step = w / (len(self.values) - 1)
+
+        points = [
+            QPointF(2 + i * step, 2 + h - ((v - low) / span) * h)
+            for i, v in enumerate(self.values)
+        ]
+
+        painter.setPen(QPen(QColor("#1e88e5"), 1.5))
+        for start, end in zip(points, points[1:]):
+            painter.drawLine(start, end)
+
+        last_color = QColor("#c62828") if self.values[-1] >= high and high > low else QColor("#1e88e5")
+        painter.setPen(QPen(last_color, 1))
+        painter.setBrush(last_color)
+        painter.drawEllipse(points[-1], 2, 2)
+
+class HistoryReportWindow(QWidget):
+    """
+    Notebook report built from ExecutionHistory.regressions().
+
+    One row per (cell, source) pair with its run count, median baseline, latest
+    duration, relative change and a sparkline. Rows whose runtime regressed
+    against previous runs of the same source are highlighted.
+
+    Methods:
+    - add_rows(rows): Rebuilds the table. Each row is a regressions() dict plus a
+      'label' key naming the cell (e.g. "Cell 4").
+    """
+
+    def __init__(self, parent=None, file_name=''):
+        super().__init__(parent)
+        self.setWindowTitle(f"Execution History - {file_name}")
+        layout = QVBoxLayout()
+
+        self.summary = QLabel()
+        self.summary.setFont(QFont("Segoe UI", 10, QFont.Bold))
+        layout.addWidget(self.summary)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(8)
+        self.table.setHorizontalHeaderLabels([
+            "Cell", "Source", "Runs", "Baseline (median)", "Latest", "Change", "Last Run", "Trend"
+        ])
+        self.table.verticalHeader().setVisible(False)
+        self.table.setAlternatingRowColors(True)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setFont(QFont("Segoe UI", 10))
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setStyleSheet("""
+            QTableWidget {
+                background-color: #f8f8f8;
+                gridline-color: #cccccc;
+            }
+            QHeaderView::section {
+                background-color: #d0d0d0;
+                font-weight: bold;
+                padding: 4px;
+            }
+        """)
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+        self.resize(900, 450)
+        self.show()
+
+    def add_rows(self, rows):
+        regressed = sum(1 for r in rows if r["regressed"])
+        self.summary.setText(
+            f"{len(rows)} cell versions with enough runs  |  "
+            f"{regressed} regressed" if rows else "Not enough runs recorded yet (each source needs 3 runs)"
+        )
+
+        self.table.setRowCount(len(rows))
+        self.table.clearContents()
+
+        for i, row in enumerate(rows):
+            values = [
+                row.get("label", ""),
+                row["source_hash"],
+                str(row["runs"]),
+                format_duration(row["baseline"]),
+                format_duration(row["latest"]),
+                f"{row['change']:+.0%}",
+                time.strftime("%Y-%m-%d %H:%M", time.localtime(row["last_run"])),
+            ]
+            for col, text in enumerate(values):
+                item = QTableWidgetItem(text)
+                item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
+                item.setTextAlignment(Qt.AlignCenter)
+                if row["regressed"]:
+                    item.setBackground(QBrush(QColor("#ffcdd2")))
+                    if col == 5:
+                        item.setForeground(QBrush(QColor("#b71c1c")))
+                        item.setFont(QFont("Segoe UI", 10, QFont.Bold))
+                self.table.setItem(i, col, item)
+
+            sparkline = Sparkline(width=120, height=22)
+            sparkline.set_values(row["durations"])
+            self.table.setCellWidget(i, 7, sparkline)
@@ -0,0 +1,430 @@
+import os ,base64  ,io ,builtins ,uuid , importlib , sys ,inspect , subprocess , tempfile
+from nbformat.v4 import  new_output
+from contextlib import redirect_stdout, redirect_stderr
+from traitlets.config import Config
+from IPython.core.interactiveshell import InteractiveShell
+
+
+
+class TerminalRunner:
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(TerminalRunner, cls).__new__(cls)
+        return cls._instance
+
+    def run_code(self, code_text: str):
+        temp_file = os.path.join(tempfile.gettempdir(), "uranus_temp.py")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            f.write(code_text)
+
+        python_exe = sys.executable
+
+        if sys.platform.startswith("win"):
+            cmd = f'start cmd /k "{python_exe} -u {temp_file}"'
+
+
+            subprocess.Popen(cmd, shell=True)
+
+        elif sys.platform.startswith("linux"):
+            cmd = f'gnome-terminal -- bash -c "{python_exe} -u {temp_file}; exec bash"'
+
+            subprocess.Popen(cmd, shell=True)
+
+        elif sys.platform == "darwin":
+            apple_script = f'''
+            tell application "Terminal"
+                do script "{python_exe} -u {temp_file}"
+                activate
+            end tell
+            '''
+
+            subprocess.Popen(["osascript", "-e", apple_script])
+        else:
+            raise OSError(f"Unsupported platform: {sys.platform}")
+
+class StreamCatcher(io.StringIO):
+    """
+    A stream interceptor that captures stdout/stderr line-by-line and emits structured output.
+
+    Purpose:
+    - Used during code execution to redirect and format console output.
+    - Converts each line into a Jupyter-compatible nbformat output object.
+
+    Parameters:
+    - name (str): Stream name ("stdout" or "stderr").
+    - callback (function): Function to receive each parsed output line.
+
+    Behavior:
+    - Buffers incoming text until newline.
+    - Emits each complete line via callback as nbformat stream output.
+    """
+
+    def __init__(self, name, callback):
+        super().__init__()
+        self._name = name
+        self.callback = callback
+        self._buffer = ""
+
+    def write(self, text):
+        self._buffer += text
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            if line.strip():
+                out = new_output("stream", name=self._name, text=line)
+                self.callback(out)
+
+class IPythonKernel:
+    """
+    A lightweight wrapper around IPython's InteractiveShell for executing notebook cells.
+
+    Qt-free, so the same execution semantics serve the GUI and headless runs
+    (HeadlessRunner); the GUI plugs its InputWaiter dialog in as input_waiter.
+
+    Responsibilities:
+    - Executes code cells and captures stdout, stderr, and display outputs.
+    - Handles input() via input_waiter, or raises EOFError without one.
+    - Converts matplotlib and image outputs to base64 PNG for inline display.
+    - Maps Python objects to appropriate output editors (e.g., table, image, text).
+
+    Attributes:
+    - shell (InteractiveShell): IPython shell instance.
+    - input_waiter: Object with wait_for_input(prompt), e.g. WorkWindow's InputWaiter; None when headless.
+    - terminal_fallback (bool): Run event-loop code (Tk, Qt, asyncio) in an external terminal.
+    - plot_path (str): File plt.show() is redirected to; parallel headless runs use one each.
+    - object_store (dict): Stores references to large objects for later inspection.
+
+    Methods:
+    - run_cell(code, callback): Executes code and emits outputs via callback.
+    - __uranus_inspect_variables(): Returns a DataFrame of global variables (optional).
+    """
+
+    def __init__(self):
+        cfg = Config()
+        cfg.InteractiveShellEmbed = Config()
+        cfg.InteractiveShellEmbed.user_ns = {}
+
+
+        self.shell = InteractiveShell(config=cfg)
+        self.input_waiter = None
+        self.terminal_fallback = True
+        self.last_result = None  # ExecutionResult of the last run_cell, None if it was blocked
+        self.plot_path = "plot.png"  # where plt.show() is redirected, relative to the working directory
+        self.object_store = {}
+
+    def run_cell(self, code: str, callback):
+        builtins.input = self.input_waiter.wait_for_input if self.input_waiter else self.no_input
+        if ("matplotlib" in code or "plt." in code) and importlib.util.find_spec("matplotlib") is not None:
+            injected = "import matplotlib; matplotlib.use('Agg')\n"
+            code = injected + code.replace("plt.show()", f"plt.savefig({self.plot_path!r})")
+
+        outputs = []
+        self.last_result = None
+        stdout_catcher = StreamCatcher("stdout", callback)
+        stderr_buffer = io.StringIO()
+
+        # 🚫 Block problematic event-loop libraries in one condition
+        if (
+            "tkinter" in code or "Tk(" in code or
+            "PyQt5" in code or "PySide2" in code or "QApplication(" in code or
+            "asyncio" in code or "await " in code or "async def" in code
+        ):
+
+            if self.terminal_fallback:
+                terminal = TerminalRunner()        
+                terminal.run_code(code)  
+            tb_lines = [
+                "⚠️ Code execution blocked.",
+                "Reason: Event-loop based libraries (Tkinter, Qt, asyncio) conflict with IPython/QThread execution.",
+                "These libraries manage their own GUI or async loops which cannot be safely re-entered in Uranus IDE cells.",
+                "Therefore, we need to run your code using the standard Python interpreter instead."
+            ]
+            out = new_output(
+                "error",
+                ename="EventLoopBlocked",
+                evalue="Execution of Tkinter/Qt/asyncio code is not supported inside Uranus IDE cells",
+                traceback=tb_lines
+            )
+            outputs.append(out)
+            callback(out)
+            return outputs
+
+
+        with redirect_stdout(stdout_catcher), redirect_stderr(stderr_buffer):
+            result = self.shell.run_cell(code)
+        self.last_result = result
+
+        obj = result.result
+        stderr_text = stderr_buffer.getvalue().strip()     
+
+
+        # 🖼️ image
+        if os.path.exists(self.plot_path):
+            try:
+                with open(self.plot_path, "rb") as f:
+                    encoded = base64.b64encode(f.read()).decode("utf-8")
+                out = new_output("display_data", data={"image/png": encoded},
+                                metadata={"object_type": "Figure", "editor": "output_image"})
+                outputs.append(out)
+                callback(out)
+            except Exception:
+                pass
+            finally:
+
+                try:
+                    user_ns = self.shell.user_ns
+                    if "plt" in user_ns:
+                        user_ns["plt"].close("all")
+
+                except Exception:
+                    pass
+
+                try :
+                    os.remove(self.plot_path)
+                except Exception:
+                    pass
+
+        # 🔥 error
+        if stderr_text:
+            tb_lines = stderr_text.splitlines()
+            out = new_output(
+                "error",
+                ename="Exception",
+                evalue=tb_lines[-1] if tb_lines else "",
+                traceback=tb_lines,
+            )
+            outputs.append(out)
+            callback(out)
+
+        # ⛔ if None or error stop
+        if obj is None or (isinstance(obj, str) and stderr_text):
+            return outputs
+
+        obj_type = type(obj).__name__
+        obj_module = obj.__class__.__module__
+        full_type = f"{obj_module}.{obj_type}" if obj_module != "builtins" else obj_type
+
+        EDITOR_MAP = {
+            "pandas.core.frame.DataFrame": "output_data",
+            "numpy.ndarray": "output_array",
+            "numpy.memmap": "output_array",
+            "matplotlib.figure.Figure": "output_image",
+            "PIL.Image.Image": "output_image",
+            "plotly.graph_objs._figure.Figure": "output_image",
+            "str": "output_editor",
+            "Exception": "output_editor"
+        }
+
+        editor = EDITOR_MAP.get(full_type)
+
+        # 📊 table
+        if editor == "output_data":
+            obj_id = f"obj_{uuid.uuid4().hex}"
+            self.object_store[obj_id] = obj
+            # the live frame is shown by DataFrameWidget; the saved html only needs a preview
+            html = obj.to_html(index=False, max_rows=60)
+            out = new_output(
+                "display_data",
+                data={"text/html": html},
+                metadata={"object_type": obj_type, "editor": editor, "object_ref": obj_id}
+            )
+            outputs.append(out)
+            callback(out)
+
+        # 🔢 array
+        elif editor == "output_array":
+            obj_id = f"obj_{uuid.uuid4().hex}"
+            self.object_store[obj_id] = obj
+            # numpy's repr already elides large arrays, so this stays small
+            out = new_output(
+                "display_data",
+                data={"text/plain": repr(obj)},
+                metadata={"object_type": obj_type, "editor": editor, "object_ref": obj_id}
+            )
+            outputs.append(out)
+            callback(out)
+
+        # 🖼️ image
+        elif editor == "output_image":
+            buf = io.BytesIO()
+            try:
+                if hasattr(obj, "savefig"):
+                    obj.savefig(buf, format="png")
+                    if hasattr(obj, "close"):
+                        obj.close()
+                elif hasattr(obj, "save"):
+                    obj.save(buf, format="PNG")
+                else:
+                    return outputs
+                buf.seek(0)
+                encoded = base64.b64encode(buf.read()).decode("utf-8")
+                buf.close()
+                out = new_output(
+                    "display_data",
+                    data={"image/png": encoded},
+                    metadata={"object_type": obj_type, "editor": editor}
+                )
+                outputs.append(out)
+                callback(out)
+            except Exception:
+                return outputs
+
+        return outputs
+
+    @staticmethod
+    def no_input(prompt=None):
+        raise EOFError("input() is not available without an input handler (headless run)")
+
+    HIDDEN_NAMES = {"In", "Out", "get_ipython", "exit", "quit", "__builtins__", "open"}
+
+    @staticmethod
+    def _is_user_object(obj):
+        if inspect.isclass(obj):
+            return getattr(obj, "__module__", None) == "__main__"
+        return hasattr(obj, "__class__") and getattr(obj.__class__, "__module__", None) == "__main__"
+
+    DIGEST_ITEMS = 256  # elements of a container sampled into its fingerprint
+
+    @classmethod
+    def _fingerprint(cls, obj):
+        """
+        Cheap identity of a namespace value: rebinding changes the id, in-place growth of
+        builtin containers changes the length, reshaping arrays/frames changes the shape
+        and rebinding an attribute of a user object changes the (name, id) pairs.
+        Mutable containers, arrays and frames add a digest of a bounded sample of
+        their content (see _digest), so `lst[0] = 99` or `a += 5` shows up as changed.
+        """
+        fingerprint = (id(obj), type(obj))
+        try:
+            if isinstance(obj, (list, dict, set, tuple, bytearray, str, bytes)):
+                fingerprint += (len(obj),)
+            elif hasattr(obj, "shape") and not inspect.isclass(obj):
+                fingerprint += (tuple(obj.shape),)
+            if cls._is_user_object(obj):
+                fingerprint += (tuple((k, id(v)) for k, v in vars(obj).items()),)
+        except Exception:
+            pass
+        fingerprint += (cls._digest(obj),)
+        return fingerprint
+
+    @classmethod
+    def _digest(cls, obj):
+        """
+        Hash of at most about DIGEST_ITEMS evenly spaced elements (item ids for lists and
+        dicts, raw values for arrays, row hashes for pandas objects); None for values
+        that cannot change in place. A change between sampled elements can go unseen
+        in very large containers. Content that cannot be sampled gets a fresh object,
+        so the value is described again on every refresh.
+        """
+        limit = cls.DIGEST_ITEMS
+        try:
+            if isinstance(obj, (str, bytes, tuple, frozenset, int, float, complex, bool, type(None))):
+                return None
+            if isinstance(obj, (list, bytearray)):
+                step = max(1, len(obj) // limit)
+                return hash(tuple(obj[::step])) if isinstance(obj, bytearray) else \
+                    hash(tuple(id(item) for item in obj[::step]))
+            if isinstance(obj, dict):
+                step = max(1, len(obj) // limit)
+                return hash(tuple((id(key), id(value)) for index, (key, value) in enumerate(obj.items())
+                                  if index % step == 0))
+            if isinstance(obj, set):
+                return hash(frozenset(id(item) for index, item in enumerate(obj) if index < limit))
+
+            numpy = sys.modules.get("numpy")
+            if numpy is not None and isinstance(obj, numpy.ndarray):
+                if obj.ndim == 0:
+                    return hash(obj.tobytes())
+                per_axis = max(1, int(limit ** (1.0 / obj.ndim)))
+                sample = obj[tuple(slice(None, None, max(1, length // per_axis)) for length in obj.shape)]
+                return hash(sample.tobytes())
+
+            pandas = sys.modules.get("pandas")
+            if pandas is not None and isinstance(obj, (pandas.DataFrame, pandas.Series)):
+                sample = obj.iloc[::max(1, len(obj) // limit)]
+                columns = tuple(map(str, obj.columns)) if isinstance(obj, pandas.DataFrame) else ()
+                return hash((columns, pandas.util.hash_pandas_object(sample, index=True).values.tobytes()))
+        except Exception:
+            return object()
+        return None
+
+    @staticmethod
+    def _describe(name, obj):
+        from ObjectInspectorWindow import summarize_value, is_structured_type  # GUI side only
+        try:
+            size = sys.getsizeof(obj)
+        except Exception:
+            size = 0
+        return {
+            "name": name,
+            "type": type(obj).__name__,
+            "size": size,
+            "value": obj,
+            "summary": summarize_value(obj),
+            "structured": is_structured_type(obj),
+        }
+
+    def inspect_namespace_diff(self, previous=None):
+        """
+        Diffs user_ns against a previous snapshot and describes only what changed.
+
+        previous / returned snapshot: {name: (fingerprint, [attribute row names])}
+        Returns a dict with:
+        - snapshot: the new snapshot, to pass back on the next call
+        - added / changed: row dicts (name, type, size, value, summary, structured)
+        - removed: row names that disappeared (including attributes of removed objects)
+
+        Unchanged names are not described again and their attributes are not walked,
+        so the cost of a refresh is proportional to what the cell touched.
+        """
+        previous = previous or {}
+        snapshot = {}
+        rows = []
+
+        for name, obj in list(self.shell.user_ns.items()):
+            if name.startswith("_") or name in self.HIDDEN_NAMES:
+                continue
+            try:
+                fingerprint = self._fingerprint(obj)
+            except ReferenceError:
+                continue
+
+            old = previous.get(name)
+            if old is not None and old[0] == fingerprint:
+                snapshot[name] = old
+                continue
+
+            try:
+                rows.append(self._describe(name, obj))
+                children = []
+                # User-defined class or instance of user-defined class
+                if self._is_user_object(obj):
+                    for attr_name, attr_value in vars(obj).items():
+                        if attr_name.startswith("_"):
+                            continue
+                        child = f"{name}.{attr_name}"
+                        rows.append(self._describe(child, attr_value))
+                        children.append(child)
+            except ReferenceError:
+                continue
+            snapshot[name] = (fingerprint, children)
+
+        previous_names = set()
+        for name, (_, children) in previous.items():
+            previous_names.add(name)
+            previous_names.update(children)
+        current_names = set()
+        for name, (_, children) in snapshot.items():
+            current_names.add(name)
+            current_names.update(children)
+
+        return {
+            "snapshot": snapshot,
+            "added": [row for row in rows if row["name"] not in previous_names],
+            "changed": [row for row in rows if row["name"] in previous_names],
+            "removed": sorted(previous_names - current_names),
+        }
+
+    def inspect_all_user_attributes(self, shell=None):
+        return self.inspect_namespace_diff()["added"]
@@ -0,0 +1,162 @@
+import re, base64
+from PyQt5.QtGui import QImage, QImageWriter
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QBuffer, QByteArray, QIODevice, pyqtSignal
+
+
+
+DATA_URI_PAYLOAD = re.compile(r"data:image/[\w+.-]+;base64,([A-Za-z0-9+/=]+)")
+MIN_WIDTH = 320
+MIN_QUALITY = 50
+
+def lossy_format():
+    return "WEBP" if b"webp" in QImageWriter.supportedImageFormats() else "JPEG"
+
+def encode(image, fmt, quality=-1):
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, fmt, quality)
+    buffer.close()
+    return bytes(data)
+
+def is_flat_graphic(image):
+    """
+    Screenshots, diagrams and plots have few distinct colors and compress better
+    (and without artifacts) as PNG; photos have many and belong in a lossy format.
+    """
+    thumb = image.scaled(64, 64, Qt.IgnoreAspectRatio, Qt.FastTransformation).convertToFormat(QImage.Format_RGB32)
+    colors = set()
+    for y in range(thumb.height()):
+        for x in range(thumb.width()):
+            colors.add(thumb.pixel(x, y))
+            if len(colors) > 256:
+                return False
+    return True
+
+def has_transparency(image):
+    if not image.hasAlphaChannel():
+        return False
+    thumb = image.scaled(64, 64, Qt.IgnoreAspectRatio, Qt.FastTransformation).convertToFormat(QImage.Format_ARGB32)
+    return any(thumb.pixelColor(x, y).alpha() < 255 for y in range(thumb.height()) for x in range(thumb.width()))
+
+def optimize_image(image, max_width=1280, quality=85, max_bytes=None):
+    """
+    Returns (mime, bytes, width) for `image` scaled to at most `max_width` and
+    encoded by content: PNG for flat or transparent graphics, WebP/JPEG for photos
+    (whichever of PNG and the lossy encoding is smaller). When `max_bytes` is given
+    the width and quality are stepped down until the result fits; returns None if
+    it cannot fit even at MIN_WIDTH / MIN_QUALITY.
+    """
+    if image.width() > max_width:
+        image = image.scaledToWidth(max_width, Qt.SmoothTransformation)
+
+    keep_png = has_transparency(image) or is_flat_graphic(image)
+    lossy = lossy_format()
+
+    while True:
+        candidates = [("image/png", encode(image, "PNG"))]
+        if not keep_png:
+            photo = image.convertToFormat(QImage.Format_RGB32)
+            candidates.append((f"image/{lossy.lower()}", encode(photo, lossy, quality)))
+        mime, data = min(candidates, key=lambda c: len(c[1]))
+
+        # base64 adds a third on top of the raw bytes
+        if max_bytes is None or len(data) * 4 // 3 <= max_bytes:
+            return mime, data, image.width()
+
+        if not keep_png and quality > MIN_QUALITY:
+            quality = max(MIN_QUALITY, quality - 15)
+        elif image.width() > MIN_WIDTH:
+            image = image.scaledToWidth(max(MIN_WIDTH, int(image.width() * 0.75)), Qt.SmoothTransformation)
+        else:
+            return None
+
+class ImageBudget:
+    """
+    Per-notebook byte budget (base64 size) for images pasted or inserted into
+    doc and markdown cells.
+
+    `measure` is a callable returning the bytes currently used; it is called lazily
+    on the first insert and again whenever the notebook is saved (refresh), and
+    inserts are added on top in between.
+    """
+
+    def __init__(self, limit_bytes, measure=None):
+        self.limit_bytes = limit_bytes
+        self.measure = measure
+        self.used = None
+
+    @staticmethod
+    def count_html(html):
+        return sum(len(m.group(1)) for m in DATA_URI_PAYLOAD.finditer(html))
+
+    def refresh(self, used=None):
+        if used is None and self.measure is not None:
+            used = self.measure()
+        self.used = used
+
+    def remaining(self):
+        if self.used is None:
+            self.refresh()
+        return max(self.limit_bytes - (self.used or 0), 0)
+
+    def add(self, size):
+        if self.used is None:
+            self.refresh()
+        self.used = (self.used or 0) + size
+
+class ImageIngestSignals(QObject):
+    finished = pyqtSignal(object)
+
+class ImageIngestTask(QRunnable):
+    """
+    Runs optimize_image() on QThreadPool.globalInstance(); emits a dict with
+    'html', 'mime', 'size' and 'width', or None when the image does not fit the budget.
+    """
+
+    def __init__(self, image, max_width, quality, max_bytes):
+        super().__init__()
+        self.image = QImage(image)  # own copy, the clipboard image may go away
+        self.max_width = max_width
+        self.quality = quality
+        self.max_bytes = max_bytes
+        self.signals = ImageIngestSignals()
+
+    def run(self):
+        try:
+            result = optimize_image(self.image, self.max_width, self.quality, self.max_bytes)
+        except Exception as e:
+            print(f"[ImageIngestTask] {e}")
+            result = None
+        if result is None:
+            self.signals.finished.emit(None)
+            return
+        mime, data, width = result
+        encoded = base64.b64encode(data).decode("ascii")
+        self.signals.finished.emit({
+            "html": f'<img src="data:{mime};base64,{encoded}" width="{width}"><br>',
+            "mime": mime,
+            "size": len(encoded),
+            "width": width,
+        })
+
+def ingest_image(image, cursor, settings, budget=None, on_rejected=None):
+    """
+    Optimizes `image` off the GUI thread and inserts it at `cursor` (a QTextCursor,
+    which keeps tracking its position while the user goes on typing).
+    """
+    max_bytes = budget.remaining() if budget is not None else None
+    task = ImageIngestTask(image, settings.get("Image Max Width", 1280),
+                           settings.get("Image Quality", 85), max_bytes)
+
+    def finished(result):
+        if result is None:
+            if on_rejected:
+                on_rejected()
+            return
+        cursor.insertHtml(result["html"])
+        if budget is not None:
+            budget.add(result["size"])
+
+    task.signals.finished.connect(finished)
+    QThreadPool.globalInstance().start(task)
@@ -1,16 +1,97 @@
-import base64
-from PyQt5.QtGui import QPixmap
-from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QSizePolicy
+import base64, hashlib
+from collections import OrderedDict
+from PyQt5.QtGui import QPixmap, QImage
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QSizePolicy, QDialog, QScrollArea
 from SettingWindow import load_setting
 
 
 
+WIDTH_STEP = 100  # display widths are rounded down to this, so small resizes reuse the cache
+
+class ImageCache:
+    """
+    Byte-budgeted LRU of decoded QImages shared by all ImageOutput widgets.
+
+    Keys are (content hash, width) where width is the downscaled display width or
+    None for the full-resolution image, so the same figure bytes after a re-run,
+    an undo or in another cell are decoded only once.
+    """
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self.images = OrderedDict()
+
+    def get(self, key):
+        image = self.images.get(key)
+        if image is not None:
+            self.images.move_to_end(key)
+        return image
+
+    def put(self, key, image):
+        if key in self.images:
+            self.used_bytes -= self.images.pop(key).sizeInBytes()
+        size = image.sizeInBytes()
+        if size > self.budget_bytes:
+            return
+        self.images[key] = image
+        self.used_bytes += size
+        while self.used_bytes > self.budget_bytes:
+            _, old = self.images.popitem(last=False)
+            self.used_bytes -= old.sizeInBytes()
+
+_cache = None
+
+def image_cache():
+    global _cache
+    if _cache is None:
+        _cache = ImageCache(int(load_setting().get("Image Cache MB", 64)) * 1024 * 1024)
+    return _cache
+
+class ImageDecodeSignals(QObject):
+    decoded = pyqtSignal(int, object, QImage)
+
+class ImageDecodeTask(QRunnable):
+    """
+    Decodes a base64 PNG into a QImage on QThreadPool.globalInstance() and scales
+    it down to `width` when it is wider. QImage (unlike QPixmap) may be created
+    outside the GUI thread.
+    """
+
+    def __init__(self, request_id, key, base64_data, width=None):
+        super().__init__()
+        self.request_id = request_id
+        self.key = key
+        self.base64_data = base64_data
+        self.width = width
+        self.signals = ImageDecodeSignals()
+
+    def run(self):
+        image = QImage()
+        try:
+            image.loadFromData(base64.b64decode(self.base64_data))
+            if self.width and image.width() > self.width:
+                image = image.scaledToWidth(self.width, Qt.SmoothTransformation)
+        except Exception:
+            pass
+        self.signals.decoded.emit(self.request_id, self.key, image)
+
 class ImageOutput(QWidget):
+    """
+    Image output of a code cell.
+
+    Decoding happens on the global thread pool, downscaled to the width the image
+    is displayed at; decoded images are shared through ImageCache. Double-clicking
+    the image opens it at full resolution.
+    """
 
     def __init__(self):
         super().__init__()
         self.setVisible(False)
+        self._request_id = 0
+        self.base64_data = None
+        self.content_hash = None
 
         setting = load_setting()
         bg = setting['colors']['Back Ground Color OutPut']
@@ -29,16 +110,49 @@ class ImageOutput(QWidget):
             }}
         """)
         self.image_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.MinimumExpanding)
+        self.image_label.setToolTip("Double-click to view at full resolution")
+        self.image_label.mouseDoubleClickEvent = lambda event: self.show_full_resolution()
 
         self.layout.addWidget(self.image_label)
 
+    def display_width(self):
+        # before the first layout pass the widget still has its default width
+        parent = self.parentWidget()
+        width = parent.width() if parent is not None else self.width()
+        # rounding down keeps the image narrower than its container, which then never grows
+        return max((width - 24) // WIDTH_STEP * WIDTH_STEP, 200)
+
     def show_image_from_base64(self, base64_data):
-        pixmap = QPixmap()
-        pixmap.loadFromData(base64.b64decode(base64_data))
+        self.load_base64_async(base64_data)
+
+    def load_base64_async(self, base64_data):
+        self.base64_data = base64_data
+        self.content_hash = hashlib.sha1(base64_data.encode("ascii")).hexdigest()
+        self._request_id += 1
+        self.request_image(self._request_id, self.display_width(), self.image_decoded)
+
+    def request_image(self, request_id, width, callback):
+        key = (self.content_hash, width)
+        cached = image_cache().get(key)
+        if cached is not None:
+            callback(request_id, key, cached)
+            return
+        task = ImageDecodeTask(request_id, key, self.base64_data, width)
+        task.signals.decoded.connect(callback)
+        QThreadPool.globalInstance().start(task)
+
+    def image_decoded(self, request_id, key, image):
+        if image.isNull():
+            return
+        image_cache().put(key, image)
+        if request_id == self._request_id:
+            self.set_pixmap(QPixmap.fromImage(image))
+
+    def set_pixmap(self, pixmap):
         self.image_label.setPixmap(pixmap)
 
         height = pixmap.height()
-        height = max(height, 150)  
+        height = max(height, 150)
 
 
         self.image_label.setMinimumHeight(height)
@@ -46,6 +160,32 @@ class ImageOutput(QWidget):
         self.image_label.updateGeometry()
         self.setVisible(True)
 
+    def show_full_resolution(self):
+        if self.base64_data is None:
+            return
+        self.request_image(0, None, self.full_image_decoded)
+
+    def full_image_decoded(self, request_id, key, image):
+        if image.isNull():
+            return
+        image_cache().put(key, image)
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"Image {image.width()} x {image.height()}")
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        label = QLabel()
+        label.setPixmap(QPixmap.fromImage(image))
+        scroll = QScrollArea()
+        scroll.setWidget(label)
+        layout = QVBoxLayout(dialog)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(scroll)
+        dialog.resize(min(image.width() + 30, 1400), min(image.height() + 30, 900))
+        dialog.show()
+
     def clear(self):
+        self._request_id += 1
+        self.base64_data = None
+        self.content_hash = None
         self.image_label.clear()
-        self.setVisible(False)
\ No newline at end of file
+        self.setVisible(False)
@@ -1,20 +1,35 @@
-import json , nbformat , os 
+import json , os , sys , time
 
 from PyQt5 import sip
 from PyQt5.QtWidgets import  QMainWindow, QWidget, QVBoxLayout, QToolBar, QToolButton, QDockWidget  , QMessageBox , QMdiArea, QAction , QFileDialog ,QMessageBox , QLabel
 from PyQt5.QtGui import QIcon 
-from PyQt5.QtCore import Qt, QSize , QEvent , QTimer
+from PyQt5.QtCore import Qt, QSize , QEvent , QTimer , QByteArray
 
 
 from utils import  FileTreePanel
-from WorkWindow import WorkWindow 
 from SettingWindow import SettingsWindow , load_setting
 from PythonTemplate import ProjectInfoDialog
 from AboutWindow import AboutWindow
-from WorkWindowPython import WorkWindowPython
+from SessionStore import session_store
 
+# WorkWindow (IPython, jedi, nbformat) and WorkWindowPython load with the first
+# file of their kind, not before the main window shows
 
 
+
+def loaded_class(module_name, class_name):
+    """The class if its module was imported already; no widget can be an instance of it otherwise."""
+    module = sys.modules.get(module_name)
+    return getattr(module, class_name, None) if module is not None else None
+
+def is_work_window(widget):
+    cls = loaded_class("WorkWindow", "WorkWindow")
+    return cls is not None and isinstance(widget, cls)
+
+def is_python_window(widget):
+    cls = loaded_class("WorkWindowPython", "WorkWindowPython")
+    return cls is not None and isinstance(widget, cls)
+
 class MainWindow(QMainWindow):
     open_files = {}  
 
@@ -24,6 +39,7 @@ class MainWindow(QMainWindow):
 
         self.debug = False
         self.work_widget_list = []
+        self.loading_files = set()
         self.setting = load_setting()
 
         self.setWindowTitle("Uranus")
@@ -38,6 +54,14 @@ class MainWindow(QMainWindow):
         self.mdi_area = QMdiArea()        
         self.setCentralWidget(self.mdi_area)
         self.mdi_area.subWindowActivated.connect(self.sync_working_directory)
+        self.mdi_area.subWindowActivated.connect(self.wake_work_window)
+        self.active_work_widget = None
+
+        # notebooks not shown for "Hibernate After Minutes" release their cells
+        self.hibernate_timer = QTimer(self)
+        self.hibernate_timer.setInterval(60 * 1000)
+        self.hibernate_timer.timeout.connect(self.hibernate_idle_windows)
+        self.hibernate_timer.start()
 
         # Set up the status bar with 3 sections
         self.mainwindow_statusbar = self.statusBar()
@@ -61,6 +85,12 @@ class MainWindow(QMainWindow):
         # Initialize UI components
         self.init_ui()
 
+        # files of the last session, reopened once the window is up
+        self.restoring_views = {}  # path -> session entry, applied when the file has loaded
+        self.restore_active = None
+        if self.setting.get("Restore Session", True):
+            QTimer.singleShot(0, self.restore_session)
+
     def init_ui(self):
         # Tree View Model 
         self.tree = FileTreePanel()
@@ -106,6 +136,10 @@ class MainWindow(QMainWindow):
         save_as.triggered.connect(self.save_as_file)
         file_menu.addAction(save_as)
 
+        export_inline = QAction("Export (Inline Images)", self)
+        export_inline.triggered.connect(self.export_inline_file)
+        file_menu.addAction(export_inline)
+
         file_menu.addSeparator() 
 
 
@@ -297,6 +331,7 @@ class MainWindow(QMainWindow):
                         self.ipynb_format_load_file(path)
 
                     else:
+                        from WorkWindow import WorkWindow
                         work_widget = WorkWindow(file_path=path , status_l = self.set_status_left 
                                                 , status_c = self.set_status_center 
                                                 , status_r = self.set_status_right , mdi_area = self.mdi_area)
@@ -317,6 +352,7 @@ class MainWindow(QMainWindow):
                         self.py_format_load_file(path)
 
                     else:
+                        from WorkWindowPython import WorkWindowPython
                         work_widget = WorkWindowPython(file_path=path , status_l = self.set_status_left 
                                     , context = None, status_c = self.set_status_center 
                                     , status_r = self.set_status_right, mdi_area = self.mdi_area)
@@ -340,22 +376,52 @@ class MainWindow(QMainWindow):
 
     def ipynb_format_load_file (self , path):
         if self.debug : print('[MainWindow]->[ipynb_format_load_file]')
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                nb = nbformat.read(f, as_version=4)
+        # parsing runs on a worker so the window stays responsive on large notebooks;
+        # schema validation is optional and runs after the cells are handed over
+        if path in self.loading_files:
+            return
+        self.loading_files.add(path)
+        self.set_status_left(f"Loading {os.path.basename(path)} ...")
+        from NotebookLoader import load_notebook_async
+        load_notebook_async(
+            path,
+            on_loaded=lambda nb, p=path: self.ipynb_notebook_loaded(p, nb),
+            on_failed=lambda e, p=path: self.ipynb_notebook_failed(p, e),
+            on_validated=lambda message, p=path: self.ipynb_notebook_validated(p, message),
+            validate=bool(load_setting().get("Validate Notebooks On Load", False)),
+        )
 
-        except UnicodeDecodeError as e:
+    def ipynb_notebook_failed(self, path, e):
+        self.loading_files.discard(path)
+        self.restoring_views.pop(path, None)
+        self.set_status_left("")
+        if isinstance(e, UnicodeDecodeError):
             QMessageBox.warning(self, "Encoding Error", f"Cannot decode file:\n{e}")
-        except json.JSONDecodeError as e:
+        elif isinstance(e, json.JSONDecodeError):
             QMessageBox.warning(self, "JSON Error", f"Invalid JSON format:\n{e}")
-        except Exception as e:
+        else:
             QMessageBox.warning(self, "Error", f"Unexpected error:\n{e}")
 
+    def ipynb_notebook_validated(self, path, message):
+        if message is not None:
+            print(f"[MainWindow->ipynb_notebook_validated] {path}: {message}")
+            self.set_status_left(f"{os.path.basename(path)} is not a valid notebook: {message}")
+
+    def ipynb_notebook_loaded(self, path, nb):
+        self.loading_files.discard(path)
+        self.set_status_left("")
 
         # Make Instance Object
+        from WorkWindow import WorkWindow
+        view = None
+        entry = self.restoring_views.get(path)
+        if entry is not None and "focus" in entry:
+            # cached heights let the cells in view paint at their place before the rest is built
+            view = {"focus": entry["focus"], "scroll": entry["scroll"], "viewport": entry.get("viewport", 0),
+                    "heights": session_store().load_layout(path)}
         work_widget = WorkWindow(file_path=path , nb_content = nb , status_l = self.set_status_left 
                                 , status_c = self.set_status_center , status_r = self.set_status_right 
-                                , mdi_area = self.mdi_area)
+                                , mdi_area = self.mdi_area , view = view)
         sub_window = self.mdi_area.addSubWindow(work_widget)
         icon_path = os.path.join(os.path.dirname(__file__), "image", "ipynb_icon.png")  
         sub_window.setWindowIcon(QIcon(icon_path))   
@@ -363,6 +429,7 @@ class MainWindow(QMainWindow):
         sub_window.show()
         MainWindow.open_files[path] = sub_window
         self.work_widget_list.append(work_widget)
+        self.apply_restored_view(path)
 
     def py_format_load_file(self,path):
         try:
@@ -376,7 +443,7 @@ class MainWindow(QMainWindow):
         else :  
 
             # Make Instance Object
-
+            from WorkWindowPython import WorkWindowPython
             work_widget = WorkWindowPython(file_path=path , status_l = self.set_status_left 
                                         , context = py_code_context, status_c = self.set_status_center 
                                         , status_r = self.set_status_right , mdi_area = self.mdi_area)
@@ -387,6 +454,7 @@ class MainWindow(QMainWindow):
             sub_window.show()
             MainWindow.open_files[path] = sub_window
             self.work_widget_list.append(work_widget)
+            self.apply_restored_view(path)
 
     def open_settings_window(self):
         self.settings_window = SettingsWindow()
@@ -467,6 +535,16 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, "Save Error", f"Could not save file:\n{e}")
 
+    def export_inline_file(self):
+        active_subwindow = self.mdi_area.activeSubWindow()
+        if not active_subwindow:
+            QMessageBox.warning(self, "No Active File", "No notebook is currently open.")
+            return
+
+        work_widget = active_subwindow.widget()
+        if hasattr(work_widget, "export_inline_file"):
+            work_widget.export_inline_file()
+
     def open_file(self):
         path, _ = QFileDialog.getOpenFileName(
         self,
@@ -536,6 +614,99 @@ class MainWindow(QMainWindow):
                 except Exception as e:
                     print(f"⚠️ Failed to set working directory: {e}")
 
+    def wake_work_window(self, subwindow):
+        now = time.monotonic()
+        previous = self.active_work_widget
+        if previous is not None and not sip.isdeleted(previous):
+            previous.last_active = now  # idle time counts from when it was left
+
+        widget = subwindow.widget() if subwindow else None
+        if is_work_window(widget):
+            widget.last_active = now
+            if widget.hibernated:
+                widget.wake()
+                self.set_status_right(f"Restored {widget.windowTitle()}")
+            self.active_work_widget = widget
+        else:
+            self.active_work_widget = None
+
+    def hibernate_idle_windows(self):
+        self.work_widget_list = [w for w in self.work_widget_list if not sip.isdeleted(w)]
+        minutes = int(load_setting().get("Hibernate After Minutes", 10))
+        if minutes <= 0:
+            return
+        horizon = time.monotonic() - minutes * 60
+        for widget in self.work_widget_list:
+            if (is_work_window(widget) and widget is not self.active_work_widget
+                    and widget.last_active < horizon and widget.hibernate()):
+                print(f"[MainWindow->hibernate_idle_windows] {widget.windowTitle()} hibernated")
+
+    def session_state(self):
+        """Open files in window order with their geometry and view, see SessionStore."""
+        files = []
+        active = self.mdi_area.activeSubWindow()
+        active_path = None
+        for subwindow in self.mdi_area.subWindowList():
+            widget = subwindow.widget()
+            if not (is_work_window(widget) or is_python_window(widget)) or not widget.file_path:
+                continue
+            geometry = subwindow.geometry()
+            entry = {
+                "path": os.path.abspath(widget.file_path),
+                "kind": "ipynb" if is_work_window(widget) else "py",
+                "geometry": [geometry.x(), geometry.y(), geometry.width(), geometry.height()],
+                "maximized": subwindow.isMaximized(),
+            }
+            if is_work_window(widget):
+                entry.update(widget.view_state())
+            files.append(entry)
+            if subwindow is active:
+                active_path = entry["path"]
+        return files, active_path
+
+    def save_session(self, files, active_path):
+        store = session_store()
+        for entry in files:
+            heights = entry.pop("heights", None)
+            if heights:
+                # the file is final now (saved or discarded in its close dialog)
+                store.save_layout(entry["path"], heights)
+        geometry = bytes(self.saveGeometry().toBase64()).decode("ascii")
+        store.save_session(geometry, files, active_path)
+
+    def restore_session(self):
+        session = session_store().load_session()
+        if not session:
+            return
+        if session.get("geometry"):
+            self.restoreGeometry(QByteArray.fromBase64(session["geometry"].encode("ascii")))
+        self.restore_active = session.get("active")
+        for entry in session.get("files", []):
+            path = entry.get("path")
+            existing = MainWindow.open_files.get(path)
+            if not path or not os.path.isfile(path) or (existing and not sip.isdeleted(existing)):
+                continue
+            self.restoring_views[path] = entry
+            if entry.get("kind") == "ipynb" and os.path.getsize(path) > 0:
+                self.ipynb_format_load_file(path)  # applied in ipynb_notebook_loaded
+            elif entry.get("kind") == "py":
+                self.py_format_load_file(path)
+            else:
+                self.restoring_views.pop(path)
+
+    def apply_restored_view(self, path):
+        entry = self.restoring_views.pop(path, None)
+        sub_window = MainWindow.open_files.get(path)
+        if entry is None or sub_window is None:
+            return
+        if entry.get("maximized"):
+            sub_window.showMaximized()
+        elif entry.get("geometry"):
+            sub_window.setGeometry(*entry["geometry"])
+        if not self.restoring_views and self.restore_active in MainWindow.open_files:
+            self.mdi_area.setActiveSubWindow(MainWindow.open_files[self.restore_active])
+            self.restore_active = None
+
     def set_status_left(self, text: str):
         self.status_left.setText(text)
         QTimer.singleShot(3000, lambda: self.status_left.clear())
@@ -549,7 +720,7 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         for widget in self.work_widget_list:
-            if isinstance(widget, WorkWindowPython):
+            if is_python_window(widget):
                 try : 
                     if hasattr(widget, "analyzer_window") and widget.analyzer_window is not None:
                         if widget.analyzer_window.isVisible():
@@ -559,12 +730,12 @@ class MainWindow(QMainWindow):
 
 
 
-            if isinstance(widget, WorkWindow) and widget.detached and widget.detached_window:
+            if is_work_window(widget) and widget.detached and widget.detached_window:
                 widget.detached_window.close()
                 if not sip.isdeleted(widget) and not widget.isHidden():
                     event.ignore()
                     return
-            elif isinstance(widget, WorkWindowPython) and widget.detached and widget.detached_window:
+            elif is_python_window(widget) and widget.detached and widget.detached_window:
                 widget.detached_window.close()
                 if not sip.isdeleted(widget) and not widget.isHidden():
                     event.ignore()
@@ -572,9 +743,10 @@ class MainWindow(QMainWindow):
 
 
 
+        session_files, session_active = self.session_state()
         for subwindow in self.mdi_area.subWindowList():
             widget = subwindow.widget()
-            if isinstance(widget, WorkWindow) or isinstance(widget , WorkWindowPython):
+            if is_work_window(widget) or is_python_window(widget):
                 subwindow.close()
                 if not sip.isdeleted(widget) and not widget.isHidden():
                     event.ignore()
@@ -589,4 +761,6 @@ class MainWindow(QMainWindow):
         if hasattr(self, "settings_window") and self.settings_window is not None:
             if not sip.isdeleted(self.settings_window) and self.settings_window.isVisible():
                 self.settings_window.close()
+        if load_setting().get("Restore Session", True):
+            self.save_session(session_files, session_active)
         event.accept()
\ No newline at end of file
@@ -3,9 +3,10 @@ import os, base64, hashlib, sys , markdown2
 from PyQt5.QtGui import (
     QFont, QFontMetrics, QTextCharFormat, QTextCursor, QImage, QMouseEvent
 )
-from PyQt5.QtCore import QEvent, pyqtSignal, QBuffer, Qt, QTimer
+from PyQt5.QtCore import QEvent, pyqtSignal, QBuffer, Qt
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTextEdit
 from SettingWindow import load_setting
+from ReflowScheduler import schedule_reflow
 
 
 
@@ -87,7 +88,7 @@ class MarkdownEditor(QWidget):
 
         self.editor.toggle_mode()
         self.editor.setFocus()
-        QTimer.singleShot(0, self.adjust_height_document_editor)
+        schedule_reflow(self.adjust_height_document_editor)
 
     def eventFilter(self, obj, event):
         if obj == self.editor:
@@ -242,7 +243,7 @@ class MarkdownEditor(QWidget):
 
         self.editor.toggle_mode()
         self.editor.setFocus()
-        QTimer.singleShot(0, self.adjust_height_document_editor)
+        schedule_reflow(self.adjust_height_document_editor)
 
     def eventFilter(self, obj, event):
         if obj == self.editor:
@@ -0,0 +1,169 @@
+import time
+from PyQt5.QtWidgets import (
+    QWidget, QTableWidget, QVBoxLayout, QTableWidgetItem, QHeaderView, QSizePolicy
+)
+from PyQt5.QtGui import QFont, QColor, QBrush, QPainter, QPen
+from PyQt5.QtCore import Qt, QRectF, QPointF
+
+from MemoryTracker import format_bytes
+
+
+
+class MemoryChart(QWidget):
+    """
+    Small painted chart for the memory timeline.
+
+    Draws one bar per executed cell for its RSS delta (red for growth, green for
+    release) and a polyline of the RSS after each cell, so cells that keep
+    growing the heap stand out at a glance.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.entries = []
+        self.setMinimumHeight(160)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+
+    def set_entries(self, entries):
+        self.entries = entries
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.fillRect(self.rect(), QColor("#f8f8f8"))
+
+        if not self.entries:
+            painter.setPen(QColor("#777"))
+            painter.drawText(self.rect(), Qt.AlignCenter, "No measured cells yet")
+            return
+
+        margin = 24
+        width = self.width() - 2 * margin
+        height = self.height() - 2 * margin
+        mid_y = margin + height / 2
+
+        deltas = [e.get("rss_delta") or 0 for e in self.entries]
+        max_delta = max(abs(d) for d in deltas) or 1
+        rss_values = [e.get("rss_after") or 0 for e in self.entries]
+        rss_min, rss_max = min(rss_values), max(rss_values)
+        rss_span = (rss_max - rss_min) or 1
+
+        step = width / len(self.entries)
+        bar_width = max(step * 0.6, 1)
+
+        painter.setPen(QPen(QColor("#bbb"), 1))
+        painter.drawLine(QPointF(margin, mid_y), QPointF(margin + width, mid_y))
+
+        points = []
+        for i, (entry, delta) in enumerate(zip(self.entries, deltas)):
+            x = margin + i * step + (step - bar_width) / 2
+            bar_height = (abs(delta) / max_delta) * (height / 2)
+            color = QColor("#c62828") if delta > 0 else QColor("#2e7d32")
+            if delta > 0:
+                rect = QRectF(x, mid_y - bar_height, bar_width, bar_height)
+            else:
+                rect = QRectF(x, mid_y, bar_width, bar_height)
+            painter.fillRect(rect, color)
+
+            rss_y = margin + height - ((rss_values[i] - rss_min) / rss_span) * height
+            points.append(QPointF(x + bar_width / 2, rss_y))
+
+        painter.setPen(QPen(QColor("#1e88e5"), 2))
+        for start, end in zip(points, points[1:]):
+            painter.drawLine(start, end)
+        for point in points:
+            painter.drawEllipse(point, 2.5, 2.5)
+
+        painter.setPen(QColor("#444"))
+        painter.drawText(margin, margin - 6, f"RSS {format_bytes(rss_min)} → {format_bytes(rss_max)}")
+
+class MemoryTimelineWindow(QWidget):
+    """
+    A floating window that shows how each executed cell changed process memory.
+
+    Entries come from the per-cell statistics recorded by MemoryTracker and are
+    listed in execution order, so the cells that grow the heap (and never give
+    it back) are easy to spot.
+
+    Methods:
+    - add_entries(entries): Rebuilds the chart and the table. Each entry is the
+      stats dict stored in the cell metadata plus a 'cell' key (1-based index).
+    """
+
+    def __init__(self, parent=None, file_name=''):
+        super().__init__(parent)
+        self.setWindowTitle(f"Memory Timeline - {file_name}")
+        self.entries = []
+        layout = QVBoxLayout()
+
+        self.chart = MemoryChart()
+        layout.addWidget(self.chart)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(7)
+        self.table.setHorizontalHeaderLabels([
+            "Cell", "Ran At", "RSS Before", "RSS After", "Delta", "Peak", "Top Allocation"
+        ])
+        self.table.verticalHeader().setVisible(False)
+        self.table.setAlternatingRowColors(True)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.setFont(QFont("Segoe UI", 10))
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setStyleSheet("""
+            QTableWidget {
+                background-color: #f8f8f8;
+                gridline-color: #cccccc;
+            }
+            QHeaderView::section {
+                background-color: #d0d0d0;
+                font-weight: bold;
+                padding: 4px;
+            }
+        """)
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+        self.resize(900, 500)
+        self.show()
+
+    def add_entries(self, entries):
+        self.entries = sorted(entries, key=lambda e: e.get("timestamp") or 0)
+        self.chart.set_entries(self.entries)
+
+        self.table.setRowCount(len(self.entries))
+        self.table.clearContents()
+
+        for i, entry in enumerate(self.entries):
+            delta = entry.get("rss_delta")
+            top = entry.get("top_allocations") or []
+            top_text = ""
+            if top:
+                site = top[0]
+                top_text = f"{site['file']}:{site['line']}  {format_bytes(site['size_diff'], signed=True)}"
+
+            ran_at = entry.get("timestamp")
+            values = [
+                str(entry.get("cell", "")),
+                time.strftime("%H:%M:%S", time.localtime(ran_at)) if ran_at else "",
+                format_bytes(entry.get("rss_before")),
+                format_bytes(entry.get("rss_after")),
+                format_bytes(delta, signed=True),
+                format_bytes(entry.get("rss_peak")),
+                top_text,
+            ]
+
+            for col, text in enumerate(values):
+                item = QTableWidgetItem(text)
+                item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
+                item.setTextAlignment(Qt.AlignCenter if col < 6 else Qt.AlignLeft | Qt.AlignVCenter)
+                if col == 4 and delta:
+                    item.setForeground(QBrush(QColor("#c62828" if delta > 0 else "#2e7d32")))
+                    item.setFont(QFont("Segoe UI", 10, QFont.Bold))
+                self.table.setItem(i, col, item)
+
+            if top:
+                self.table.item(i, 6).setToolTip("\n".join(
+                    f"{s['file']}:{s['line']}  {format_bytes(s['size_diff'], signed=True)} ({s['count_diff']:+d} blocks)"
+                    for s in top
+                ))
@@ -0,0 +1,193 @@
+import os, sys, threading, time, tracemalloc
+
+
+
+def current_rss():
+    """
+    Returns the resident set size of the current process in bytes, or None if it
+    cannot be determined on this platform.
+
+    Uses psutil when it is installed, otherwise /proc on Linux and the Win32
+    process API on Windows.
+    """
+    try:
+        import psutil
+    except ImportError:
+        pass
+    else:
+        try:
+            return psutil.Process(os.getpid()).memory_info().rss
+        except Exception:
+            return None
+
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm", "r") as f:
+                pages = int(f.read().split()[1])
+            return pages * os.sysconf("SC_PAGE_SIZE")
+        except Exception:
+            return None
+
+    if sys.platform.startswith("win"):
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+        except Exception:
+            return None
+
+    return None
+
+def format_bytes(size, signed=False):
+    if size is None:
+        return "n/a"
+    sign = ""
+    if signed:
+        sign = "+" if size >= 0 else "-"
+    size = abs(size)
+    if size < 1024:
+        return f"{sign}{int(size)} B"
+    for unit in ("KB", "MB", "GB"):
+        size /= 1024.0
+        if size < 1024 or unit == "GB":
+            return f"{sign}{size:.1f} {unit}"
+
+class MemoryTracker:
+    """
+    Measures the memory cost of a single cell execution.
+
+    Purpose:
+    - Records process RSS before and after the cell and samples it on a
+      background thread to catch the peak reached while the cell was running.
+    - Optionally diffs two tracemalloc snapshots to report the source lines
+      that allocated the most memory during the cell.
+
+    Parameters:
+    - interval (float): RSS sampling period in seconds.
+    - top_n (int): Number of tracemalloc allocation sites to keep.
+    - trace_allocations (bool): Enable tracemalloc for the duration of the cell.
+
+    Usage:
+        tracker = MemoryTracker()
+        tracker.start()
+        ...  # run the cell
+        stats = tracker.stop()   # plain dict, safe to store in cell metadata
+    """
+
+    def __init__(self, interval=0.02, top_n=5, trace_allocations=True):
+        self.interval = interval
+        self.top_n = top_n
+        self.trace_allocations = trace_allocations
+
+        self._rss_before = None
+        self._rss_peak = None
+        self._snapshot_before = None
+        self._owns_tracemalloc = False
+        self._stop_event = threading.Event()
+        self._sampler = None
+
+    def start(self):
+        self._rss_before = current_rss()
+        self._rss_peak = self._rss_before
+
+        if self.trace_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracemalloc = True
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            self._snapshot_before = tracemalloc.take_snapshot()
+
+        if self._rss_before is not None:
+            self._stop_event.clear()
+            self._sampler = threading.Thread(target=self._sample_rss, daemon=True)
+            self._sampler.start()
+
+    def _sample_rss(self):
+        while not self._stop_event.wait(self.interval):
+            rss = current_rss()
+            if rss is not None and rss > (self._rss_peak or 0):
+                self._rss_peak = rss
+
+    def stop(self):
+        self._stop_event.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+        rss_after = current_rss()
+        if rss_after is not None and rss_after > (self._rss_peak or 0):
+            self._rss_peak = rss_after
+
+        stats = {
+            "timestamp": time.time(),
+            "rss_before": self._rss_before,
+            "rss_after": rss_after,
+            "rss_peak": self._rss_peak,
+            "rss_delta": (rss_after - self._rss_before)
+                if rss_after is not None and self._rss_before is not None else None,
+            "py_peak": None,
+            "top_allocations": [],
+        }
+
+        if self.trace_allocations and self._snapshot_before is not None:
+            try:
+                stats["py_peak"] = tracemalloc.get_traced_memory()[1]
+                snapshot_after = tracemalloc.take_snapshot()
+                stats["top_allocations"] = self._top_allocations(self._snapshot_before, snapshot_after)
+            except Exception:
+                pass
+            finally:
+                self._snapshot_before = None
+                if self._owns_tracemalloc:
+                    tracemalloc.stop()
+                    self._owns_tracemalloc = False
+
+        return stats
+
+    def _top_allocations(self, before, after):
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, threading.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ]
+        before = before.filter_traces(filters)
+        after = after.filter_traces(filters)
+
+        sites = []
+        for stat in after.compare_to(before, "lineno"):
+            if stat.size_diff <= 0:
+                continue
+            frame = stat.traceback[0]
+            sites.append({
+                # stats end up in notebook metadata, which is shared: no home or site-packages paths
+                "file": os.path.basename(frame.filename) if os.path.isabs(frame.filename) else frame.filename,
+                "line": frame.lineno,
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff,
+            })
+            if len(sites) >= self.top_n:
+                break
+        return sites
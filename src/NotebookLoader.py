@@ -0,0 +1,140 @@
+import os, sys, time, base64, tempfile
+import nbformat, nbformat.reader
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+
+
+# worker threads finish their current file even if the window that asked was closed
+_running_threads = set()
+
+def parse_notebook(path):
+    """
+    Reads an .ipynb as nbformat v4 without schema validation.
+
+    nbformat.read() validates the whole document against the JSON schema, which
+    costs more than the JSON parse itself on large notebooks; validation can run
+    afterwards with validate_notebook().
+    """
+    with open(path, "rb") as f:
+        return parse_notebook_data(f.read())
+
+def parse_notebook_data(raw):
+    """parse_notebook() for the bytes of an .ipynb already read."""
+    nb = nbformat.reader.reads(raw)  # JSON parse and multi-line source rejoin, no validation
+    if nb.nbformat != 4:
+        nb = nbformat.convert(nb, 4)
+    return nb
+
+def validate_notebook(nb):
+    """Returns None for a valid notebook, otherwise the validation error message."""
+    try:
+        nbformat.validate(nb)
+    except nbformat.ValidationError as e:
+        return str(e).splitlines()[0]
+    return None
+
+class NotebookLoadWorker(QObject):
+    """
+    Parses a notebook on a QThread.
+
+    Signals:
+    - loaded(nb): The parsed notebook, as soon as the JSON is read.
+    - failed(error): The exception that stopped parsing.
+    - validated(message): After loaded, when validation was asked for; None if the notebook is valid.
+    """
+    loaded = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    validated = pyqtSignal(object)
+    finished = pyqtSignal()
+
+    def __init__(self, path, validate=False):
+        super().__init__()
+        self.path = path
+        self.validate = validate
+
+    def run(self):
+        try:
+            try:
+                with open(self.path, "rb") as f:
+                    raw = f.read()
+                nb = parse_notebook_data(raw)
+            except Exception as e:
+                self.failed.emit(e)
+                return
+            self.loaded.emit(nb)
+            if self.validate:
+                # the window changes its notebook while it loads (inlined images, ...),
+                # so validation gets a copy of its own, parsed again from the same bytes
+                try:
+                    message = validate_notebook(parse_notebook_data(raw))
+                except Exception as e:
+                    message = str(e)
+                self.validated.emit(message)
+        finally:
+            self.finished.emit()
+
+def load_notebook_async(path, on_loaded, on_failed, on_validated=None, validate=False):
+    worker = NotebookLoadWorker(path, validate)
+    thread = QThread()
+    worker.moveToThread(thread)
+    thread.started.connect(worker.run)
+    worker.loaded.connect(on_loaded)
+    worker.failed.connect(on_failed)
+    if on_validated is not None:
+        worker.validated.connect(on_validated)
+    worker.finished.connect(thread.quit)
+    thread.finished.connect(lambda t=thread, w=worker: _running_threads.discard((t, w)))
+    _running_threads.add((thread, worker))
+    thread.start()
+
+# ---- benchmark ----
+def make_notebook(path, size_mb, code_cells=200):
+    """Writes a synthetic notebook of about size_mb: code cells with text and PNG-sized image outputs."""
+    image = base64.b64encode(os.urandom(48 * 1024)).decode("ascii")
+    cells, size, i = [], 0, 0
+    while size < size_mb * 1024 * 1024:
+        outputs = [nbformat.v4.new_output("stream", name="stdout", text="x = %d\n" % i * 20)]
+        if i % 2 == 0:
+            outputs.append(nbformat.v4.new_output("display_data", data={"image/png": image},
+                                                  metadata={"editor": "output_image"}))
+            size += len(image)
+        cells.append(nbformat.v4.new_code_cell(f"x = {i}\nprint(x)", outputs=outputs))
+        i += 1
+        size += 200 + 8 * 20
+        if i % code_cells == 0:
+            cells.append(nbformat.v4.new_markdown_cell(f"## Section {i // code_cells}",
+                                                       metadata={"uranus": {"origin": "uranus"}}))
+    nb = nbformat.v4.new_notebook(cells=cells)
+    with open(path, "w", encoding="utf-8") as f:
+        nbformat.write(nb, f)
+
+def benchmark(sizes=(10, 100, 1000), directory=None):
+    """
+    Times nbformat.read (parse + validate, what the GUI thread used to block on)
+    against parse_notebook and prints one line per size.
+    """
+    directory = directory or tempfile.mkdtemp(prefix="uranus_load_bench_")
+    print(f"{'size':>8} {'cells':>8} {'nbformat.read':>15} {'parse_notebook':>15} {'validate':>10}")
+    for size_mb in sizes:
+        path = os.path.join(directory, f"bench_{size_mb}mb.ipynb")
+        if not os.path.exists(path):
+            make_notebook(path, size_mb)
+
+        start = time.perf_counter()
+        with open(path, "r", encoding="utf-8") as f:
+            nbformat.read(f, as_version=4)
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        nb = parse_notebook(path)
+        fast = time.perf_counter() - start
+
+        start = time.perf_counter()
+        validate_notebook(nb)
+        check = time.perf_counter() - start
+
+        print(f"{size_mb:>6}MB {len(nb.cells):>8} {full:>14.2f}s {fast:>14.2f}s {check:>9.2f}s")
+        os.remove(path)
+
+if __name__ == "__main__":
+    benchmark(tuple(int(s) for s in sys.argv[1:]) or (10, 100, 1000))
@@ -0,0 +1,210 @@
+import re, copy, uuid, hashlib
+from collections import namedtuple
+import nbformat
+from nbformat.v4 import new_code_cell, new_markdown_cell
+
+
+
+def saved_outputs(outputs):
+    """Outputs written to the file; tables and arrays refer to live kernel objects and stay in memory."""
+    filtered_outputs = []
+    for out in outputs:
+        if out.output_type in ("stream", "error"):
+            filtered_outputs.append(out)
+        elif out.output_type == "display_data":
+            editor_target = out.metadata.get("editor", "")
+            if editor_target == "output_image" and "image/png" in out.data:
+                filtered_outputs.append(out)
+    return filtered_outputs
+
+class CellSnapshot(namedtuple("CellSnapshot", "id cell_type source outputs metadata attachments version")):
+    """
+    Immutable view of a CellModel, safe to hand to a worker thread. `outputs` is a
+    tuple; the output and metadata dicts are never changed in place once published,
+    so they are shared rather than copied.
+    """
+    __slots__ = ()
+
+    def to_nbformat(self, all_outputs=False):
+        source = self.source or ""
+        if self.cell_type == "code":
+            cell = new_code_cell(source=source)
+            cell.outputs = list(self.outputs) if all_outputs else saved_outputs(self.outputs)
+            cell.execution_count = 1
+            # ids hash the content, as they always have in saved files
+            cell["id"] = hashlib.sha1(source.encode("utf-8")).hexdigest()[:8]
+        else:
+            cell = new_markdown_cell(source=source)
+            if self.attachments:
+                cell["attachments"] = copy.deepcopy(self.attachments)
+            cell["id"] = hashlib.md5(source.encode("utf-8")).hexdigest()[:8]
+        cell["metadata"] = nbformat.from_dict(copy.deepcopy(self.metadata))
+        return cell
+
+class NotebookSnapshot(namedtuple("NotebookSnapshot", "cells metadata")):
+    __slots__ = ()
+
+    def to_notebook(self, all_outputs=False):
+        nb = nbformat.v4.new_notebook()
+        nb["cells"] = [cell.to_nbformat(all_outputs) for cell in self.cells]
+        nb.metadata.update(copy.deepcopy(self.metadata))
+        return nb
+
+    def search(self, pattern, regex=False, case_sensitive=False):
+        """Yields (cell_id, line_number, line) for every source line matching `pattern`."""
+        flags = 0 if case_sensitive else re.IGNORECASE
+        matcher = re.compile(pattern if regex else re.escape(pattern), flags)
+        for cell in self.cells:
+            for number, line in enumerate((cell.source or "").splitlines(), 1):
+                if matcher.search(line):
+                    yield cell.id, number, line
+
+    def diff(self, other):
+        """
+        Compares with a newer snapshot by cell id; returns {"added", "removed",
+        "changed", "moved"} lists of ids. Unchanged cells compare by version only.
+        """
+        old = {cell.id: (index, cell) for index, cell in enumerate(self.cells)}
+        new = {cell.id: (index, cell) for index, cell in enumerate(other.cells)}
+        result = {"added": [], "removed": [], "changed": [], "moved": []}
+        for cell_id, (index, cell) in new.items():
+            if cell_id not in old:
+                result["added"].append(cell_id)
+                continue
+            old_index, old_cell = old[cell_id]
+            if old_cell.version != cell.version and old_cell[1:6] != cell[1:6]:
+                result["changed"].append(cell_id)
+            if old_index != index:
+                result["moved"].append(cell_id)
+        result["removed"] = [cell_id for cell_id in old if cell_id not in new]
+        return result
+
+class CellModel:
+    """
+    Plain-Python state of one cell: source, outputs, cell metadata and a stable id.
+
+    Cell widgets render from and write into their model; every change bumps
+    `version` and is reported to the owning NotebookModel's listeners as
+    (event, cell_model) with event "source", "outputs" or "metadata".
+    """
+
+    def __init__(self, cell_type, source="", outputs=None, metadata=None, attachments=None, cell_id=None):
+        self.id = cell_id or uuid.uuid4().hex[:12]
+        self.cell_type = cell_type  # editor type: "code", "doc_editor" or "markdown"
+        self.source = source or ""
+        self.outputs = list(outputs or [])
+        self.metadata = dict(metadata or {})
+        self.attachments = attachments or None
+        self.version = 0
+        self.notebook = None
+        self._snapshot = None
+
+    def changed(self, event):
+        self.version += 1
+        self._snapshot = None
+        if self.notebook is not None:
+            self.notebook.notify(event, self)
+
+    def set_source(self, source):
+        if source != self.source:
+            self.source = source
+            self.changed("source")
+
+    def set_outputs(self, outputs):
+        self.outputs = list(outputs)
+        self.changed("outputs")
+
+    def append_output(self, out):
+        self.outputs.append(out)
+        self.changed("outputs")
+
+    def set_metadata(self, metadata, attachments=None):
+        if metadata != self.metadata or attachments != self.attachments:
+            self.metadata = metadata
+            self.attachments = attachments or None
+            self.changed("metadata")
+
+    def snapshot(self):
+        if self._snapshot is None:
+            self._snapshot = CellSnapshot(self.id, self.cell_type, self.source, tuple(self.outputs),
+                                          self.metadata, self.attachments, self.version)
+        return self._snapshot
+
+    @classmethod
+    def from_nbformat(cls, nb_cell):
+        uranus = nb_cell.get("metadata", {}).get("uranus", {})
+        if nb_cell.cell_type == "code":
+            cell_type = "code"
+        else:
+            cell_type = "doc_editor" if uranus.get("origin") == "uranus" else "markdown"
+        return cls(cell_type, nb_cell.source, nb_cell.get("outputs"), copy.deepcopy(nb_cell.get("metadata", {})),
+                   nb_cell.get("attachments"), uranus.get("uid"))
+
+class NotebookModel:
+    """
+    Ordered cells and notebook metadata, independent of any widget.
+
+    WorkWindow keeps it in step with its cell widgets; headless tools build one
+    with from_notebook(). snapshot() is cheap (unchanged cells reuse their last
+    snapshot) and the result can be saved, searched or diffed off the GUI thread.
+
+    Listeners are called as listener(event, payload):
+    - "inserted" / "removed": payload (index, cell_model)
+    - "moved": payload (old_index, new_index, cell_model)
+    - "source" / "outputs" / "metadata": payload cell_model
+    """
+
+    def __init__(self, metadata=None):
+        self.cells = []
+        self.metadata = metadata if metadata is not None else {}
+        self.listeners = []
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def notify(self, event, payload):
+        for listener in list(self.listeners):
+            try:
+                listener(event, payload)
+            except Exception as e:
+                print(f"[NotebookModel->notify] {event}: {e}")
+
+    def insert(self, index, cell):
+        cell.notebook = self
+        self.cells.insert(index, cell)
+        self.notify("inserted", (index, cell))
+
+    def append(self, cell):
+        self.insert(len(self.cells), cell)
+
+    def remove(self, index):
+        cell = self.cells.pop(index)
+        cell.notebook = None
+        self.notify("removed", (index, cell))
+        return cell
+
+    def move(self, old_index, new_index):
+        cell = self.cells.pop(old_index)
+        self.cells.insert(new_index, cell)
+        self.notify("moved", (old_index, new_index, cell))
+
+    def clear(self):
+        while self.cells:
+            self.remove(len(self.cells) - 1)
+
+    def find(self, cell_id):
+        return next((cell for cell in self.cells if cell.id == cell_id), None)
+
+    def snapshot(self):
+        return NotebookSnapshot(tuple(cell.snapshot() for cell in self.cells), copy.deepcopy(self.metadata))
+
+    @classmethod
+    def from_notebook(cls, nb):
+        model = cls(dict(nb.get("metadata", {})))
+        for nb_cell in nb.cells:
+            model.append(CellModel.from_nbformat(nb_cell))
+        return model
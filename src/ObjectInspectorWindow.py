@@ -1,14 +1,234 @@
 from PyQt5.QtWidgets import (
-    QWidget, QTableWidget, QVBoxLayout, QTableWidgetItem,
+    QWidget, QTableView, QVBoxLayout,
     QHeaderView, QDialog, QTextEdit, QPushButton, QLabel
 )
 from PyQt5.QtGui import QFont, QColor, QBrush
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
 import reprlib
-import json
 
+from MemoryTracker import format_bytes
+from ValueTreeDialog import ValueTreeDialog, is_expandable
+from ArrayViewer import ArrayViewer
 
 
+
+COLOR_MAP = {
+    # Built-in types
+    "int": "#b71c1c", "float": "#e65100", "str": "#212121", "bool": "#6a1b9a",
+    "list": "#1e88e5", "tuple": "#00897b", "dict": "#2e7d32", "set": "#5d4037",
+    "NoneType": "#9e9e9e", "complex": "#ef6c00", "bytes": "#616161", "bytearray": "#616161",
+    "frozenset": "#4e342e", "range": "#827717", "slice": "#827717", "ellipsis": "#757575",
+    "type": "#283593", "NotImplementedType": "#757575",
+
+    # Functions & methods
+    "function": "#8e24aa", "builtin_function_or_method": "#8e24aa",
+    "method": "#6a1b9a", "classmethod": "#6a1b9a", "staticmethod": "#6a1b9a",
+
+    # Modules & classes
+    "module": "#00695c", "object": "#424242", "code": "#c62828", "frame": "#c62828",
+
+    # IO & file types
+    "TextIOWrapper": "#3e2723", "BufferedWriter": "#3e2723", "BufferedReader": "#3e2723",
+    "StringIO": "#4e342e", "BytesIO": "#4e342e",
+
+    # NumPy
+    "ndarray": "#3949ab", "int32": "#5c6bc0", "float64": "#5c6bc0", "complex128": "#5c6bc0",
+    "bool_": "#5c6bc0", "str_": "#5c6bc0", "object_": "#5c6bc0",
+
+    # Pandas
+    "DataFrame": "#1b5e20", "Series": "#2e7d32", "Index": "#33691e", "MultiIndex": "#558b2f",
+    "Categorical": "#689f38", "Timestamp": "#827717", "Timedelta": "#827717",
+    "Period": "#827717", "Interval": "#827717",
+
+    # Collections
+    "Counter": "#6d4c41", "OrderedDict": "#6d4c41", "defaultdict": "#6d4c41",
+    "deque": "#6d4c41", "ChainMap": "#6d4c41", "UserDict": "#6d4c41",
+    "UserList": "#6d4c41", "UserString": "#6d4c41",
+
+    # Pathlib
+    "Path": "#455a64", "PosixPath": "#455a64", "WindowsPath": "#455a64",
+
+    # Threading & async
+    "Thread": "#00838f", "Future": "#00838f", "Task": "#00838f", "coroutine": "#00838f",
+
+    # Weakref
+    "ref": "#9e9e9e", "proxy": "#9e9e9e",
+
+    # Other
+    "SimpleNamespace": "#5e35b1", "MappingProxyType": "#5e35b1", "memoryview": "#9e9d24",
+    "array": "#6a1b9a", "Queue": "#6a1b9a", "PriorityQueue": "#6a1b9a", "LifoQueue": "#6a1b9a"
+}
+
+def is_structured_type(value):
+    return isinstance(value, (list, dict, set, tuple, frozenset))
+
+def summarize_value(value, max_len=80):
+    t = type(value)
+    mod = t.__module__
+    name = t.__name__
+
+        # ساختارهای داده‌ای ساده
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return f"{name}({len(value)} items)"
+    if isinstance(value, dict):
+        return f"{name}({len(value)} keys)"
+
+    # NumPy
+    if mod == "numpy":
+        try:
+            shape = getattr(value, "shape", None)
+            return f"{name} shape={shape}" if shape else name
+        except Exception:
+            return name
+
+    # Pandas
+    if mod == "pandas.core.frame":
+        return f"DataFrame shape={value.shape}"
+    if mod == "pandas.core.series":
+        return f"Series len={len(value)}"
+    if mod == "pandas.core.indexes":
+        return f"{name} len={len(value)}"
+    if mod == "pandas":
+        return f"{name}"
+
+    # collections
+    if mod == "collections":
+        try:
+            return f"{name} len={len(value)}"
+        except Exception:
+            return name
+
+    # datetime
+    if mod == "datetime":
+        return str(value)
+
+    # io, re, types, threading, asyncio
+    if mod in {"io", "re", "types", "threading", "asyncio"}:
+        return name
+
+        # سایر موارد
+    try:
+        text = str(value)
+        return text if len(text) <= max_len else text[:max_len] + " ..."
+    except Exception:
+        return "<unrepresentable>"
+
+class ObjectTableModel(QAbstractTableModel):
+    """
+    Table model behind ObjectInspectorWindow.
+
+    Rows are the dicts produced by IPythonKernel.inspect_namespace_diff()
+    ('name', 'type', 'size', 'summary', 'value'). Besides a full reset via
+    set_rows(), the model accepts a namespace diff through apply_diff(), which
+    emits row-level insert/remove/dataChanged signals only for the names that
+    were added, removed or rebound - the view does not rebuild anything else.
+
+    'size' starts as sys.getsizeof and is replaced by the deep estimate through
+    update_sizes(); 'size_exact' is None while the estimate is pending and False
+    when it was sampled or cut by the time budget (shown with a '~').
+    """
+
+    headers = ["Obj Name", "Type", "Size", "Value"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        self.row_of = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        col = index.column()
+
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return row["name"]
+            if col == 1:
+                return row["type"]
+            if col == 2:
+                prefix = "~" if row.get("size_exact") is False else ""
+                return prefix + format_bytes(row["size"])
+            return row["summary"]
+
+        if role == Qt.ToolTipRole and col == 2:
+            state = {None: "shallow size, deep estimate pending", False: "estimated"}.get(row.get("size_exact"), "exact")
+            return f"{row['size']:,} bytes ({state})"
+
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+
+        colored = col == 1 or (col == 3 and row.get("structured"))
+        if role == Qt.BackgroundRole and colored:
+            return QBrush(QColor(COLOR_MAP.get(row["type"], "#9e9e9e")))
+        if role == Qt.ForegroundRole and colored:
+            return QBrush(QColor("white"))
+        if role == Qt.FontRole and colored:
+            return QFont("Segoe UI", 9, QFont.Bold)
+        return None
+
+    def flags(self, index):
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = list(rows)
+        self.row_of = {row["name"]: i for i, row in enumerate(self.rows)}
+        self.endResetModel()
+
+    def apply_diff(self, added, removed, changed):
+        removed_rows = sorted((self.row_of[name] for name in removed if name in self.row_of), reverse=True)
+        for i in removed_rows:
+            self.beginRemoveRows(QModelIndex(), i, i)
+            del self.rows[i]
+            self.endRemoveRows()
+        if removed_rows:
+            self.row_of = {row["name"]: i for i, row in enumerate(self.rows)}
+
+        for row in changed:
+            i = self.row_of.get(row["name"])
+            if i is None:
+                added.append(row)
+                continue
+            self.rows[i] = row
+            self.dataChanged.emit(self.index(i, 0), self.index(i, len(self.headers) - 1))
+
+        if added:
+            start = len(self.rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(added) - 1)
+            for offset, row in enumerate(added):
+                self.rows.append(row)
+                self.row_of[row["name"]] = start + offset
+            self.endInsertRows()
+
+    def update_sizes(self, sizes):
+        for name, (value_id, size, exact) in sizes.items():
+            i = self.row_of.get(name)
+            # skip names rebound after the estimate started
+            if i is None or id(self.rows[i]["value"]) != value_id:
+                continue
+            self.rows[i]["size"] = size
+            self.rows[i]["size_exact"] = exact
+            index = self.index(i, 2)
+            self.dataChanged.emit(index, index)
+
+    def total_size(self):
+        # attribute rows ('obj.attr') are already part of their owner's deep size
+        top_level = [row for row in self.rows if "." not in row["name"]]
+        exact = all(row.get("size_exact") for row in top_level)
+        return sum(row["size"] for row in top_level), len(top_level), exact
+
 class ObjectInspectorWindow(QWidget):
     """
     A floating window for inspecting Python objects in a structured, type-aware table.
@@ -20,25 +240,25 @@ class ObjectInspectorWindow(QWidget):
 
     Features:
     ---------
-    - Displays object metadata in a QTableWidget:
+    - Displays object metadata in a QTableView backed by ObjectTableModel:
         - Object name
         - Type (with color-coded background)
-        - Size in bytes
+        - Deep size (estimated in the background by SizeEstimator)
         - Summarized value
+    - Shows the total footprint of the namespace above the table
     - Supports full value inspection via double-click on the "Value" column
     - Automatically detects structured types and file-like objects
-    - Handles JSON serialization and fallback to reprlib for complex objects
+    - Opens containers and objects in a lazy, paged tree (ValueTreeDialog);
+      other values fall back to reprlib
     - Integrates with IPython shell or external namespace extractors
     - Designed to be extensible for future type-specific viewers (e.g., tree view, dataframe preview)
 
     Attributes:
     -----------
-    table : QTableWidget
+    table : QTableView
         The main table displaying object metadata.
-    data : List[Dict[str, Any]]
-        Internal storage of full object metadata, including real values.
-    known_dtypes : Set[str]
-        Optional filter for allowed types, used during namespace extraction.
+    model : ObjectTableModel
+        Row storage of full object metadata, including real values.
 
     Methods:
     --------
@@ -46,9 +266,17 @@ class ObjectInspectorWindow(QWidget):
         Populates the table with a list of object metadata dictionaries.
         Each dictionary must contain 'name', 'type', 'size', and 'value'.
 
-    show_full_value(item: QTableWidgetItem) -> None
+    apply_diff(added, removed, changed) -> None
+        Updates only the rows of names that were added, removed or rebound
+        since the previous refresh.
+
+    update_sizes(sizes: Dict[str, Tuple[int, int, bool]]) -> None
+        Replaces shallow sizes with deep estimates and refreshes the total.
+
+    show_full_value(index: QModelIndex) -> None
         Opens a dialog showing the full value of the selected object.
-        Supports structured types and file-like objects.
+        Containers and objects open in ValueTreeDialog, NumPy arrays in ArrayViewer,
+        file-like objects as text.
 
     is_structured_type(value: Any) -> bool
         Returns True if the value is a list, dict, set, tuple, or frozenset.
@@ -56,45 +284,39 @@ class ObjectInspectorWindow(QWidget):
     summarize_value(value: Any, max_len: int = 80) -> str
         Returns a short string summary of the value for display in the table.
 
-    inspect_all_user_attributes(shell: InteractiveShell) -> List[Dict[str, Any]]
-        Extracts user-defined objects from an IPython shell, filtering out
-        built-ins and system objects. Returns metadata suitable for add_objects.
-
     Notes:
     ------
     - This class is designed to be launched as a floating window from within
     the Uranus IDE or any PyQt-based environment.
     - Future enhancements may include:
-        - Tree-based viewers for nested structures
-        - Specialized viewers for NumPy arrays, Pandas DataFrames, etc.
+        - Specialized viewers for Pandas DataFrames, etc.
         - Export and copy-to-clipboard functionality
     """
 
     def __init__(self, parent=None ,  file_name = ''):
         super().__init__(parent)
         self.setWindowTitle(file_name)
-        self.data = []
         layout = QVBoxLayout()
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels([
-            "Obj Name", "Type", "Size (Byte)", "Value"
-        ])
+        self.total_label = QLabel()
+        self.total_label.setFont(QFont("Segoe UI", 10, QFont.Bold))
+        layout.addWidget(self.total_label)
+
+        self.model = ObjectTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.verticalHeader().setVisible(False)
         self.table.setAlternatingRowColors(True)
         self.table.setShowGrid(True)
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table.setFont(QFont("Segoe UI", 10))
-        self.table.setSelectionBehavior(QTableWidget.SelectItems)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
-        self.table.setSelectionBehavior(QTableWidget.SelectItems)
-        self.table.setSelectionMode(QTableWidget.ExtendedSelection)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectItems)
+        self.table.setSelectionMode(QTableView.ExtendedSelection)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
         self.table.setFocusPolicy(Qt.StrongFocus)
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: #f8f8f8;
                 gridline-color: #cccccc;
             }
@@ -105,155 +327,55 @@ class ObjectInspectorWindow(QWidget):
             }
         """)
 
-        self.table.itemDoubleClicked.connect(self.show_full_value)
+        self.table.doubleClicked.connect(self.show_full_value)
         layout.addWidget(self.table)
         self.setLayout(layout)
         self.show()
 
-    def summarize_value(self, value, max_len=80):
-        t = type(value)
-        mod = t.__module__
-        name = t.__name__
-
-            # ساختارهای داده‌ای ساده
-        if isinstance(value, (list, tuple, set, frozenset)):
-            return f"{name}({len(value)} items)"
-        if isinstance(value, dict):
-            return f"{name}({len(value)} keys)"
-
-        # NumPy
-        if mod == "numpy":
-            try:
-                shape = getattr(value, "shape", None)
-                return f"{name} shape={shape}" if shape else name
-            except Exception:
-                return name
-
-        # Pandas
-        if mod == "pandas.core.frame":
-            return f"DataFrame shape={value.shape}"
-        if mod == "pandas.core.series":
-            return f"Series len={len(value)}"
-        if mod == "pandas.core.indexes":
-            return f"{name} len={len(value)}"
-        if mod == "pandas":
-            return f"{name}"
-
-        # collections
-        if mod == "collections":
-            try:
-                return f"{name} len={len(value)}"
-            except Exception:
-                return name
-
-        # datetime
-        if mod == "datetime":
-            return str(value)
-
-        # io, re, types, threading, asyncio
-        if mod in {"io", "re", "types", "threading", "asyncio"}:
-            return name
+    @property
+    def data(self):
+        return self.model.rows
 
-            # سایر موارد
-        try:
-            text = str(value)
-            return text if len(text) <= max_len else text[:max_len] + " ..."
-        except Exception:
-            return "<unrepresentable>"
+    def summarize_value(self, value, max_len=80):
+        return summarize_value(value, max_len)
 
     def is_structured_type(self, value):
-        return isinstance(value, (list, dict, set, tuple, frozenset))
-
-    def add_objects(self, data):
-        self.data = data
-        self.table.setRowCount(len(data))
-        self.table.clearContents()
-
-
-        color_map = {
-        # Built-in types
-        "int": "#b71c1c", "float": "#e65100", "str": "#212121", "bool": "#6a1b9a",
-        "list": "#1e88e5", "tuple": "#00897b", "dict": "#2e7d32", "set": "#5d4037",
-        "NoneType": "#9e9e9e", "complex": "#ef6c00", "bytes": "#616161", "bytearray": "#616161",
-        "frozenset": "#4e342e", "range": "#827717", "slice": "#827717", "ellipsis": "#757575",
-        "type": "#283593", "NotImplementedType": "#757575",
-
-        # Functions & methods
-        "function": "#8e24aa", "builtin_function_or_method": "#8e24aa",
-        "method": "#6a1b9a", "classmethod": "#6a1b9a", "staticmethod": "#6a1b9a",
-
-        # Modules & classes
-        "module": "#00695c", "object": "#424242", "code": "#c62828", "frame": "#c62828",
-
-        # IO & file types
-        "TextIOWrapper": "#3e2723", "BufferedWriter": "#3e2723", "BufferedReader": "#3e2723",
-        "StringIO": "#4e342e", "BytesIO": "#4e342e",
-
-        # NumPy
-        "ndarray": "#3949ab", "int32": "#5c6bc0", "float64": "#5c6bc0", "complex128": "#5c6bc0",
-        "bool_": "#5c6bc0", "str_": "#5c6bc0", "object_": "#5c6bc0",
-
-        # Pandas
-        "DataFrame": "#1b5e20", "Series": "#2e7d32", "Index": "#33691e", "MultiIndex": "#558b2f",
-        "Categorical": "#689f38", "Timestamp": "#827717", "Timedelta": "#827717",
-        "Period": "#827717", "Interval": "#827717",
-
-        # Collections
-        "Counter": "#6d4c41", "OrderedDict": "#6d4c41", "defaultdict": "#6d4c41",
-        "deque": "#6d4c41", "ChainMap": "#6d4c41", "UserDict": "#6d4c41",
-        "UserList": "#6d4c41", "UserString": "#6d4c41",
-
-        # Pathlib
-        "Path": "#455a64", "PosixPath": "#455a64", "WindowsPath": "#455a64",
-
-        # Threading & async
-        "Thread": "#00838f", "Future": "#00838f", "Task": "#00838f", "coroutine": "#00838f",
-
-        # Weakref
-        "ref": "#9e9e9e", "proxy": "#9e9e9e",
-
-        # Other
-        "SimpleNamespace": "#5e35b1", "MappingProxyType": "#5e35b1", "memoryview": "#9e9d24",
-        "array": "#6a1b9a", "Queue": "#6a1b9a", "PriorityQueue": "#6a1b9a", "LifoQueue": "#6a1b9a"
-    }
-
-        for i, obj in enumerate(data):
-            name_item = QTableWidgetItem(obj["name"])
-            size_item = QTableWidgetItem(str(obj["size"]))
-            value = obj["value"]
-            type_name = obj["type"]
-            color = QColor(color_map.get(type_name, "#9e9e9e"))
-
-            type_item = QTableWidgetItem(type_name)
-            type_item.setTextAlignment(Qt.AlignCenter)
-            type_item.setFont(QFont("Segoe UI", 9, QFont.Bold))
-            type_item.setBackground(QBrush(color))
-            type_item.setForeground(QBrush(QColor("white")))
-
-            value_item = QTableWidgetItem(self.summarize_value(value))
-            value_item.setTextAlignment(Qt.AlignCenter)
-            if self.is_structured_type(value):
-                value_item.setFont(QFont("Segoe UI", 9, QFont.Bold))
-                value_item.setBackground(QBrush(color))
-                value_item.setForeground(QBrush(QColor("white")))
-
-            for item in [name_item, type_item, size_item, value_item]:
-                item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-                item.setTextAlignment(Qt.AlignCenter)
-
-
-            self.table.setItem(i, 0, name_item)
-            self.table.setItem(i, 1, type_item)
-            self.table.setItem(i, 2, size_item)
-            self.table.setItem(i, 3, value_item)
+        return is_structured_type(value)
 
+    def prepare_row(self, row):
+        row.setdefault("summary", summarize_value(row["value"]))
+        row.setdefault("structured", is_structured_type(row["value"]))
+        row.setdefault("size_exact", None)
+        return row
 
+    def add_objects(self, data):
+        self.model.set_rows([self.prepare_row(row) for row in data])
+        self.update_total()
+        self.fit_to_contents()
+
+    def apply_diff(self, added, removed, changed):
+        self.model.apply_diff(
+            [self.prepare_row(row) for row in added],
+            removed,
+            [self.prepare_row(row) for row in changed],
+        )
+        self.update_total()
+
+    def update_sizes(self, sizes):
+        self.model.update_sizes(sizes)
+        self.update_total()
+
+    def update_total(self):
+        total, count, exact = self.model.total_size()
+        approx = "" if exact else "~"
+        self.total_label.setText(f"Namespace footprint: {approx}{format_bytes(total)} in {count} objects")
+
+    def fit_to_contents(self):
         self.table.resizeColumnsToContents()
-        self.table.resizeRowsToContents()
 
         header_height = self.table.horizontalHeader().height()
-        row_heights = sum(self.table.rowHeight(i) for i in range(self.table.rowCount()))
-        col_widths = sum(self.table.columnWidth(i) for i in range(self.table.columnCount()))
+        row_heights = self.table.verticalHeader().defaultSectionSize() * self.model.rowCount()
+        col_widths = sum(self.table.columnWidth(i) for i in range(self.model.columnCount()))
         v_scroll = self.table.verticalScrollBar().sizeHint().width()
         h_scroll = self.table.horizontalScrollBar().sizeHint().height()
 
@@ -261,9 +383,9 @@ class ObjectInspectorWindow(QWidget):
         height = min(header_height + row_heights + h_scroll + 60, 600)
         self.resize(width, height)
 
-    def show_full_value(self, item):
-        row = item.row()
-        col = item.column()
+    def show_full_value(self, index):
+        row = index.row()
+        col = index.column()
         if col != 3:
             return
 
@@ -281,11 +403,18 @@ class ObjectInspectorWindow(QWidget):
                 full_text = value.read()
             except Exception:
                 full_text = "<unable to read file content>"
-        elif self.is_structured_type(value):
-            try:
-                full_text = json.dumps(value, indent=4, ensure_ascii=False)
-            except Exception:
-                full_text = reprlib.repr(value)
+        elif type(value).__module__ == "numpy" and type(value).__name__ in ("ndarray", "memmap"):
+            viewer = ArrayViewer(value, title=f"Array: {self.data[row]['name']}")
+            viewer.setAttribute(Qt.WA_DeleteOnClose)
+            viewer.resize(800, 600)
+            viewer.show()
+            self.array_viewers = [v for v in getattr(self, "array_viewers", []) if v.isVisible()] + [viewer]
+            return
+        elif is_expandable(value):
+            # containers and objects: lazy, paged tree instead of one huge text dump
+            dialog = ValueTreeDialog(self.data[row]["name"], value, summarize_value, self)
+            dialog.exec_()
+            return
         else:
             full_text = reprlib.repr(value)
 
@@ -307,4 +436,4 @@ class ObjectInspectorWindow(QWidget):
         layout.addWidget(close_btn)
 
         dialog.setLayout(layout)
-        dialog.exec_()
\ No newline at end of file
+        dialog.exec_()
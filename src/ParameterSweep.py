@@ -0,0 +1,130 @@
+import os, sys, ast, csv, json, argparse, itertools
+
+from HeadlessRunner import run_tasks, add_limit_arguments, limits_from_args
+
+
+
+def parse_values(text):
+    """'0.1,0.2' -> [0.1, 0.2]; each item is a Python literal or, failing that, a string."""
+    values = []
+    for item in text.split(","):
+        item = item.strip()
+        try:
+            values.append(ast.literal_eval(item))
+        except (ValueError, SyntaxError):
+            values.append(item)
+    return values
+
+def expand_grid(grid):
+    """{"a": [1, 2], "b": ["x"]} -> [{"a": 1, "b": "x"}, {"a": 2, "b": "x"}] (cartesian product)."""
+    names = list(grid)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(grid[name] for name in names))]
+
+def load_parameter_sets(path):
+    """A JSON file holding either a grid (dict of lists) or a list of parameter dicts."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return expand_grid({name: values if isinstance(values, list) else [values] for name, values in data.items()})
+    if isinstance(data, list) and all(isinstance(item, dict) for item in data):
+        return data
+    raise ValueError(f"{path}: expected a dict of lists (grid) or a list of dicts")
+
+def sweep(notebook, parameter_sets, output_dir, collect=(), jobs=None, timeout=None, stop_on_error=False, log=None,
+          limits=None):
+    """
+    Runs `notebook` once per parameter set through the headless runner (bounded by
+    `jobs` processes), writing `<name>_<run>.ipynb` files to `output_dir`. Returns
+    (summary, rows): the runner's summary and one table row per run with run, status,
+    duration, the parameters, the `collect`ed variables and the output path.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(notebook))[0]
+    width = len(str(len(parameter_sets)))
+    tasks = [{
+        "path": notebook,
+        "output": os.path.join(output_dir, f"{stem}_{run:0{width}d}.ipynb"),
+        "parameters": parameters,
+        "collect": list(collect),
+        "limits": limits,
+    } for run, parameters in enumerate(parameter_sets)]
+
+    summary = run_tasks(tasks, jobs, timeout, stop_on_error, log)
+
+    rows = []
+    for run, (task, result) in enumerate(zip(tasks, summary["notebooks"])):
+        row = {"run": run, "status": result["status"], "duration": result["duration"]}
+        row.update(task["parameters"])
+        results = result.get("results", {})
+        for name in collect:
+            row[name] = results.get(name)
+        row["output"] = task["output"]
+        rows.append(row)
+    return summary, rows
+
+def write_table(rows, path):
+    columns = []
+    for row in rows:
+        columns.extend(name for name in row if name not in columns)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({name: json.dumps(value) if isinstance(value, (list, dict)) else value
+                             for name, value in row.items()})
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="uranus sweep",
+                                     description="Run a notebook once per parameter set, papermill-style.")
+    parser.add_argument("notebook", help=".ipynb with a code cell tagged 'parameters'")
+    parser.add_argument("-p", "--param", action="append", default=[], metavar="NAME=V1,V2",
+                        help="grid axis; repeat for more axes (cartesian product)")
+    parser.add_argument("--params", default=None, metavar="FILE",
+                        help="JSON grid (dict of lists) or list of parameter dicts")
+    parser.add_argument("--collect", nargs="*", default=[], metavar="NAME", help="variables to put in the table")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="parallel runs (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds per run before it is killed")
+    parser.add_argument("--output-dir", default=None, help="executed notebooks (default: <notebook>_sweep)")
+    parser.add_argument("--table", default=None, help="write the result table as CSV")
+    parser.add_argument("--summary", default=None, help="write the JSON summary to this file (default: stdout)")
+    parser.add_argument("--stop-on-error", action="store_true", help="stop a run at its first failing cell")
+    add_limit_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(args.notebook):
+        parser.error("no such notebook: " + args.notebook)
+    grid = {}
+    for assignment in args.param:
+        name, sep, values = assignment.partition("=")
+        if not sep or not name.strip().isidentifier():
+            parser.error(f"bad --param {assignment!r}, expected NAME=V1,V2")
+        grid[name.strip()] = parse_values(values)
+    try:
+        parameter_sets = load_parameter_sets(args.params) if args.params else []
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if grid:
+        # file sets x command line axes
+        parameter_sets = [dict(base, **extra) for base in (parameter_sets or [{}]) for extra in expand_grid(grid)]
+    if not parameter_sets:
+        parser.error("no parameter sets, give -p NAME=V1,V2 or --params FILE")
+
+    notebook = os.path.abspath(args.notebook)
+    output_dir = os.path.abspath(args.output_dir or os.path.splitext(notebook)[0] + "_sweep")
+    summary, rows = sweep(notebook, parameter_sets, output_dir, args.collect, args.jobs, args.timeout,
+                          args.stop_on_error, log=lambda line: print(line, file=sys.stderr),
+                          limits=limits_from_args(args))
+    summary["table"] = rows
+    if args.table:
+        write_table(rows, args.table)
+
+    text = json.dumps(summary, indent=2)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,7 +16,7 @@ from PyQt5.QtWidgets import (
 )
 
 from CodeHighlight import CodeHighlighter
-from auto_complete_system import AutoCompleteSystem
+from auto_complete_system import completion_controller
 from SettingWindow import load_setting  
 
 
@@ -60,7 +60,7 @@ class PyCodeEditor(QPlainTextEdit):
 
 
         self.highlighter = CodeHighlighter(self.document())
-        self.autocomplete = AutoCompleteSystem(self)
+        self.autocomplete = completion_controller()  # shared, attached on focus
 
     @staticmethod
 
@@ -75,6 +75,10 @@ class PyCodeEditor(QPlainTextEdit):
                 column += 1
         return column + 1
 
+    def focusInEvent(self, event):
+        self.autocomplete.attach(self)
+        super().focusInEvent(event)
+
     def keyPressEvent(self, event):
         def delayed_emit():
             QApplication.processEvents() 
@@ -84,7 +88,13 @@ class PyCodeEditor(QPlainTextEdit):
             self.cursorPositionInfo.emit(line, column)
 
 
-        if hasattr(self, 'autocomplete') and self.autocomplete.active:
+        # Ctrl+Space برای فعال‌سازی دستی
+        if event.key() == Qt.Key_Space and event.modifiers() & Qt.ControlModifier:
+            self.autocomplete.attach(self)
+            self.autocomplete.activate_and_show()
+            return
+
+        if hasattr(self, 'autocomplete') and self.autocomplete.is_active_for(self):
                 if event.key() == Qt.Key_Escape:
                     self.autocomplete.keyPressEvent(event)
                     delayed_emit()
@@ -0,0 +1,75 @@
+import time
+from collections import deque
+from PyQt5.QtCore import QObject, QTimer
+
+
+
+class ReflowScheduler(QObject):
+    """
+    Coalesces cell height recomputations into one batch per frame.
+
+    Editors used to recompute their height synchronously on every textChanged, so
+    loading a notebook or pasting a large block triggered a layout pass per
+    change. Now callers mark work with schedule(func); each distinct callable
+    (e.g. `editor.adjust_height_code`) runs at most once per frame, however often
+    it was requested in between.
+
+    Methods:
+    - schedule(func): Queues `func` for the next frame.
+    - flush(): Runs everything queued right away.
+    - reflows_per_second(): Reflows run during the last second, for diagnostics.
+    """
+
+    FRAME_MS = 16
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pending = {}   # callable -> None, insertion ordered and deduplicated
+        self.history = deque()  # (time, reflows) of recent batches
+        self.requested = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.FRAME_MS)
+        self.timer.timeout.connect(self.flush)
+
+    def schedule(self, func):
+        self.requested += 1
+        self.pending[func] = None
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        self.timer.stop()
+        batch, self.pending = self.pending, {}
+        for func in batch:
+            try:
+                func()
+            except RuntimeError:
+                pass  # the widget was deleted while its reflow was queued
+        if batch:
+            self.history.append((time.monotonic(), len(batch)))
+
+    def reflows_per_second(self):
+        horizon = time.monotonic() - 1.0
+        while self.history and self.history[0][0] < horizon:
+            self.history.popleft()
+        return sum(count for _, count in self.history)
+
+    def stats(self):
+        return {
+            "reflows_per_second": self.reflows_per_second(),
+            "batches_per_second": len(self.history),
+            "requested": self.requested,
+            "pending": len(self.pending),
+        }
+
+_scheduler = None
+
+def reflow_scheduler():
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ReflowScheduler()
+    return _scheduler
+
+def schedule_reflow(func):
+    reflow_scheduler().schedule(func)
@@ -0,0 +1,134 @@
+import os, re, hashlib
+import markdown2
+from PyQt5.QtCore import QStandardPaths
+from SettingWindow import load_setting
+
+
+
+ATTACHMENT_REF = re.compile(r"attachment:([^\s\"')>]+)")
+DATA_URI = re.compile(r"data:[^\s\"')>]+")
+DATA_PLACEHOLDER = re.compile(r"uranus-data:(\d+)")
+
+class RenderCache:
+    """
+    Persistent cache of markdown rendered to HTML, shared by all notebooks.
+
+    Entries are files `<key>.html` in the user cache directory. The key hashes the
+    source, the theme (colors and fonts of doc cells) and the markdown2 version.
+    Images stay out of the entries: attachments are spliced in afterwards by
+    inline_attachments(), and `data:` URIs in the source (images pasted into doc
+    cells) are swapped for placeholders before hashing and rendering and put
+    back into the result, so an entry only holds the text around them.
+
+    The directory is kept under `budget_bytes`; the least recently used entries
+    (by file mtime, touched on every hit) are evicted first.
+    """
+
+    def __init__(self, directory, budget_bytes):
+        self.directory = directory
+        self.budget_bytes = budget_bytes
+        self.used_bytes = None  # measured on the first write
+
+    @staticmethod
+    def key(source, theme):
+        digest = hashlib.sha256()
+        for part in (markdown2.__version__, theme, source):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".html")
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                html = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return html
+
+    def put(self, key, html):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if self.used_bytes is None:
+                self.used_bytes = sum(entry.stat().st_size for entry in os.scandir(self.directory))
+            path = self.path(key)
+            temp = path + ".tmp"
+            with open(temp, "w", encoding="utf-8") as f:
+                f.write(html)
+            os.replace(temp, path)
+            self.used_bytes += os.path.getsize(path)
+            if self.used_bytes > self.budget_bytes:
+                self.evict()
+        except OSError as e:
+            print(f"[RenderCache] Cannot write {self.directory}: {e}")
+
+    def evict(self):
+        entries = sorted(os.scandir(self.directory), key=lambda entry: entry.stat().st_mtime)
+        self.used_bytes = sum(entry.stat().st_size for entry in entries)
+        # evict down to 3/4 of the budget so a full cache does not rescan on every write
+        for entry in entries:
+            if self.used_bytes <= self.budget_bytes * 3 // 4:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                self.used_bytes -= size
+            except OSError:
+                pass
+
+    def render(self, source, theme=""):
+        uris = []
+        if "data:" in source:
+            def placeholder(match):
+                uris.append(match.group(0))
+                return f"uranus-data:{len(uris) - 1}"
+            source = DATA_URI.sub(placeholder, source)
+
+        key = self.key(source, theme)
+        html = self.get(key)
+        if html is None:
+            html = markdown2.markdown(source)
+            self.put(key, html)
+        if uris:
+            restore = lambda m: uris[int(m.group(1))] if int(m.group(1)) < len(uris) else m.group(0)
+            html = DATA_PLACEHOLDER.sub(restore, html)
+        return html
+
+_cache = None
+
+def render_cache():
+    global _cache
+    if _cache is None:
+        directory = os.path.join(QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation),
+                                 "uranus_ide", "render")
+        _cache = RenderCache(directory, int(load_setting().get("Render Cache MB", 32)) * 1024 * 1024)
+    return _cache
+
+def render_theme(setting):
+    colors = setting.get("colors", {})
+    return "|".join(str(value) for value in (
+        colors.get("Back Ground Color MetaData"), colors.get("ForGround Color MetaData"),
+        setting.get("Meta Font"), setting.get("Meta Font Size"),
+    ))
+
+def render_markdown(source, setting=None):
+    return render_cache().render(source, render_theme(setting or load_setting()))
+
+def inline_attachments(html, attachments):
+    """
+    Replaces every `attachment:<name>` by the data URL of that attachment in one
+    pass; PNG is preferred over JPEG, other names are left as they are.
+    """
+    if not attachments or "attachment:" not in html:
+        return html
+    urls = {}
+    for name, mime_map in attachments.items():
+        for mime in ("image/png", "image/jpeg"):
+            if mime in mime_map:
+                urls[name] = f"data:{mime};base64,{mime_map[mime]}"
+                break
+    return ATTACHMENT_REF.sub(lambda m: urls.get(m.group(1), m.group(0)), html)
@@ -0,0 +1,250 @@
+import os, sys, time, ctypes, threading
+from contextlib import contextmanager
+from nbformat.v4 import new_output
+from MemoryTracker import current_rss, format_bytes
+
+
+
+class LimitExceeded(KeyboardInterrupt):
+    """
+    Raised inside a running cell when one of its limits is hit. It derives from
+    KeyboardInterrupt, like a user stop, so `except Exception` in the cell cannot
+    swallow it.
+    """
+    kind = "limit"
+
+    def __init__(self, threshold=None, value=None):
+        super().__init__(threshold, value)
+        self.threshold = threshold
+        self.value = value
+
+    def describe(self):
+        return f"limit {self.threshold} exceeded ({self.value})"
+
+    def to_metadata(self):
+        return {"kind": self.kind, "threshold": self.threshold, "value": self.value}
+
+class CellTimeout(LimitExceeded):
+    kind = "timeout"
+
+    def describe(self):
+        return f"Cell exceeded the time limit of {self.threshold:g} s and was interrupted"
+
+class CellMemoryExceeded(LimitExceeded):
+    kind = "memory"
+
+    def describe(self):
+        if self.value is None:  # MemoryError from the address space limit
+            return f"Cell ran out of its memory limit of {format_bytes(self.threshold)}"
+        return (f"Cell grew memory by {format_bytes(self.value)}, over the limit of "
+                f"{format_bytes(self.threshold)}, and was interrupted")
+
+class CellOutputExceeded(LimitExceeded):
+    kind = "output"
+
+    def describe(self):
+        return (f"Cell output exceeded {format_bytes(self.threshold)}; the rest was dropped "
+                f"and the cell was interrupted")
+
+class ResourceLimits:
+    """
+    Limits for running cells; None or 0 turns a limit off.
+
+    - timeout: wall-clock seconds per cell.
+    - memory_mb: RSS growth per cell (the kernel shares the IDE process, so growth
+      is what the cell is responsible for). Headless workers also cap their
+      address space with RLIMIT_AS, see apply_process_limit().
+    - output_kb: text and data a cell may emit.
+    - notebook_timeout: wall-clock seconds for a whole run (Run All, headless run).
+    """
+
+    def __init__(self, timeout=None, memory_mb=None, output_kb=None, notebook_timeout=None):
+        self.timeout = timeout or None
+        self.memory_mb = memory_mb or None
+        self.output_kb = output_kb or None
+        self.notebook_timeout = notebook_timeout or None
+
+    @classmethod
+    def from_settings(cls, setting):
+        return cls(setting.get("Cell Timeout Seconds", 0), setting.get("Cell Memory Limit MB", 0),
+                   setting.get("Cell Output Limit KB", 0), setting.get("Notebook Timeout Seconds", 0))
+
+    def notebook_deadline(self):
+        return time.monotonic() + self.notebook_timeout if self.notebook_timeout else None
+
+def output_size(out):
+    if out.output_type == "stream":
+        return len(out.get("text", ""))
+    if out.output_type == "error":
+        return sum(len(line) for line in out.get("traceback", []))
+    return sum(len(value) if isinstance(value, str) else len(str(value)) for value in out.get("data", {}).values())
+
+def address_space():
+    """Virtual size of this process in bytes (Linux), or None."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+def apply_process_limit(memory_mb):
+    """
+    Caps the address space of the current process (POSIX only) at its current size
+    plus `memory_mb`, so the limit means the same headroom as the per-cell growth
+    check; allocations beyond it raise MemoryError. Only for processes that run
+    nothing but the notebook (headless workers), never for the IDE itself.
+    """
+    if not memory_mb:
+        return False
+    try:
+        import resource
+    except ImportError:
+        return False
+    limit = (address_space() or 0) + int(memory_mb) * 1024 * 1024
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError):
+        return False
+    return True
+
+class CellGuard:
+    """
+    Runs one cell under ResourceLimits on the calling thread.
+
+    A watchdog thread checks the deadline, the memory growth and user stops every
+    POLL seconds and interrupts the cell by raising the matching exception in its
+    thread (PyThreadState_SetAsyncExc). Unlike a sys.settrace hook this costs the
+    cell nothing and also breaks loops that produce no line events; code blocked
+    inside a single C call is only interrupted once it returns.
+    Outputs are counted as they are emitted and dropped past the output limit.
+    The violation ends up as a structured "error" output (ename CellTimeout, ...)
+    and in `violation`, for the cell metadata. Code that is not a kernel cell
+    (the timed loops of a benchmark) runs under the same checks with watching().
+    """
+
+    POLL = 0.05             # seconds between watchdog checks
+    MEMORY_INTERVAL = 0.25  # seconds between RSS samples
+
+    def __init__(self, limits=None, deadline=None):
+        self.limits = limits or ResourceLimits()
+        self.notebook_deadline = deadline
+        self.violation = None
+        self.stop_requested = False
+        self._output_bytes = 0
+        self._lock = threading.Lock()
+        self._thread_id = None  # set while the cell runs
+
+    def request_stop(self):
+        # user stop, from any thread
+        self.stop_requested = True
+
+    @contextmanager
+    def watching(self):
+        """Runs the block under the time and memory limits and user stops, on the calling thread."""
+        limits = self.limits
+        start = time.monotonic()
+        deadlines = [d for d in (start + limits.timeout if limits.timeout else None, self.notebook_deadline) if d]
+        deadline = min(deadlines) if deadlines else None
+        memory_limit = limits.memory_mb * 1024 * 1024 if limits.memory_mb else None
+
+        done = threading.Event()
+        watchdog = threading.Thread(target=self._watch, args=(done, start, deadline, memory_limit),
+                                    name="CellGuard", daemon=True)
+        self._thread_id = threading.get_ident()
+        try:
+            watchdog.start()
+            yield
+        finally:
+            with self._lock:
+                self._thread_id = None
+                _async_raise(threading.get_ident(), None)  # drop an interrupt that arrived too late
+            done.set()
+
+    def run(self, kernel, code, callback):
+        limits = self.limits
+        memory_limit = limits.memory_mb * 1024 * 1024 if limits.memory_mb else None
+
+        def emit(out):
+            if self.violation is not None:
+                return
+            if limits.output_kb:
+                self._output_bytes += output_size(out)
+                if self._output_bytes > limits.output_kb * 1024:
+                    self.fail(CellOutputExceeded(limits.output_kb * 1024, self._output_bytes))
+                    return
+            callback(out)
+
+        shell = kernel.shell
+        old_showtb = shell.showtraceback
+
+        def showtraceback(*args, **kwargs):
+            # user stops and limits are reported by the guard, not as a traceback
+            if isinstance(sys.exc_info()[1], KeyboardInterrupt):
+                return
+            old_showtb(*args, **kwargs)
+
+        outputs = []
+        try:
+            shell.showtraceback = showtraceback
+            with self.watching():
+                outputs = kernel.run_cell(code, emit)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            shell.showtraceback = old_showtb
+
+        result = kernel.last_result
+        if self.violation is None and memory_limit and result is not None \
+                and isinstance(result.error_in_exec, MemoryError):
+            self.fail(CellMemoryExceeded(memory_limit, None))
+        if self.violation is not None:
+            callback(self.error_output())
+        return outputs
+
+    def _watch(self, done, start, deadline, memory_limit):
+        rss_base = current_rss() if memory_limit else None
+        next_memory_check = start
+        injected = False
+        while not done.wait(self.POLL):
+            now = time.monotonic()
+            if deadline and now > deadline:
+                self.fail(CellTimeout(round(deadline - start, 3), round(now - start, 3)))
+            if memory_limit and rss_base is not None and now >= next_memory_check:
+                next_memory_check = now + self.MEMORY_INTERVAL
+                rss = current_rss()
+                if rss is not None and rss - rss_base > memory_limit:
+                    self.fail(CellMemoryExceeded(memory_limit, rss - rss_base))
+            if self.violation is not None and not injected:
+                injected = self._interrupt(type(self.violation))
+            elif self.stop_requested:
+                self.stop_requested = False
+                self._interrupt(KeyboardInterrupt)
+
+    def _interrupt(self, exc_type):
+        with self._lock:
+            if self._thread_id is None:
+                return False
+            return _async_raise(self._thread_id, exc_type)
+
+    def fail(self, violation):
+        if self.violation is None:
+            self.violation = violation
+        return self.violation
+
+    def error_output(self):
+        violation = self.violation
+        return new_output(
+            "error",
+            ename=type(violation).__name__,
+            evalue=violation.describe(),
+            traceback=[f"{type(violation).__name__}: {violation.describe()}"],
+        )
+
+def _async_raise(thread_id, exc_type):
+    """Raises `exc_type` in the thread at its next bytecode; None clears a pending one."""
+    count = ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread_id), ctypes.py_object(exc_type) if exc_type is not None else None)
+    return count == 1
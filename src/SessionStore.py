@@ -0,0 +1,105 @@
+import os, json, hashlib
+from PyQt5.QtCore import QStandardPaths
+
+
+
+SESSION_VERSION = 1
+
+class SessionStore:
+    """
+    What the IDE had open, so the next start can reopen it.
+
+    session.json holds the main window geometry and the open files in window
+    order: {"path", "kind" ("ipynb" / "py"), "geometry" [x, y, w, h],
+    "maximized", "focus", "scroll", "viewport"}, plus the path of the active one.
+
+    layout/<hash of path>.json caches, per notebook, the height of every cell as
+    it was last laid out. An entry is only used while the file still has the
+    recorded mtime and size, so heights always belong to the cells being loaded.
+    Rendered doc HTML is not repeated here; RenderCache already keeps it by source.
+    The layout folder is kept to `max_layouts` files, least recently used first out.
+    """
+
+    def __init__(self, directory, max_layouts=200):
+        self.directory = directory
+        self.layout_directory = os.path.join(directory, "layout")
+        self.max_layouts = max_layouts
+
+    @property
+    def session_path(self):
+        return os.path.join(self.directory, "session.json")
+
+    def layout_path(self, path):
+        digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.layout_directory, digest + ".json")
+
+    def load_session(self):
+        data = self._read(self.session_path)
+        if not data or data.get("version") != SESSION_VERSION:
+            return None
+        return data
+
+    def save_session(self, geometry, files, active=None):
+        self._write(self.session_path, {"version": SESSION_VERSION, "geometry": geometry,
+                                        "files": files, "active": active})
+
+    def load_layout(self, path):
+        """Cached cell heights of `path`, or None if the file changed since they were recorded."""
+        entry = self._read(self.layout_path(path))
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not entry or entry.get("mtime") != stat.st_mtime or entry.get("size") != stat.st_size:
+            return None
+        try:
+            os.utime(self.layout_path(path))
+        except OSError:
+            pass
+        return entry.get("heights")
+
+    def save_layout(self, path, heights):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        self._write(self.layout_path(path), {"path": os.path.abspath(path), "mtime": stat.st_mtime,
+                                             "size": stat.st_size, "heights": heights})
+        self.evict()
+
+    def evict(self):
+        try:
+            entries = sorted(os.scandir(self.layout_directory), key=lambda entry: entry.stat().st_mtime)
+        except OSError:
+            return
+        for entry in entries[:max(0, len(entries) - self.max_layouts)]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def _read(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path, data):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp = path + ".tmp"
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(temp, path)
+        except OSError as e:
+            print(f"[SessionStore] Cannot write {path}: {e}")
+
+_store = None
+
+def session_store():
+    global _store
+    if _store is None:
+        directory = os.path.join(QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation), "uranus_ide")
+        _store = SessionStore(directory)
+    return _store
@@ -2,7 +2,7 @@ import json
 import os
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QVBoxLayout, QHBoxLayout,
-    QColorDialog, QFontDialog, QSpinBox, QTabWidget, QFrame, QPushButton , QComboBox, QMessageBox  
+    QColorDialog, QFontDialog, QSpinBox, QTabWidget, QFrame, QPushButton , QComboBox, QMessageBox  , QCheckBox
 )
 from PyQt5.QtGui import  QFont
 from PyQt5.QtCore import Qt
@@ -41,6 +41,23 @@ DEFAULT_SETTINGS = {
     "Line Number Font": "Technology",
     "Line Number Font Size": 16,
     "Line Number Box Height": 30,
+    "Memory Profiling": False,
+    "Benchmark Repeat": 7,
+    "Benchmark Warmup": 1,
+    "Benchmark Regression Threshold": 10,
+    "Image Cache MB": 64,
+    "Image Sidecar Storage": False,
+    "Image Max Width": 1280,
+    "Image Quality": 85,
+    "Notebook Image Budget MB": 25,
+    "Validate Notebooks On Load": False,
+    "Restore Session": True,
+    "Render Cache MB": 32,
+    "Hibernate After Minutes": 10,
+    "Cell Timeout Seconds": 0,
+    "Cell Memory Limit MB": 0,
+    "Cell Output Limit KB": 0,
+    "Notebook Timeout Seconds": 0,
     "last_path": ""
 }
 
@@ -96,6 +113,12 @@ THEMES = {
 }
 
 
+_settings_version = 0
+
+def settings_version():
+    """Incremented whenever SettingsWindow saves, so caches built from settings know to rebuild."""
+    return _settings_version
+
 def get_setting_path():
     current_file = os.path.abspath(__file__)  
     src_dir = os.path.dirname(os.path.dirname(current_file))  
@@ -159,12 +182,15 @@ class SettingsWindow(QWidget):
         self.tabs = QTabWidget()
         self.tab_main = QWidget()
         self.tab_extra = QWidget()
+        self.tab_performance = QWidget()
 
         self.init_main_tab()
         self.init_syntax_tab()
+        self.init_performance_tab()
 
         self.tabs.addTab(self.tab_main, "Appearance")
         self.tabs.addTab(self.tab_extra, "Syntax Color")
+        self.tabs.addTab(self.tab_performance, "Performance")
 
         main_layout.addWidget(self.tabs)
 
@@ -356,6 +382,85 @@ class SettingsWindow(QWidget):
 
         self.tab_extra.setLayout(layout)
 
+    def init_performance_tab(self):
+        layout = QVBoxLayout()
+        layout.setSpacing(6)
+
+        self.memory_profiling_check = QCheckBox("Memory Profiling (RSS + tracemalloc per cell)")
+        self.memory_profiling_check.setToolTip(
+            "Record process RSS before/after/peak and the top allocation sites of every executed cell.\n"
+            "tracemalloc slows execution down, keep it off when you do not need it."
+        )
+        self.memory_profiling_check.setChecked(bool(self.settings.get("Memory Profiling", False)))
+        self.memory_profiling_check.toggled.connect(lambda checked: self.update_performance_setting("Memory Profiling", checked))
+        layout.addWidget(self.memory_profiling_check)
+
+        self.image_sidecar_check = QCheckBox("Store notebook images in a sidecar folder (deduplicated)")
+        self.image_sidecar_check.setToolTip(
+            "Save images once into <notebook>.uranus_blobs/ and reference them by hash from the .ipynb.\n"
+            "Use File > Export (Inline Images) to get a copy that opens in Jupyter."
+        )
+        self.image_sidecar_check.setChecked(bool(self.settings.get("Image Sidecar Storage", False)))
+        self.image_sidecar_check.toggled.connect(lambda checked: self.update_performance_setting("Image Sidecar Storage", checked))
+        layout.addWidget(self.image_sidecar_check)
+
+        self.validate_notebooks_check = QCheckBox("Validate notebooks against the nbformat schema when opening")
+        self.validate_notebooks_check.setToolTip(
+            "Runs after the cells are shown and reports problems in the status bar.\n"
+            "Slow on very large notebooks."
+        )
+        self.validate_notebooks_check.setChecked(bool(self.settings.get("Validate Notebooks On Load", False)))
+        self.validate_notebooks_check.toggled.connect(lambda checked: self.update_performance_setting("Validate Notebooks On Load", checked))
+        layout.addWidget(self.validate_notebooks_check)
+
+        self.restore_session_check = QCheckBox("Reopen the files of the last session on startup")
+        self.restore_session_check.setToolTip(
+            "Restores window geometry, open files, focused cell and scroll position.\n"
+            "Cached cell heights let the visible part of a notebook paint before the rest loads."
+        )
+        self.restore_session_check.setChecked(bool(self.settings.get("Restore Session", True)))
+        self.restore_session_check.toggled.connect(lambda checked: self.update_performance_setting("Restore Session", checked))
+        layout.addWidget(self.restore_session_check)
+
+        separator = QFrame()
+        separator.setFrameShape(QFrame.HLine)
+        separator.setFrameShadow(QFrame.Sunken)
+        layout.addWidget(separator)
+
+        self.performance_spins = {}
+        for key, label_text, low, high in (
+            ("Benchmark Repeat", "Benchmark Repeat:", 1, 100),
+            ("Benchmark Warmup", "Benchmark Warmup Runs:", 0, 20),
+            ("Benchmark Regression Threshold", "Benchmark Regression Threshold (%):", 1, 500),
+            ("Image Cache MB", "Decoded Image Cache (MB):", 8, 4096),
+            ("Image Max Width", "Inserted Image Max Width (px):", 320, 8192),
+            ("Image Quality", "Inserted Photo Quality (JPEG/WebP):", 50, 100),
+            ("Notebook Image Budget MB", "Notebook Image Budget (MB):", 1, 1024),
+            ("Render Cache MB", "Markdown Render Cache (MB):", 1, 1024),
+            ("Hibernate After Minutes", "Hibernate Idle Notebooks After (min, 0 = never):", 0, 1440),
+            ("Cell Timeout Seconds", "Cell Time Limit (s, 0 = none):", 0, 86400),
+            ("Cell Memory Limit MB", "Cell Memory Growth Limit (MB, 0 = none):", 0, 262144),
+            ("Cell Output Limit KB", "Cell Output Limit (KB, 0 = none):", 0, 1048576),
+            ("Notebook Timeout Seconds", "Run All Time Limit (s, 0 = none):", 0, 604800),
+        ):
+            row = QHBoxLayout()
+            row.setSpacing(6)
+            spin = QSpinBox()
+            spin.setRange(low, high)
+            spin.setValue(int(self.settings.get(key, DEFAULT_SETTINGS[key])))
+            spin.valueChanged.connect(lambda value, k=key: self.update_performance_setting(k, value))
+            row.addWidget(QLabel(label_text))
+            row.addWidget(spin)
+            layout.addLayout(row)
+            self.performance_spins[key] = spin
+
+        layout.addStretch()
+        self.tab_performance.setLayout(layout)
+
+    def update_performance_setting(self, key, value):
+        self.settings[key] = value
+        self.save_settings()
+
     def select_color(self, key):
         color = QColorDialog.getColor()
         if color.isValid():
@@ -438,6 +543,12 @@ class SettingsWindow(QWidget):
         self.line_number_size_spin.setValue(self.settings["Line Number Font Size"])
         default_height = self.settings.get("Line Number Box Height", 30)        
         self.header_height_combo.setCurrentText(str(default_height))
+        self.memory_profiling_check.setChecked(self.settings["Memory Profiling"])
+        self.image_sidecar_check.setChecked(self.settings["Image Sidecar Storage"])
+        self.validate_notebooks_check.setChecked(self.settings["Validate Notebooks On Load"])
+        self.restore_session_check.setChecked(self.settings["Restore Session"])
+        for key, spin in self.performance_spins.items():
+            spin.setValue(self.settings[key])
 
         self.update_font_preview("code")
         self.update_font_preview("meta")
@@ -455,12 +566,14 @@ class SettingsWindow(QWidget):
         self.save_settings()
 
     def save_settings(self):
+        global _settings_version
         path = get_setting_path()
         try:
             with open(path, "w", encoding="utf-8") as f:
                 json.dump(self.settings, f, indent=4, ensure_ascii=False)
         except Exception as e:
             print(f"⚠️ Failed to save settings: {e}")
+        _settings_version += 1
 
     @staticmethod
 
@@ -0,0 +1,159 @@
+import sys, time, itertools
+from collections import deque
+
+
+
+SHALLOW_TYPES = (int, float, complex, bool, type(None), str, bytes, bytearray, range)
+OPAQUE_TYPE_NAMES = {"module", "type", "function", "builtin_function_or_method", "method", "frame", "code"}
+
+class SizeEstimator:
+    """
+    Estimates the deep memory footprint of namespace values, unlike sys.getsizeof
+    which only counts the outer object (56 bytes for a list holding gigabytes of arrays).
+
+    Fast paths:
+    - NumPy arrays: nbytes (object arrays are sampled)
+    - pandas DataFrame / Series / Index: memory_usage(deep=True), on a head sample for huge objects
+    - str / bytes / bytearray / memoryview: their own buffer
+    - list / tuple / set / dict / deque and plain objects: bounded recursive walk
+
+    Containers longer than `sample_size` are sampled evenly and extrapolated, the walk
+    stops at `max_depth`, and everything stops at `deadline` (time.perf_counter value).
+    Each shared object is counted once per estimate() call. An estimate that had to
+    sample, cut the walk or hit the deadline is reported as inexact.
+
+    Usage:
+        estimator = SizeEstimator(deadline=time.perf_counter() + 2.0)
+        size, exact = estimator.estimate(value)
+    """
+
+    def __init__(self, max_depth=6, sample_size=200, pandas_sample_rows=100_000, deadline=None):
+        self.max_depth = max_depth
+        self.sample_size = sample_size
+        self.pandas_sample_rows = pandas_sample_rows
+        self.deadline = deadline
+
+    def expired(self):
+        return self.deadline is not None and time.perf_counter() > self.deadline
+
+    def estimate(self, obj):
+        self._exact = True
+        self._seen = set()
+        try:
+            size = self._size(obj, 0)
+        except Exception:
+            # the namespace may be mutated by a running cell while we walk it
+            self._exact = False
+            size = self._shallow(obj)
+        return size, self._exact
+
+    @staticmethod
+    def _shallow(obj):
+        try:
+            return sys.getsizeof(obj)
+        except Exception:
+            return 0
+
+    def _size(self, obj, depth):
+        if id(obj) in self._seen:
+            return 0
+        self._seen.add(id(obj))
+
+        if isinstance(obj, SHALLOW_TYPES):
+            return self._shallow(obj)
+
+        t = type(obj)
+        mod = t.__module__ or ""
+        if t.__name__ in OPAQUE_TYPE_NAMES or isinstance(obj, type):
+            return self._shallow(obj)
+
+        if mod.startswith("numpy") and hasattr(obj, "nbytes"):
+            return self._numpy_size(obj, depth)
+        if mod.startswith("pandas") and hasattr(obj, "memory_usage"):
+            return self._pandas_size(obj)
+        if isinstance(obj, memoryview):
+            return self._shallow(obj) + obj.nbytes
+
+        if depth >= self.max_depth or self.expired():
+            self._exact = False
+            return self._shallow(obj)
+
+        if isinstance(obj, dict):
+            return self._shallow(obj) + self._items_size(obj.items(), len(obj), depth, pairs=True)
+        if isinstance(obj, (list, tuple, set, frozenset, deque)):
+            return self._shallow(obj) + self._items_size(obj, len(obj), depth)
+
+        size = self._shallow(obj)
+        if hasattr(obj, "__dict__"):
+            size += self._size(vars(obj), depth + 1)
+        for slot in getattr(t, "__slots__", ()):
+            if isinstance(slot, str) and hasattr(obj, slot):
+                size += self._size(getattr(obj, slot), depth + 1)
+        return size
+
+    def _items_size(self, items, length, depth, pairs=False):
+        if length <= self.sample_size:
+            sample = items
+        else:
+            # evenly spaced sample for sequences, a prefix for sets and dicts
+            self._exact = False
+            if isinstance(items, (list, tuple)):
+                step = length / self.sample_size
+                sample = [items[int(i * step)] for i in range(self.sample_size)]
+            else:
+                sample = itertools.islice(items, self.sample_size)
+
+        total = 0
+        count = 0
+        for item in sample:
+            if self.expired():
+                self._exact = False
+                break
+            if pairs:
+                total += self._size(item[0], depth + 1) + self._size(item[1], depth + 1)
+            else:
+                total += self._size(item, depth + 1)
+            count += 1
+
+        if count and count < length:
+            total = int(total * length / count)
+        return total
+
+    def _numpy_size(self, obj, depth):
+        size = self._shallow(obj)
+        if getattr(obj, "base", None) is not None or type(obj).__name__ == "memmap":
+            # views and memmaps do not own their buffer; getsizeof only counts the header
+            size += obj.nbytes
+        elif size < obj.nbytes:
+            size = obj.nbytes
+
+        if getattr(getattr(obj, "dtype", None), "hasobject", False) and getattr(obj, "ndim", 0) and obj.size:
+            if depth >= self.max_depth or self.expired():
+                self._exact = False
+                return size
+            # evenly spaced elements read through .flat: no list of the whole array, no copy of a view
+            count = min(obj.size, self.sample_size)
+            step = obj.size / count
+            sample = [obj.flat[int(i * step)] for i in range(count)]
+            total = self._items_size(sample, count, depth)
+            if count < obj.size:
+                self._exact = False
+                total = int(total * obj.size / count)
+            size += total
+        return size
+
+    def _pandas_size(self, obj):
+        try:
+            length = len(obj)
+        except TypeError:
+            return self._shallow(obj)
+
+        if length > self.pandas_sample_rows and hasattr(obj, "iloc"):
+            self._exact = False
+            head = obj.iloc[:self.pandas_sample_rows]
+            usage = head.memory_usage(deep=True)
+            usage = usage.sum() if hasattr(usage, "sum") else usage
+            return int(usage * length / self.pandas_sample_rows)
+
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
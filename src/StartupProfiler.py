@@ -0,0 +1,107 @@
+import sys, time, builtins
+from contextlib import contextmanager
+
+
+
+DEFAULT_BUDGET_MS = 1000
+
+class StartupProfiler:
+    """
+    Startup timing for `uranus --profile-startup[=MS]`.
+
+    Phases (dependency check, imports, QApplication, fonts, main window, first
+    paint) are timed with phase(name) or begin(name) / end(); imports are timed by
+    wrapping builtins.__import__ while profiling, which gives every module loaded
+    during startup a self and a cumulative time. report() compares the total
+    with the budget. A disabled profiler records nothing, so callers use it
+    unconditionally.
+    """
+
+    def __init__(self, budget_ms=DEFAULT_BUDGET_MS, enabled=True):
+        self.budget_ms = budget_ms
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.phases = []   # (name, ms)
+        self.imports = {}  # module -> [self ms, cumulative ms]
+        self._open = None  # (name, start) of the phase begun with begin()
+        self._stack = []   # child time of the imports in progress
+        self._original_import = None
+
+    def begin(self, name):
+        if self.enabled:
+            self._open = (name, time.perf_counter())
+
+    def end(self):
+        if self.enabled and self._open:
+            name, start = self._open
+            self.phases.append((name, (time.perf_counter() - start) * 1000))
+            self._open = None
+
+    @contextmanager
+    def phase(self, name):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def start_import_timing(self):
+        if not self.enabled or self._original_import:
+            return
+        self._original_import = original = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in sys.modules:
+                return original(name, globals, locals, fromlist, level)
+            self._stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                total = (time.perf_counter() - start) * 1000
+                children = self._stack.pop()
+                if self._stack:
+                    self._stack[-1] += total
+                entry = self.imports.setdefault(name, [0.0, 0.0])
+                entry[0] += total - children
+                entry[1] += total
+
+        builtins.__import__ = timed_import
+
+    def stop_import_timing(self):
+        if self._original_import:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def over_budget(self):
+        return self.total_ms() > self.budget_ms
+
+    def report(self, top=15):
+        total = self.total_ms()
+        lines = [f"Uranus startup profile (budget {self.budget_ms:.0f} ms)", ""]
+        lines.append(f"  {'phase':<24}{'ms':>9}{'budget':>9}")
+        for name, ms in self.phases:
+            lines.append(f"  {name:<24}{ms:>9.1f}{ms / self.budget_ms:>9.0%}")
+        verdict = "OVER BUDGET" if total > self.budget_ms else "ok"
+        lines.append(f"  {'total':<24}{total:>9.1f}{total / self.budget_ms:>9.0%}  {verdict}")
+        if self.imports:
+            lines += ["", f"  {'slowest imports':<40}{'self ms':>9}{'cumul ms':>10}"]
+            slowest = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)[:top]
+            for name, (self_ms, cumulative_ms) in slowest:
+                lines.append(f"  {name:<40}{self_ms:>9.1f}{cumulative_ms:>10.1f}")
+        return "\n".join(lines)
+
+def parse_profile_argument(argv):
+    """Removes `--profile-startup[=MS]` from argv; returns the budget in ms, or None when absent."""
+    for index, arg in enumerate(argv):
+        if arg == "--profile-startup" or arg.startswith("--profile-startup="):
+            del argv[index]
+            _, _, value = arg.partition("=")
+            try:
+                return float(value) if value else DEFAULT_BUDGET_MS
+            except ValueError:
+                return DEFAULT_BUDGET_MS
+    return None
@@ -0,0 +1,265 @@
+import itertools
+from collections import deque
+from PyQt5.QtWidgets import QDialog, QTreeView, QVBoxLayout, QLabel, QPushButton, QHeaderView
+from PyQt5.QtGui import QFont, QColor, QBrush
+from PyQt5.QtCore import Qt, QAbstractItemModel, QModelIndex, QObject, QThread, pyqtSignal, pyqtSlot
+
+
+
+PAGE_SIZE = 1000
+SEQUENCE_TYPES = (list, tuple, deque)
+SET_TYPES = (set, frozenset)
+PENDING = "…"
+
+def is_expandable(value):
+    if isinstance(value, (dict,) + SEQUENCE_TYPES + SET_TYPES):
+        return True
+    if isinstance(value, type) or callable(value):
+        return False
+    return type(value).__name__ != "module" and hasattr(value, "__dict__") and bool(vars(value))
+
+def child_count(value):
+    if isinstance(value, (dict,) + SEQUENCE_TYPES + SET_TYPES):
+        return len(value)
+    return len(vars(value))
+
+def child_items(value, start, stop):
+    """(label, value) pairs of children start..stop without materializing the rest."""
+    if isinstance(value, SEQUENCE_TYPES) and not isinstance(value, deque):
+        return [(f"[{i}]", value[i]) for i in range(start, stop)]
+    if isinstance(value, dict):
+        return [(repr(k), v) for k, v in itertools.islice(value.items(), start, stop)]
+    if isinstance(value, deque) or isinstance(value, SET_TYPES):
+        prefix = "[{}]" if isinstance(value, deque) else "{{{}}}"
+        return [(prefix.format(i), v) for i, v in zip(range(start, stop), itertools.islice(value, start, stop))]
+    return list(itertools.islice(vars(value).items(), start, stop))
+
+class ValueNode:
+    """
+    One row of ValueTreeModel.
+
+    A node either wraps a value (key, value) or is a page node standing for the
+    children [start, stop) of its parent's value. Children are created on the first
+    fetchMore(); summary stays None until the background worker computed it.
+    """
+
+    __slots__ = ("key", "value", "parent", "row", "children", "page", "summary", "type_name")
+
+    def __init__(self, key, value, parent=None, row=0, page=None):
+        self.key = key
+        self.value = value
+        self.parent = parent
+        self.row = row
+        self.children = None
+        self.page = page
+        self.summary = None
+        self.type_name = "" if page else type(value).__name__
+
+    @property
+    def expandable(self):
+        return self.page is not None or is_expandable(self.value)
+
+    def build_children(self):
+        if self.page is not None:
+            start, stop = self.page
+        else:
+            start, stop = 0, child_count(self.value)
+
+        count = stop - start
+        if count <= PAGE_SIZE:
+            items = child_items(self.value, start, stop)
+            self.children = [ValueNode(key, value, self, i) for i, (key, value) in enumerate(items)]
+            return
+
+        # large ranges become page nodes; pages nest (1000, 1M, ...) so one level never
+        # holds more than PAGE_SIZE rows, even for millions of items
+        span = PAGE_SIZE
+        while count > span * PAGE_SIZE:
+            span *= PAGE_SIZE
+        self.children = []
+        for i, page_start in enumerate(range(start, stop, span)):
+            page_stop = min(page_start + span, stop)
+            node = ValueNode(f"[{page_start} … {page_stop - 1}]", self.value, self, i, page=(page_start, page_stop))
+            node.summary = f"{page_stop - page_start:,} items"
+            self.children.append(node)
+
+class SummaryWorker(QObject):
+    """
+    Computes summarize_value() for batches of nodes on a background thread, so
+    str() of large or slow objects never blocks the GUI.
+    """
+    ready = pyqtSignal(object)
+
+    def __init__(self, summarize):
+        super().__init__()
+        self.summarize = summarize
+
+    @pyqtSlot(object)
+    def run(self, batch):
+        results = []
+        for node_id, value in batch:
+            try:
+                text = self.summarize(value)
+            except Exception as e:
+                text = f"<error: {type(e).__name__}>"
+            results.append((node_id, text))
+        self.ready.emit(results)
+
+class ValueTreeModel(QAbstractItemModel):
+    """
+    Lazy tree over a Python value: containers and object attributes are expanded
+    on demand (canFetchMore/fetchMore), sequences, dicts and sets longer than
+    PAGE_SIZE are split into page nodes, and the Value column is filled
+    asynchronously by a SummaryWorker.
+    """
+
+    headers = ["Key", "Type", "Value"]
+    request_summaries = pyqtSignal(object)
+
+    def __init__(self, name, value, summarize, parent=None):
+        super().__init__(parent)
+        self.root = ValueNode("", None)
+        self.root.children = [ValueNode(name, value, self.root, 0)]
+        self.nodes = {}
+
+        self.worker = SummaryWorker(summarize)
+        self.thread = QThread()
+        self.worker.moveToThread(self.thread)
+        self.request_summaries.connect(self.worker.run)
+        self.worker.ready.connect(self.summaries_ready)
+        self.thread.start()
+        self.queue_summaries(self.root.children)
+
+    def stop(self):
+        self.thread.quit()
+        self.thread.wait()
+
+    def node(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self.node(parent)
+        if node.children is None or not 0 <= row < len(node.children):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self.root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        children = self.node(parent).children
+        return len(children) if children else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.headers)
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self.node(parent)
+        if node.children is not None:
+            return bool(node.children)
+        return node.expandable
+
+    def canFetchMore(self, parent):
+        node = self.node(parent)
+        return node.children is None and node.expandable
+
+    def fetchMore(self, parent):
+        node = self.node(parent)
+        try:
+            node.build_children()
+        except Exception as e:
+            # mutated while expanding, or an object whose attributes cannot be listed
+            node.children = []
+            node.summary = f"<cannot expand: {type(e).__name__}>"
+            return
+        if not node.children:
+            return
+        self.beginInsertRows(parent, 0, len(node.children) - 1)
+        self.endInsertRows()
+        self.queue_summaries(node.children)
+
+    def queue_summaries(self, nodes):
+        batch = []
+        for node in nodes:
+            if node.summary is None:
+                self.nodes[id(node)] = node
+                batch.append((id(node), node.value))
+        for i in range(0, len(batch), 100):
+            self.request_summaries.emit(batch[i:i + 100])
+
+    def summaries_ready(self, results):
+        for node_id, text in results:
+            node = self.nodes.pop(node_id, None)
+            if node is None:
+                continue
+            node.summary = text
+            index = self.createIndex(node.row, 2, node)
+            self.dataChanged.emit(index, index)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        col = index.column()
+
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return str(node.key)
+            if col == 1:
+                return node.type_name
+            return node.summary if node.summary is not None else PENDING
+
+        if role == Qt.ForegroundRole and (node.page is not None or node.summary is None):
+            return QBrush(QColor("#777777"))
+        if role == Qt.ToolTipRole and col == 2 and node.summary:
+            return node.summary
+        return None
+
+class ValueTreeDialog(QDialog):
+    """
+    Full value viewer for structured objects opened from ObjectInspectorWindow.
+
+    Replaces the json.dumps / reprlib text dump, which had to stringify the whole
+    value on the GUI thread: only expanded rows exist, large collections are paged
+    in chunks of PAGE_SIZE items, and summaries are computed off-thread.
+    """
+
+    def __init__(self, name, value, summarize, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Full Value: {name}")
+        self.setMinimumSize(700, 450)
+
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel(f"Type: {type(value).__name__}"))
+
+        self.model = ValueTreeModel(name, value, summarize, self)
+        self.tree = QTreeView()
+        self.tree.setModel(self.model)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setFont(QFont("Segoe UI", 10))
+        self.tree.setAlternatingRowColors(True)
+        self.tree.header().setSectionResizeMode(0, QHeaderView.Interactive)
+        self.tree.header().setStretchLastSection(True)
+        self.tree.setColumnWidth(0, 220)
+        self.tree.setColumnWidth(1, 120)
+        self.tree.expand(self.model.index(0, 0))
+        layout.addWidget(self.tree)
+
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        layout.addWidget(close_btn)
+        self.setLayout(layout)
+
+        self.finished.connect(self.model.stop)
@@ -1,14 +1,8 @@
-
-import os ,base64  ,io ,builtins ,uuid , importlib , hashlib , sys,inspect , nbformat , sys
-from nbformat.v4 import  new_output
-from contextlib import redirect_stdout, redirect_stderr
-from traitlets.config import Config
-from IPython.core.interactiveshell import InteractiveShell
-import subprocess,  tempfile
+import os ,base64 , hashlib , sys , nbformat , time
 # Import Pyqt Feturse
 from PyQt5.QtGui import  QIcon , QKeySequence , QTextCursor 
-from PyQt5.QtCore import  QSize ,QMetaObject, Qt, pyqtSlot, QObject ,QEventLoop ,QTimer
-from PyQt5.QtWidgets import (QToolBar, QToolButton, QColorDialog, QShortcut, QWidget , QFrame , QMainWindow
+from PyQt5.QtCore import  QSize ,QMetaObject, Qt, pyqtSlot, pyqtSignal, QObject ,QEventLoop ,QTimer , QThread
+from PyQt5.QtWidgets import (QWIDGETSIZE_MAX, QToolBar, QToolButton, QColorDialog, QShortcut, QWidget , QFrame , QMainWindow
     , QVBoxLayout , QSpacerItem, QSizePolicy , QScrollArea,QDialog, QVBoxLayout, QLineEdit , QMdiSubWindow , QStatusBar,QInputDialog
     , QPushButton , QLabel, QHBoxLayout , QFileDialog, QMessageBox , QCheckBox)
 
@@ -16,47 +10,21 @@ from PyQt5.QtWidgets import (QToolBar, QToolButton, QColorDialog, QShortcut, QWi
 # Import Uranus Class
 from Cell import Cell
 from ObjectInspectorWindow import ObjectInspectorWindow
+from IPythonKernel import IPythonKernel
+from MemoryTimelineWindow import MemoryTimelineWindow
+from BenchmarkRunner import BenchmarkStore
+from ExecutionHistory import ExecutionHistory
+from HistoryReportWindow import HistoryReportWindow
+from SizeEstimator import SizeEstimator
+from BlobStore import BlobStore
+from ImageIngest import ImageBudget
+from ReflowScheduler import ReflowScheduler
+from NotebookModel import NotebookModel
+from ResourceLimits import ResourceLimits
+from SettingWindow import load_setting
 
 
 
-class TerminalRunner:
-    _instance = None
-
-    def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            cls._instance = super(TerminalRunner, cls).__new__(cls)
-        return cls._instance
-
-    def run_code(self, code_text: str):
-        temp_file = os.path.join(tempfile.gettempdir(), "uranus_temp.py")
-        with open(temp_file, "w", encoding="utf-8") as f:
-            f.write(code_text)
-
-        python_exe = sys.executable
-
-        if sys.platform.startswith("win"):
-            cmd = f'start cmd /k "{python_exe} -u {temp_file}"'
-
-
-            subprocess.Popen(cmd, shell=True)
-
-        elif sys.platform.startswith("linux"):
-            cmd = f'gnome-terminal -- bash -c "{python_exe} -u {temp_file}; exec bash"'
-
-            subprocess.Popen(cmd, shell=True)
-
-        elif sys.platform == "darwin":
-            apple_script = f'''
-            tell application "Terminal"
-                do script "{python_exe} -u {temp_file}"
-                activate
-            end tell
-            '''
-
-            subprocess.Popen(["osascript", "-e", apple_script])
-        else:
-            raise OSError(f"Unsupported platform: {sys.platform}")
-
 class FindReplaceDialog(QDialog):
 
     def __init__(self, editor, parent=None):
@@ -265,319 +233,98 @@ class InputWaiter(QObject): # for Covering Input
             if hasattr(parent, 'stop_execution'):
                 parent.stop_execution()
 
-class StreamCatcher(io.StringIO):
+class NamespaceDiffWorker(QObject):
     """
-    A stream interceptor that captures stdout/stderr line-by-line and emits structured output.
-
-    Purpose:
-    - Used during code execution to redirect and format console output.
-    - Converts each line into a Jupyter-compatible nbformat output object.
+    Runs IPythonKernel.inspect_namespace_diff() off the GUI thread after a cell finished.
 
-    Parameters:
-    - name (str): Stream name ("stdout" or "stderr").
-    - callback (function): Function to receive each parsed output line.
-
-    Behavior:
-    - Buffers incoming text until newline.
-    - Emits each complete line via callback as nbformat stream output.
+    Two phases:
+    - diff_ready(result): emitted as soon as the diff is known, so the table updates at once
+      (sizes are sys.getsizeof at that point).
+    - finished(sizes): deep sizes of the added/changed rows estimated with SizeEstimator
+      within `size_budget` seconds, as {name: (id(value), size, exact)}.
     """
+    diff_ready = pyqtSignal(object)
+    finished = pyqtSignal(object)
 
-    def __init__(self, name, callback):
+    def __init__(self, kernel, previous, size_budget=2.0):
         super().__init__()
-        self._name = name
-        self.callback = callback
-        self._buffer = ""
-
-    def write(self, text):
-        self._buffer += text
-        while "\n" in self._buffer:
-            line, self._buffer = self._buffer.split("\n", 1)
-            if line.strip():
-                out = new_output("stream", name=self._name, text=line)
-                self.callback(out)
-
-class IPythonKernel:
-    """
-    A lightweight wrapper around IPython's InteractiveShell for executing notebook cells.
-
-    Responsibilities:
-    - Executes code cells and captures stdout, stderr, and display outputs.
-    - Handles input() via InputWaiter.
-    - Converts matplotlib and image outputs to base64 PNG for inline display.
-    - Maps Python objects to appropriate output editors (e.g., table, image, text).
+        self.kernel = kernel
+        self.previous = previous
+        self.size_budget = size_budget
 
-    Attributes:
-    - shell (InteractiveShell): IPython shell instance.
-    - input_waiter (InputWaiter): Handles blocking input dialogs.
-    - object_store (dict): Stores references to large objects for later inspection.
-
-    Methods:
-    - run_cell(code, callback): Executes code and emits outputs via callback.
-    - __uranus_inspect_variables(): Returns a DataFrame of global variables (optional).
-    """
-
-    def __init__(self):
-        cfg = Config()
-        cfg.InteractiveShellEmbed = Config()
-        cfg.InteractiveShellEmbed.user_ns = {}
-
-
-        self.shell = InteractiveShell(config=cfg)
-        self.input_waiter = InputWaiter()
-        self.object_store = {}
-
-    def run_cell(self, code: str, callback):
-        builtins.input = self.input_waiter.wait_for_input
-        if ("matplotlib" in code or "plt." in code) and importlib.util.find_spec("matplotlib") is not None:
-            injected = "import matplotlib; matplotlib.use('Agg')\n"
-            code = injected + code.replace("plt.show()", "plt.savefig('plot.png')")
-
-        outputs = []
-        stdout_catcher = StreamCatcher("stdout", callback)
-        stderr_buffer = io.StringIO()
-
-        # 🚫 Block problematic event-loop libraries in one condition
-        if (
-            "tkinter" in code or "Tk(" in code or
-            "PyQt5" in code or "PySide2" in code or "QApplication(" in code or
-            "asyncio" in code or "await " in code or "async def" in code
-        ):
-
-            terminal = TerminalRunner()        
-            terminal.run_code(code)  
-            tb_lines = [
-                "⚠️ Code execution blocked.",
-                "Reason: Event-loop based libraries (Tkinter, Qt, asyncio) conflict with IPython/QThread execution.",
-                "These libraries manage their own GUI or async loops which cannot be safely re-entered in Uranus IDE cells.",
-                "Therefore, we need to run your code using the standard Python interpreter instead."
-            ]
-            out = new_output(
-                "error",
-                ename="EventLoopBlocked",
-                evalue="Execution of Tkinter/Qt/asyncio code is not supported inside Uranus IDE cells",
-                traceback=tb_lines
-            )
-            outputs.append(out)
-            callback(out)
-            return outputs
-
-
-        with redirect_stdout(stdout_catcher), redirect_stderr(stderr_buffer):
-            result = self.shell.run_cell(code)
-
-        obj = result.result
-        stderr_text = stderr_buffer.getvalue().strip()     
-
-
-        # 🖼️ image
-        if os.path.exists("plot.png"):
-            try:
-                with open("plot.png", "rb") as f:
-                    encoded = base64.b64encode(f.read()).decode("utf-8")
-                out = new_output("display_data", data={"image/png": encoded},
-                                metadata={"object_type": "Figure", "editor": "output_image"})
-                outputs.append(out)
-                callback(out)
-            except Exception:
-                pass
-            finally:
-
-                try:
-                    user_ns = self.shell.user_ns
-                    if "plt" in user_ns:
-                        user_ns["plt"].close("all")
-
-                except Exception:
-                    pass
-
-                try :
-                    os.remove("plot.png")
-                except Exception:
-                    pass
-
-        # 🔥 error
-        if stderr_text:
-            tb_lines = stderr_text.splitlines()
-            out = new_output(
-                "error",
-                ename="Exception",
-                evalue=tb_lines[-1] if tb_lines else "",
-                traceback=tb_lines,
-            )
-            outputs.append(out)
-            callback(out)
-
-        # ⛔ if None or error stop
-        if obj is None or (isinstance(obj, str) and stderr_text):
-            return outputs
-
-        obj_type = type(obj).__name__
-        obj_module = obj.__class__.__module__
-        full_type = f"{obj_module}.{obj_type}" if obj_module != "builtins" else obj_type
-
-        EDITOR_MAP = {
-            "pandas.core.frame.DataFrame": "output_data",
-            "matplotlib.figure.Figure": "output_image",
-            "PIL.Image.Image": "output_image",
-            "plotly.graph_objs._figure.Figure": "output_image",
-            "str": "output_editor",
-            "Exception": "output_editor"
-        }
-
-        editor = EDITOR_MAP.get(full_type)
-
-        # 📊 table
-        if editor == "output_data":
-            obj_id = f"obj_{uuid.uuid4().hex}"
-            self.object_store[obj_id] = obj
-            html = obj.to_html(index=False)
-            out = new_output(
-                "display_data",
-                data={"text/html": html},
-                metadata={"object_type": obj_type, "editor": editor, "object_ref": obj_id}
-            )
-            outputs.append(out)
-            callback(out)
-
-        # 🖼️ image
-        elif editor == "output_image":
-            buf = io.BytesIO()
-            try:
-                if hasattr(obj, "savefig"):
-                    obj.savefig(buf, format="png")
-                    if hasattr(obj, "close"):
-                        obj.close()
-                elif hasattr(obj, "save"):
-                    obj.save(buf, format="PNG")
+    def run(self):
+        try:
+            result = self.kernel.inspect_namespace_diff(self.previous)
+        except Exception as e:
+            print(f"[NamespaceDiffWorker] {e}")
+            result = None
+        self.diff_ready.emit(result)
+
+        sizes = {}
+        if result is not None:
+            estimator = SizeEstimator(deadline=time.perf_counter() + self.size_budget)
+            # largest shallow objects first, so the budget goes where it matters
+            rows = sorted(result["added"] + result["changed"], key=lambda r: r["size"], reverse=True)
+            for row in rows:
+                value = row["value"]
+                if estimator.expired():
+                    size, exact = row["size"], False
                 else:
-                    return outputs
-                buf.seek(0)
-                encoded = base64.b64encode(buf.read()).decode("utf-8")
-                buf.close()
-                out = new_output(
-                    "display_data",
-                    data={"image/png": encoded},
-                    metadata={"object_type": obj_type, "editor": editor}
-                )
-                outputs.append(out)
-                callback(out)
-            except Exception:
-                return outputs
-
-        return outputs
-
-    def inspect_all_user_attributes(self, shell):
-        user_ns = shell.user_ns
-        results = []
-
-        def extract_known_dtypes(user_ns):
-            types_set = set()
-            for name, obj in user_ns.items():
-                if name.startswith("_"):
-                    continue
-                try:
-                    t = type(obj)
-                    mod = t.__module__
-                    name = t.__name__
-                    full = f"{mod}.{name}" if mod not in ("builtins", None) else name
-                    types_set.add(full)
-                except Exception:
-                    continue
-            return sorted(types_set)
-
-        def safe_size(obj):
-            try:
-                return sys.getsizeof(obj)
-            except Exception:
-                return 0
-
-        def full_type_name(obj):
-            try:
-                t = type(obj)
-                mod = t.__module__
-                name = t.__name__
-                return f"{mod}.{name}" if mod not in ("builtins", None) else name
-            except ReferenceError:
-                return "ReferenceError"
-
-        def is_supported(obj):
-            try:
-                return full_type_name(obj) in allowed_types
-            except ReferenceError:
-                return False
-
-        allowed_types = set(extract_known_dtypes(user_ns))
-
-        for name, obj in user_ns.items():
-            if name.startswith("_"):
-                continue
-            if name in {"In", "Out", "get_ipython", "exit", "quit", "__builtins__", "open"}:
-                continue
-            if not is_supported(obj):
-                continue
-
-            results.append({
-                "name": name,
-                "type": type(obj).__name__,
-                "size": safe_size(obj),
-                "value": obj  
-            })
-
-            try:
-                # User-defined class
-                if inspect.isclass(obj) and getattr(obj, "__module__", None) == "__main__":
-                    for attr_name, attr_value in vars(obj).items():
-                        if attr_name.startswith("_"):
-                            continue
-                        if not is_supported(attr_value):
-                            continue
-                        results.append({
-                            "name": f"{name}.{attr_name}",
-                            "type": type(attr_value).__name__,
-                            "size": safe_size(attr_value),
-                            "value": attr_value
-                        })
-
-                # Instance of user-defined class
-                elif hasattr(obj, "__class__") and getattr(obj.__class__, "__module__", None) == "__main__":
-                    for attr_name, attr_value in vars(obj).items():
-                        if attr_name.startswith("_"):
-                            continue
-                        if not is_supported(attr_value):
-                            continue
-                        results.append({
-                            "name": f"{name}.{attr_name}",
-                            "type": type(attr_value).__name__,
-                            "size": safe_size(attr_value),
-                            "value": attr_value
-                        })
-            except ReferenceError:
-                pass
-
-        return results
+                    size, exact = estimator.estimate(value)
+                sizes[row["name"]] = (id(value), size, exact)
+        self.finished.emit(sizes)
 
 class WorkWindow(QFrame):
     focused_cell = None
+    LOAD_BATCH = 20  # cells built per event-loop turn while a notebook streams in
 
     def __init__(self, nb_content=None, file_path=None , status_l = None
-            , status_c = None , status_r = None  , mdi_area = None):
+            , status_c = None , status_r = None  , mdi_area = None , view = None):
         super().__init__()
 
         self.ipython_kernel = IPythonKernel()
         self.ipython_kernel.input_waiter = InputWaiter(self) # for cover input with dialog        
         self.file_path = file_path        
         self.nb_content = nb_content
+        # notebook level metadata (kernelspec, uranus.benchmarks, ...) kept across saves
+        self.notebook_metadata = dict(nb_content.metadata) if nb_content is not None and hasattr(nb_content, "metadata") else {}
+        self.benchmark_store = BenchmarkStore(self.notebook_metadata)
+        self.model = NotebookModel(self.notebook_metadata)  # cell order, sources and outputs, see snapshot()
+        self.execution_history = ExecutionHistory(file_path)
+        self.blob_store = BlobStore(file_path)
+        self.image_budget = ImageBudget(int(load_setting().get("Notebook Image Budget MB", 25)) * 1024 * 1024,
+                                        self.measure_image_bytes)
+        if nb_content is not None and hasattr(nb_content, "cells"):
+            self.blob_store.inline_notebook(nb_content)  # resolve sidecar image references
         self.mdi_area = mdi_area # Midwindow Mainwindow Original Window Container        
         self.status_l = status_l
         self.status_c = status_c
         self.status_r = status_r
 
         self.cell_widgets = []
+        self.cell_positions = {}  # cell -> index in cell_widgets, see index_of()
         self.outputs = []
-        self.original_sources = []
         self.deleted_cells_stack = []
+        self.pending_cells = None
+        self.pending_head = None  # cells above a restored view, built after it, see restore_view()
+        self.pending_total = 0
+        self.load_timer = QTimer(self)
+        self.load_timer.setSingleShot(True)
+        self.load_timer.timeout.connect(self.load_next_cells)
+        self.restoring = False  # pending_cells come from hibernate(), outputs are kept as they were
+        self.hibernated = False
+        self.hibernated_view = None  # view_state() of a hibernated window
+        self.reserved_heights = None  # cached heights of the cells still streaming in, see restore_view()
+        self.reserved_next = 0  # position in reserved_heights of the next streamed cell, edits do not shift it
+        self.restore_scroll = None
+        self.restore_focus = None  # index of a focused cell outside the restored viewport
+        self.pending_spacer = QSpacerItem(20, 0, QSizePolicy.Minimum, QSizePolicy.Fixed)  # their room
+        self.last_active = time.monotonic()
 
         self.execution_in_progress = False        
+        self.namespace_snapshot = None
+        self.namespace_thread = None
+        self.namespace_refresh_pending = False
 
         self.detached = False
         self.detached_window = None
@@ -629,6 +376,7 @@ class WorkWindow(QFrame):
         self.cell_container = QWidget()
         self.cell_layout = QVBoxLayout(self.cell_container)
         self.cell_layout.setAlignment(Qt.AlignTop)
+        self.layout_margin_top = self.cell_layout.contentsMargins().top()
         self.scroll_area.setWidget(self.cell_container)
 
         # --- Horizontal Layout: toolbar + scroll area ---
@@ -647,11 +395,12 @@ class WorkWindow(QFrame):
 
 
         # --- Load initial content ---
-        self.load_file(self.nb_content)
+        self.load_file(self.nb_content, view)  # view: a view_state() to restore, see restore_view()
 
         # fpr scrolling window more than half of page
         extra_scroll_space = QSpacerItem(20, 400, QSizePolicy.Minimum, QSizePolicy.Fixed)
         self.cell_layout.addItem(extra_scroll_space)
+        self.cell_layout.addItem(self.pending_spacer)
 
     def setup_top_toolbar_buttons(self):
         # Save ipynb File
@@ -755,11 +504,38 @@ class WorkWindow(QFrame):
                                 <span style='color:gray;'>Shortcut: <kbd>F9</kbd></span><br>
                                 Object And Variable List
                                 """)
-        memory.clicked.connect(self.variable_table)
+        memory.clicked.connect(lambda: self.variable_table())
         self.top_toolbar.addWidget(memory)
         self.top_toolbar.addSeparator()
 
 
+        # Memory Timeline
+        memory_timeline = QToolButton()
+        icon_path = os.path.join(os.path.dirname(__file__), "image", "graph.png")
+        memory_timeline.setIcon(QIcon(icon_path))
+        memory_timeline.setToolTip("""
+                                <b>Memory Timeline</b><br>
+                                RSS growth of each executed cell<br>
+                                <span style='color:gray;'>Enable "Memory Profiling" in Setting</span>
+                                """)
+        memory_timeline.clicked.connect(lambda: self.memory_timeline())
+        self.top_toolbar.addWidget(memory_timeline)
+        self.top_toolbar.addSeparator()
+
+
+        # Execution History Report
+        history_report = QToolButton()
+        icon_path = os.path.join(os.path.dirname(__file__), "image", "Chart.png")
+        history_report.setIcon(QIcon(icon_path))
+        history_report.setToolTip("""
+                                <b>Execution History</b><br>
+                                Runtime trend of every cell, regressions highlighted
+                                """)
+        history_report.clicked.connect(lambda: self.history_report())
+        self.top_toolbar.addWidget(history_report)
+        self.top_toolbar.addSeparator()
+
+
         # Memory Reset
         clear_memory = QToolButton()
         icon_path = os.path.join(os.path.dirname(__file__), "image", "clear.png")
@@ -883,20 +659,37 @@ class WorkWindow(QFrame):
     def add_cell(self, editor_type=None, nb_cell={},
         src_content=None, border_color=None,
         origin="uranus", outputs=None, height=0):
-        cell = Cell(
+        self.finish_loading()
+        cell = self.create_cell(
             editor_type=editor_type,
             src_content=src_content,
             border_color=border_color,
-            kernel=self.ipython_kernel,
-            notify_done=self.execution_done,
             origin=origin,
             outputs=outputs,
-            status_c=self.status_c,
-            status_r=self.status_r,
             height=height,
             nb_cell=nb_cell
         )
 
+        self.cell_widgets.append(cell)  # cell append to list of cells
+        self.cell_positions[cell] = len(self.cell_widgets) - 1
+        self.model.append(cell.model)
+        self.cell_layout.insertWidget(len(self.cell_widgets) - 1, cell)  # before the trailing spacers
+        self.set_focus(cell)  # set cell focused
+
+        return cell
+
+    def create_cell(self, **kwargs):
+        cell = Cell(
+            kernel=self.ipython_kernel,
+            notify_done=self.execution_done,
+            status_c=self.status_c,
+            status_r=self.status_r,
+            benchmark_store=self.benchmark_store,
+            execution_history=self.execution_history,
+            image_budget=self.image_budget,
+            **kwargs
+        )
+
         # Mouse Event Handler
         cell.clicked.connect(lambda c=cell: self.set_focus(c))
         cell.doc_editor_clicked.connect(lambda c=cell: self.set_focus(c))
@@ -904,68 +697,88 @@ class WorkWindow(QFrame):
         cell.markdown_editor_clicked.connect(lambda c=cell: self.set_focus(c))
         cell.markdown_editor_editor_clicked.connect(lambda c=cell: self.set_focus(c))
 
-        self.cell_widgets.append(cell)  # cell append to list of cells
-        self.cell_layout.addWidget(cell)  # for showing cell add cell to layout
-        self.set_focus(cell)  # set cell focused
-
         return cell
 
     def set_focus(self, cell):
-        # UnFocus Last Cell
-        if self.focused_cell and cell is not self.focused_cell and len(self.cell_widgets) > 1 :
-            self.focused_cell.border_color = self.focused_cell.border_color or self.focused_cell.bg_border_color_default
-            self.focused_cell.setStyleSheet(f"""
-                        QFrame {{
-                            border: 2px solid {self.focused_cell.border_color};
-                            border-radius: 5px;
-                            background-color: {self.focused_cell.bg_main_window};
-                            padding: 6px;
-                        }}""")           
-
-            if hasattr(self.focused_cell, 'output_data'):
-                self.focused_cell.output_data.setStyleSheet("border: 1px solid black; padding: 0px;")
-                if hasattr(self.focused_cell.output_data,'table'):
-                    self.focused_cell.output_data.table.setStyleSheet("border: 1px solid gray; padding: 0px;")
-                    self.focused_cell.output_data.table.horizontalHeader().setStyleSheet("border: 0px solid gray; padding: 0px;")
-
+        # focus is a flag repainted by the two cells involved, no stylesheet is touched
+        previous = self.focused_cell
+        if previous is not None and previous is not cell:
+            try:
+                previous.set_focused(False)
+            except RuntimeError:
+                pass  # deleted with delete_active_cell
 
         # Focus Current Cell  
         self.focused_cell = cell  
         # cell / totall cell in status bar
-        cell_indedx = self.cell_widgets.index(self.focused_cell)+1
+        cell_indedx = self.index_of(cell)+1
         self.status_c(f'[Cell: {cell_indedx} / {len(self.cell_widgets) }]')
 
         cell.border_color = cell.border_color or cell.bg_border_color_default
-        cell.setStyleSheet(f"""
-            QFrame {{
-                border: 5px solid {cell.border_color};
-                border-radius: 5px;
-                background-color: {cell.bg_main_window};
-                padding: 6px;
-            }}""")
-
-        if hasattr(cell, 'output_data'):
-            cell.output_data.setStyleSheet("border: 1px solid black; padding: 0px;")
-            if hasattr(cell.output_data,'table'):
-                cell.output_data.table.setStyleSheet("border: 1px solid gray; padding: 0px;")
-                cell.output_data.table.horizontalHeader().setStyleSheet("border: 0px solid gray; padding: 0px;")
+        cell.set_focused(True)
+
+    def index_of(self, cell):
+        """
+        Position of `cell` in cell_widgets in O(1). Structural edits update
+        cell_positions through reindex(); a stale entry falls back to a full reindex.
+        """
+        index = self.cell_positions.get(cell)
+        if index is None or index >= len(self.cell_widgets) or self.cell_widgets[index] is not cell:
+            self.reindex()
+            index = self.cell_positions[cell]
+        return index
+
+    def reindex(self, start=0):
+        if start == 0:
+            self.cell_positions.clear()
+        for index in range(start, len(self.cell_widgets)):
+            self.cell_positions[self.cell_widgets[index]] = index
+
+    def benchmark_focus_latency(self, rounds=200):
+        """
+        Alternates focus between cells far apart and returns click-to-focus latency in
+        ms (set_focus plus the repaint it causes): {"mean", "p95", "max", "cells"}.
+        """
+        from PyQt5.QtWidgets import QApplication
+        if len(self.cell_widgets) < 2:
+            return None
+        timings = []
+        targets = (self.cell_widgets[0], self.cell_widgets[-1], self.cell_widgets[len(self.cell_widgets) // 2])
+        for i in range(rounds):
+            start = time.perf_counter()
+            self.set_focus(targets[i % len(targets)])
+            QApplication.processEvents()
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        return {
+            "mean": sum(timings) / len(timings),
+            "p95": timings[int(len(timings) * 0.95) - 1],
+            "max": timings[-1],
+            "cells": len(self.cell_widgets),
+        }
 
     def run_focused_cell(self):
         if not self.focused_cell:
             return
         # save File at First
         self.ipynb_format_save_file()
+        if self.focused_cell.editor_type != 'code':
+            return  # Cell.run() ignores other cells and would never call notify_done
         # deactivate run button
         self.status_c("")
         self.status_l(self.file_path)        
         self.run_btn.setEnabled(False)
         self.btn_run_all.setEnabled(False)
+        self.execution_in_progress = True
 
         def on_done():
             #print("[run_focused_cell] execution finished")
+            self.execution_in_progress = False
             self.run_btn.setEnabled(True)
             self.btn_run_all.setEnabled(True)
             self.variable_table(True)
+            self.memory_timeline(True)
+            self.history_report(True)
 
         self.focused_cell.notify_done = on_done
         self.focused_cell.run()
@@ -975,57 +788,35 @@ class WorkWindow(QFrame):
         self.set_focus(self.focused_cell)
 
     def add_cell_above(self):
+        self.finish_loading()  # cell indexes are only final once every streamed cell is in
         if not self.cell_widgets:
             return
 
         elif self.focused_cell:
-            index = self.cell_widgets.index(self.focused_cell)
-            cell = Cell(
-                kernel=self.ipython_kernel,
-                notify_done=self.execution_done,
-                origin="uranus"  ,
-                status_c = self.status_c ,
-                status_r = self.status_r,
-                nb_cell={}
-
-
-            )
-
-            cell.clicked.connect(lambda c=cell: self.set_focus(c))
-            cell.doc_editor_clicked.connect(lambda c=cell: self.set_focus(c))
-            cell.doc_editor_editor_clicked.connect(lambda c=cell: self.set_focus(c))
-            cell.markdown_editor_clicked.connect(lambda c=cell: self.set_focus(c))
-            cell.markdown_editor_editor_clicked.connect(lambda c=cell: self.set_focus(c))
+            index = self.index_of(self.focused_cell)
+            cell = self.create_cell(origin="uranus", nb_cell={})
 
             self.cell_widgets.insert(index, cell)
+            self.reindex(index)
+            self.model.insert(index, cell.model)
             self.cell_layout.insertWidget(index, cell)
             self.set_focus(cell)
 
     def add_cell_below(self):
         if self.debug:
             print('[WorkWindow->add_cell_below]')
+        self.finish_loading()
 
         if not self.cell_widgets:
             return
 
         elif self.focused_cell:
-            index = self.cell_widgets.index(self.focused_cell)
-            cell = Cell(
-                kernel=self.ipython_kernel,
-                notify_done=self.execution_done,
-                origin="uranus" ,
-                status_c = self.status_c ,
-                status_r = self.status_r,
-                nb_cell={}
-            )
-
-            cell.clicked.connect(lambda c=cell: self.set_focus(c))
-            cell.doc_editor_clicked.connect(lambda c=cell: self.set_focus(c))
-            cell.doc_editor_editor_clicked.connect(lambda c=cell: self.set_focus(c))
-            cell.markdown_editor_clicked.connect(lambda c=cell: self.set_focus(c))
-            cell.markdown_editor_editor_clicked.connect(lambda c=cell: self.set_focus(c))
+            index = self.index_of(self.focused_cell)
+            cell = self.create_cell(origin="uranus", nb_cell={})
 
             self.cell_widgets.insert(index + 1, cell)
+            self.reindex(index + 1)
+            self.model.insert(index + 1, cell.model)
             self.cell_layout.insertWidget(index + 1, cell)
             self.set_focus(cell)
 
@@ -1034,6 +825,7 @@ class WorkWindow(QFrame):
         context = {}
         if self.debug:
             print('[WorkWindow->delete_active_cell]')
+        self.finish_loading()
 
         if len(self.cell_widgets) <= 1:
             self.status_l(
@@ -1043,7 +835,7 @@ class WorkWindow(QFrame):
             return
 
         if self.focused_cell and self.cell_widgets:
-            index = self.cell_widgets.index(self.focused_cell)
+            index = self.index_of(self.focused_cell)
 
             if self.focused_cell.editor_type == 'code':
                 content = self.focused_cell.editor.toPlainText()
@@ -1071,7 +863,10 @@ class WorkWindow(QFrame):
 
             self.cell_layout.removeWidget(self.focused_cell)
             self.focused_cell.deleteLater()
-            self.cell_widgets.remove(self.focused_cell)
+            del self.cell_widgets[index]
+            self.cell_positions.pop(self.focused_cell, None)
+            self.reindex(index)
+            self.model.remove(index)
 
             if self.cell_widgets:
                 new_index = max(0, index - 1)
@@ -1095,101 +890,376 @@ class WorkWindow(QFrame):
         return None
 
     def ipynb_format_save_file(self , temp = False):
+        snapshot = self.snapshot()
         open(self.temp_path, "w").close()    
-        cells = []
-        for cell in self.cell_widgets:
-            if cell.editor_type == "code":
-                cells.append(cell.get_nb_code_cell())
-                self.original_sources.append(cell.editor.toPlainText().strip())
-            elif cell.editor_type == "doc_editor":
-                cells.append(cell.get_nb_doc_editor_cell())
-                self.original_sources.append(cell.d_editor.editor.toHtml().strip())
-
-            elif cell.editor_type == "markdown":
-                cells.append(cell.get_nb_markdown_cell())
-                self.original_sources.append(cell.m_editor.editor.toPlainText())
 
-
-
-        if cells :
-            nb = nbformat.v4.new_notebook()        
-            nb["cells"] = cells
+        if snapshot.cells :
+            nb = snapshot.to_notebook()
+            cells = nb.cells
 
             file_path = self.temp_path if temp else self.file_path
 
+            # re-measure while the sources are at hand, so deleted images free their budget
+            self.image_budget.refresh(sum(ImageBudget.count_html(c.source) for c in cells if c.cell_type != "code"))
+
             if file_path:
+                # the temp copy is externalized too, so is_notebook_modified() compares like with like,
+                # but only a real save writes blobs
+                used_blobs = self.externalize_images(nb, write=not temp)
 
                 with open(file_path, "w", encoding="utf-8") as f:
                     nbformat.write(nb, f)
 
                 if not temp :                
+                    if used_blobs is not None:
+                        self.blob_store.prune(used_blobs)
                     self.status_l('Saved To : '+self.file_path)
 
-    def load_file(self, content):
+    def snapshot(self):
+        """
+        Immutable snapshot of the notebook (NotebookModel.snapshot) for saving, search
+        or diff off the GUI thread. Only cells edited since the last snapshot are read
+        back from their editors.
+        """
+        self.finish_loading()
+        for cell in self.cell_widgets:
+            cell.sync_model()
+        return self.model.snapshot()
+
+    def measure_image_bytes(self):
+        return sum(ImageBudget.count_html(cell.d_editor.editor.toHtml())
+                   for cell in self.cell_widgets if cell.editor_type == "doc_editor" and hasattr(cell, "d_editor"))
+
+    def externalize_images(self, nb, write=True):
+        if not self.file_path or not load_setting().get("Image Sidecar Storage", False):
+            return None
+        try:
+            return self.blob_store.externalize_notebook(nb, write)
+        except Exception as e:
+            print(f"[WorkWindow->externalize_images] {e}, saving images inline")
+            return None
+
+    def export_inline_file(self):
+        """
+        Writes a copy with every image inlined as base64 (plain Jupyter format),
+        whatever the Image Sidecar Storage setting is.
+        """
+        base = os.path.splitext(self.file_path)[0] + "_inline.ipynb" if self.file_path else ""
+        export_path, _ = QFileDialog.getSaveFileName(self, "Export Notebook (Inline Images)", base, "Jupyter Notebook (*.ipynb)")
+        if not export_path:
+            return
+
+        nb = self.snapshot().to_notebook()
+
+        try:
+            with open(export_path, "w", encoding="utf-8") as f:
+                nbformat.write(nb, f)
+        except Exception as e:
+            QMessageBox.warning(self, "Export Error", f"Could not export file:\n{e}")
+        else:
+            self.status_l("Exported To: " + export_path)
+
+    def load_file(self, content, view=None):
         if not content or not isinstance(content.cells, list):
             self.add_cell(origin='uranus')
             return
 
         #self.content = content
         self.cell_widgets.clear()
+        self.cell_positions.clear()
+        self.model.clear()
 
         # WorkWindow.load_file
+        # the first screen of cells is built right away, the rest streams in from the event loop
+        self.pending_cells = iter(content.cells)
+        self.pending_total = len(content.cells)
+        if view:
+            self.restore_view(view["focus"], view["scroll"], view.get("heights"), view.get("viewport", 0))
+        else:
+            self.load_next_cells()
+            if self.cell_widgets:
+                self.set_focus(self.cell_widgets[0])
 
-        for cell_data in content.cells:
-            metadata = cell_data["metadata"]
-            origin = metadata.get('uranus',{}).get('origin' , 'jupyter') # after Save all Jupyter Notebook Get Jupyter Origin
+        self.cell_layout.addItem(QSpacerItem(20, 400, QSizePolicy.Minimum, QSizePolicy.Fixed))
 
+    def load_next_cells(self):
+        if self.pending_cells is None and not self.pending_head:
+            return
+        head = []
+        for _ in range(self.LOAD_BATCH):
+            cell_data = next(self.pending_cells, None) if self.pending_cells is not None else None
+            if cell_data is not None:
+                if self.reserved_heights:
+                    self.load_reserved_cell(cell_data, self.reserved_next)
+                    self.reserved_next += 1
+                else:
+                    self.load_cell(cell_data, keep_outputs=self.restoring)
+                continue
+            self.pending_cells = None
+            if not self.pending_head:
+                break
+            # cells above a restored view, nearest first
+            head.append((self.pending_head.pop(), len(self.pending_head)))
+
+        for cell_data, position in head:
+            # takes the place of its reserved height, what is on screen does not move
+            self.load_reserved_cell(cell_data, position, index=0)
+        if head:
+            self.reindex()
+        self.reserve_pending_height()
+
+        if self.pending_cells is None and not self.pending_head:
+            self.restoring = False
+            if self.restore_focus is not None and self.restore_focus < len(self.cell_widgets):
+                self.set_focus(self.cell_widgets[self.restore_focus])
+            self.restore_focus = None
+            if self.reserved_heights:
+                QTimer.singleShot(4 * ReflowScheduler.FRAME_MS, self.release_restored_heights)
+            if self.pending_total > self.LOAD_BATCH:
+                self.status_r(f"Loaded {len(self.cell_widgets)} cells")
+            return
+        self.status_r(f"Loading cells {len(self.cell_widgets)} / {self.pending_total}")
+        self.load_timer.start(0)
+
+    def finish_loading(self):
+        # whole-notebook operations (save, run all, ...) need every cell
+        self.load_timer.stop()
+        while self.pending_cells is not None or self.pending_head:
+            self.load_next_cells()
+        self.load_timer.stop()
+
+    def hibernate(self):
+        """
+        Releases the cell widgets (editors, highlighters, decoded images, tables) of a
+        notebook nobody is looking at; only its NotebookModel is kept.
+        The kernel and its namespace stay alive, so tables and arrays shown from the
+        kernel's object_store come back as they were. Returns True if the window was
+        hibernated; busy, still loading, detached or already hibernated windows are
+        left alone.
+        """
+        if self.hibernated or self.execution_in_progress or self.detached or not self.cell_widgets:
+            return False
+        if self.pending_cells is not None or self.pending_head:
+            return False
+        self.snapshot()  # the model is all that is left afterwards
+
+        self.hibernated_view = self.view_state()
+        self.hibernated = True
+
+        for cell in self.cell_widgets:
+            self.cell_layout.removeWidget(cell)
+            cell.deleteLater()
+        self.cell_widgets.clear()
+        self.cell_positions.clear()
+        self.focused_cell = None
+        return True
+
+    def wake(self):
+        """Rebuilds the cells of a hibernated window; the visible part first, the rest streams in."""
+        if not self.hibernated:
+            return
+        view = self.hibernated_view
+        self.hibernated, self.hibernated_view = False, None
+
+        # cells come back with their uid, so their models keep the same ids
+        nb_cells = [cell.to_nbformat(all_outputs=True) for cell in self.model.snapshot().cells]
+        self.model.clear()
+        self.pending_cells = iter(nb_cells)
+        self.pending_total = len(nb_cells)
+        self.restoring = True
+        self.restore_view(view["focus"], view["scroll"], view["heights"], view["viewport"])
+
+    def view_state(self):
+        """
+        {"focus", "scroll", "viewport", "heights"}: focused cell index, scroll position,
+        viewport height and the height of every cell (None until all cells are
+        built), for restore_view().
+        """
+        if self.hibernated:
+            return dict(self.hibernated_view)
+        focus = self.index_of(self.focused_cell) if self.focused_cell in self.cell_positions else 0
+        loaded = self.pending_cells is None and not self.pending_head
+        heights = [cell.height() for cell in self.cell_widgets] if loaded else None
+        return {"focus": focus + len(self.pending_head or ()), "scroll": self.scroll_area.verticalScrollBar().value(),
+                "viewport": self.scroll_area.viewport().height(), "heights": heights}
+
+    def restore_view(self, focus, scroll, heights=None, viewport=0):
+        """
+        Brings back a view_state() before any cell of the pending notebook is built.
+
+        With the cached `heights` of the same cells, only the cells in the viewport
+        at `scroll` are built right away, at their cached height; the space of all
+        other cells is reserved, so the scroll position applies at once. The cells
+        below then stream in as usual and the ones above are inserted from the
+        nearest up, with the view anchored. Without heights the cells up to the
+        focused one are built and the scroll position is applied once they laid out.
+        """
+        bar = self.scroll_area.verticalScrollBar()
+        if not heights or len(heights) != self.pending_total or self.cell_widgets:
+            while self.pending_cells is not None and len(self.cell_widgets) <= focus:
+                self.load_next_cells()
+            if self.cell_widgets:
+                self.set_focus(self.cell_widgets[min(focus, len(self.cell_widgets) - 1)])
+            # after the scheduled reflows have given the cells their heights
+            QTimer.singleShot(2 * ReflowScheduler.FRAME_MS, lambda: bar.setValue(scroll))
+            return
 
-            if cell_data.cell_type == "code" : 
-                editor_type = "code" 
-            elif cell_data.cell_type == "markdown" and origin == 'uranus':
-                editor_type = "doc_editor" 
+        spacing = self.cell_layout.spacing()
+        # a window not shown yet has no viewport height of its own
+        bottom = scroll + max(self.scroll_area.viewport().height(), viewport)
+        first, last, top = 0, 0, self.cell_layout.contentsMargins().top()
+        for index, height in enumerate(heights):
+            if top + height <= scroll:
+                first = index + 1
+            if top > bottom:
+                break
+            last = index
+            top += height + spacing
+        first = min(first, last)
+
+        nb_cells = list(self.pending_cells)
+        self.pending_head = nb_cells[:first]
+        self.reserved_heights = heights
+        for position in range(first, last + 1):
+            self.load_reserved_cell(nb_cells[position], position)
+        self.pending_cells = iter(nb_cells[last + 1:])
+        self.reserved_next = last + 1
+        self.reserve_pending_height()
+
+        focused = focus - first
+        if 0 <= focused < len(self.cell_widgets):
+            self.set_focus(self.cell_widgets[focused])
+        else:
+            self.set_focus(self.cell_widgets[0])
+            self.restore_focus = focus  # once every cell is built
+        # applied as soon as the scroll range, reserved space included, reaches it
+        if self.restore_scroll is None:  # still connected if an earlier target was never reached
+            bar.rangeChanged.connect(self.apply_restore_scroll)
+        self.restore_scroll = scroll
+        self.apply_restore_scroll()
+        self.load_timer.start(0)
+
+    def apply_restore_scroll(self, *_):
+        bar = self.scroll_area.verticalScrollBar()
+        if self.restore_scroll is None or bar.maximum() < self.restore_scroll:
+            return
+        bar.setValue(self.restore_scroll)
+        self.cancel_restore_scroll()
+
+    def cancel_restore_scroll(self):
+        if self.restore_scroll is not None:
+            self.restore_scroll = None
+            self.scroll_area.verticalScrollBar().rangeChanged.disconnect(self.apply_restore_scroll)
+
+    def reserve_pending_height(self):
+        """Holds the cached height of the cells not built yet: above them as layout margin, below as spacer."""
+        above = below = 0
+        if self.reserved_heights:
+            spacing = self.cell_layout.spacing()
+            head = len(self.pending_head or ())
+            above = sum(height + spacing for height in self.reserved_heights[:head])
+            if self.pending_cells is not None:
+                below = sum(height + spacing for height in self.reserved_heights[self.reserved_next:])
+        if self.pending_spacer.sizeHint().height() != below:
+            self.pending_spacer.changeSize(20, below, QSizePolicy.Minimum, QSizePolicy.Fixed)
+            self.cell_layout.invalidate()
+        margins = self.cell_layout.contentsMargins()
+        if margins.top() != self.layout_margin_top + above:
+            self.cell_layout.setContentsMargins(margins.left(), self.layout_margin_top + above,
+                                                margins.right(), margins.bottom())
+
+    def release_restored_heights(self):
+        # cells built at their cached height take their own again, the view stays anchored
+        if self.reserved_heights is None:
+            return
+        self.reserved_heights = None
+        self.cancel_restore_scroll()  # the real heights are coming, a target not reached by now is stale
+        bar = self.scroll_area.verticalScrollBar()
+        # the first cell in view keeps its place on screen
+        anchor = next((cell for cell in self.cell_widgets if cell.y() + cell.height() > bar.value()), None)
+        offset = anchor.y() - bar.value() if anchor is not None else 0
+        for cell in self.cell_widgets:
+            cell.setMinimumHeight(0)
+            cell.setMaximumHeight(QWIDGETSIZE_MAX)
+        self.cell_layout.invalidate()  # the scroll area resizes the container only on a full relayout
+        if anchor is not None:
+            QTimer.singleShot(2 * ReflowScheduler.FRAME_MS,
+                              lambda: bar.setValue(anchor.y() - offset) if anchor in self.cell_positions else None)
 
-            elif cell_data.cell_type == "markdown" and origin != 'uranus':
-                editor_type = 'markdown'                
+    def load_cell(self, cell_data, keep_outputs=False, index=None):
+        metadata = cell_data["metadata"]
+        origin = metadata.get('uranus',{}).get('origin' , 'jupyter') # after Save all Jupyter Notebook Get Jupyter Origin
 
 
+        if cell_data.cell_type == "code" : 
+            editor_type = "code" 
+        elif cell_data.cell_type == "markdown" and origin == 'uranus':
+            editor_type = "doc_editor" 
 
-            source = cell_data.source            
-            border_color = metadata.get("bg")
-            height = metadata.get('height', 0)
-            outputs = None
+        elif cell_data.cell_type == "markdown" and origin != 'uranus':
+            editor_type = 'markdown'                
 
-            if editor_type == "code" and hasattr(cell_data, "outputs"):
-                outputs = [
-                    out for out in cell_data.outputs
-                    if out.output_type in ("stream", "error") or (
-                        out.output_type == "display_data" and out.metadata.get("editor") == "output_image"
-                    )
-                ]
 
-            self.add_cell(
-                editor_type=editor_type,
-                src_content=source,
-                border_color=border_color,
-                origin=origin,
-                outputs=outputs,
-                height=height,
-                nb_cell=cell_data  
-            )
 
-        if self.cell_widgets:
-            self.set_focus(self.cell_widgets[-1])
+        source = cell_data.source            
+        border_color = metadata.get("bg")
+        height = metadata.get('height', 0)
+        outputs = None
 
-        self.cell_layout.addItem(QSpacerItem(20, 400, QSizePolicy.Minimum, QSizePolicy.Fixed))
+        if editor_type == "code" and keep_outputs:
+            outputs = list(cell_data.outputs)
+        elif editor_type == "code" and hasattr(cell_data, "outputs"):
+            outputs = [
+                out for out in cell_data.outputs
+                if out.output_type in ("stream", "error") or (
+                    out.output_type == "display_data" and out.metadata.get("editor") == "output_image"
+                )
+            ]
+
+        cell = self.create_cell(
+            editor_type=editor_type,
+            src_content=source,
+            border_color=border_color,
+            origin=origin,
+            outputs=outputs,
+            height=height,
+            nb_cell=cell_data  
+        )
+        if index is not None:
+            # above a restored view; the caller reindexes after the batch
+            self.cell_layout.insertWidget(index, cell)
+            self.cell_widgets.insert(index, cell)
+            self.model.insert(index, cell.model)
+            return cell
+        # cells precede the trailing spacers in the layout
+        self.cell_layout.insertWidget(len(self.cell_widgets), cell)
+        self.cell_widgets.append(cell)
+        self.cell_positions[cell] = len(self.cell_widgets) - 1
+        self.model.append(cell.model)
+        return cell
+
+    def load_reserved_cell(self, cell_data, position, index=None):
+        # at its cached height until release_restored_heights(), so nothing on screen moves
+        cell = self.load_cell(cell_data, keep_outputs=self.restoring, index=index)
+        cell.setFixedHeight(self.reserved_heights[position])
+        cell.show()  # the layout shows new widgets only on the next event pass and counts hidden ones as empty
 
     def move_cell_up(self):
         if self.debug: print('[WorkWindow->move_cell_up]')
+        self.finish_loading()
         if self.focused_cell and self.cell_widgets:
-            index = self.cell_widgets.index(self.focused_cell)
+            index = self.index_of(self.focused_cell)
             if index > 0:
                 self.cell_widgets[index], self.cell_widgets[index - 1] = self.cell_widgets[index - 1], \
                     self.cell_widgets[index]
+                self.reindex(index - 1)
+                self.model.move(index, index - 1)
                 self.cell_layout.removeWidget(self.focused_cell)
                 self.cell_layout.insertWidget(index - 1, self.focused_cell)
                 self.set_focus(self.focused_cell)
 
     def undo_delete_cell(self):
+        self.finish_loading()
         if not self.deleted_cells_stack:
             return
 
@@ -1202,37 +1272,30 @@ class WorkWindow(QFrame):
         nb_cell = cell_info['nb_cell']
 
 
-        cell = Cell(
+        cell = self.create_cell(
             editor_type=cell_type,
             src_content=source,
             border_color=color,
-            kernel=self.ipython_kernel,
-            notify_done=self.execution_done,
-            origin = origin  ,
-            status_c = self.status_c ,
-            status_r = self.status_r,
-            nb_cell = nb_cell
-
-
+            origin=origin,
+            nb_cell=nb_cell
         )
 
-        cell.clicked.connect(lambda c=cell: self.set_focus(c))
-        cell.doc_editor_clicked.connect(lambda c=cell: self.set_focus(c))
-        cell.doc_editor_editor_clicked.connect(lambda c=cell: self.set_focus(c))
-        cell.markdown_editor_clicked.connect(lambda c=cell: self.set_focus(c))
-        cell.markdown_editor_editor_clicked.connect(lambda c=cell: self.set_focus(c))
-
         self.cell_widgets.insert(index, cell)
+        self.reindex(index)
+        self.model.insert(index, cell.model)
         self.cell_layout.insertWidget(index, cell)
         self.set_focus(cell)
 
     def move_cell_down(self):
         if self.debug: print('[WorkWindow->move_cell_down]')
+        self.finish_loading()
         if self.focused_cell and self.cell_widgets:
-            index = self.cell_widgets.index(self.focused_cell)
+            index = self.index_of(self.focused_cell)
             if index < len(self.cell_widgets) - 1:
                 self.cell_widgets[index], self.cell_widgets[index + 1] = self.cell_widgets[index + 1], \
                 self.cell_widgets[index]
+                self.reindex(index)
+                self.model.move(index, index + 1)
                 self.cell_layout.removeWidget(self.focused_cell)
                 self.cell_layout.insertWidget(index + 1, self.focused_cell)
                 self.set_focus(self.focused_cell)
@@ -1243,11 +1306,20 @@ class WorkWindow(QFrame):
 
         self.run_btn.setEnabled(False)
         self.btn_run_all.setEnabled(False)
+        self.execution_in_progress = True
 
-        for cell in self.cell_widgets:
-            if cell.editor_type == "code":
-                self.set_focus(cell)
-                self.run_cell_blocking(cell)
+        # "Notebook Timeout Seconds" bounds the whole run; cells left when it expires are skipped
+        deadline = ResourceLimits.from_settings(load_setting()).notebook_deadline()
+        try:
+            for cell in list(self.cell_widgets):
+                if cell.editor_type == "code":
+                    if deadline and time.monotonic() > deadline:
+                        self.status_l("Run All stopped: notebook time limit reached")
+                        break
+                    self.set_focus(cell)
+                    self.run_cell_blocking(cell, deadline)
+        finally:
+            self.execution_in_progress = False
 
         self.run_btn.setEnabled(True)
         self.btn_run_all.setEnabled(True)
@@ -1276,26 +1348,26 @@ class WorkWindow(QFrame):
         if not new_path:
             return  # کاربر لغو کرده
 
-        cells = []
-        for cell in self.cell_widgets:
-            if cell.editor_type == "code":
-                cells.append(cell.get_nb_code_cell())
-            elif cell.editor_type == "doc_editor":
-                cells.append(cell.get_nb_doc_editor_cell())
-
-        nb = nbformat.v4.new_notebook()
-        nb["cells"] = cells
+        nb = self.snapshot().to_notebook()
 
+        old_path = self.file_path
+        self.file_path = new_path
+        self.blob_store.set_notebook_path(new_path)
         try:
+            used_blobs = self.externalize_images(nb)
             with open(new_path, "w", encoding="utf-8") as f:
                 nbformat.write(nb, f)
         except Exception as e:
+            self.file_path = old_path
+            self.blob_store.set_notebook_path(old_path)
             QMessageBox.warning(self, "Save Error", f"Could not save file:\n{e}")
         else:
-            self.file_path = new_path
+            if used_blobs is not None:
+                self.blob_store.prune(used_blobs)
+            self.execution_history.set_notebook_path(new_path)
             self.status_l("Saved As: " + new_path)
 
-    def run_cell_blocking(self, cell):
+    def run_cell_blocking(self, cell, deadline=None):
         loop = QEventLoop()
 
         def on_done():
@@ -1303,24 +1375,91 @@ class WorkWindow(QFrame):
             loop.quit()
 
         cell.notify_done = on_done
-        cell.run()
+        cell.run(deadline)
         loop.exec_()
 
     def variable_table(self, refresh=False):
-        new_data = self.ipython_kernel.inspect_all_user_attributes(self.ipython_kernel.shell)
+        inspector_open = hasattr(self, 'obj_table_window') and self.obj_table_window.isVisible()
+        if refresh and not inspector_open:
+            return  # nobody is looking, skip the namespace walk entirely
 
-        if not new_data  :
-            self.status_c(" No Data For Showing In Table " )
+        if self.namespace_thread is not None:
+            # a diff is already running; refresh once more when it is done
+            self.namespace_refresh_pending = self.namespace_refresh_pending or refresh
             return
 
-        if hasattr(self, 'obj_table_window') and self.obj_table_window.isVisible() and refresh:
+        previous = self.namespace_snapshot if refresh else None
+        self.namespace_worker = NamespaceDiffWorker(self.ipython_kernel, previous)
+        self.namespace_thread = QThread(self)
+        self.namespace_worker.moveToThread(self.namespace_thread)
+        self.namespace_thread.started.connect(self.namespace_worker.run)
+        self.namespace_worker.diff_ready.connect(lambda result, r=refresh: self.namespace_diff_ready(result, r))
+        self.namespace_worker.finished.connect(self.namespace_sizes_ready)
+        self.namespace_worker.finished.connect(self.namespace_thread.quit)
+        self.namespace_thread.finished.connect(self.namespace_thread.deleteLater)
+        self.namespace_thread.start()
+
+    def namespace_diff_ready(self, result, refresh):
+        if result is None:
+            return
 
+        self.namespace_snapshot = result["snapshot"]
+        inspector_open = hasattr(self, 'obj_table_window') and self.obj_table_window.isVisible()
 
-            self.obj_table_window.add_objects(new_data)
-        elif not refresh:
+        if refresh and inspector_open:
+            self.obj_table_window.apply_diff(result["added"], result["removed"], result["changed"])
 
+        elif not refresh:
+            if not result["added"]:
+                self.status_c(" No Data For Showing In Table " )
+                return
             self.obj_table_window = ObjectInspectorWindow(file_name=self.name_only)
-            self.obj_table_window.add_objects(new_data)
+            self.obj_table_window.add_objects(result["added"])
+
+    def namespace_sizes_ready(self, sizes):
+        self.namespace_thread.quit()
+        self.namespace_thread.wait()
+        self.namespace_thread = None
+
+        if sizes and hasattr(self, 'obj_table_window') and self.obj_table_window.isVisible():
+            self.obj_table_window.update_sizes(sizes)
+
+        if self.namespace_refresh_pending:
+            self.namespace_refresh_pending = False
+            self.variable_table(True)
+
+    def memory_timeline(self, refresh=False):
+        entries = []
+        for index, cell in enumerate(self.cell_widgets):
+            if cell.editor_type == 'code' and cell.memory_stats:
+                entries.append(dict(cell.memory_stats, cell=index + 1))
+
+        if hasattr(self, 'memory_timeline_window') and self.memory_timeline_window.isVisible() and refresh:
+            self.memory_timeline_window.add_entries(entries)
+
+        elif not refresh:
+            if not entries:
+                self.status_c(" No Memory Statistics Yet - Enable Memory Profiling In Setting And Run A Cell ")
+            self.memory_timeline_window = MemoryTimelineWindow(file_name=self.name_only)
+            self.memory_timeline_window.add_entries(entries)
+
+    def history_report(self, refresh=False):
+        labels = {}
+        for index, cell in enumerate(self.cell_widgets):
+            if cell.editor_type == 'code':
+                labels[cell.cell_uid] = f"Cell {index + 1}"
+
+        rows = []
+        for row in self.execution_history.regressions():
+            row["label"] = labels.get(row["cell"], "deleted cell")
+            rows.append(row)
+
+        if hasattr(self, 'history_report_window') and self.history_report_window.isVisible() and refresh:
+            self.history_report_window.add_rows(rows)
+
+        elif not refresh:
+            self.history_report_window = HistoryReportWindow(file_name=self.name_only)
+            self.history_report_window.add_rows(rows)
 
     def closeEvent(self, event):
             if self.fake_close :
@@ -1497,4 +1636,17 @@ class WorkWindow(QFrame):
 
         if self.focused_cell and hasattr(self.focused_cell, 'runner'):
             runner = self.focused_cell.runner
-            runner.stop()    
\ No newline at end of file
+            runner.stop()    
+
+
+if __name__ == "__main__":
+    # click-to-focus latency:  python WorkWindow.py [cells]
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    nb = nbformat.v4.new_notebook(cells=[nbformat.v4.new_code_cell(f"x = {i}\nprint(x)") for i in range(count)])
+    window = WorkWindow(nb_content=nb, status_l=print, status_c=lambda text: None, status_r=lambda text: None)
+    window.finish_loading()
+    window.show()
+    app.processEvents()
+    print({key: round(value, 3) for key, value in window.benchmark_focus_latency().items()})
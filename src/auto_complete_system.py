@@ -1,12 +1,12 @@
 import  jedi
-from PyQt5.QtGui import  QTextCursor, QTextCursor,QKeySequence , QColor 
+from PyQt5 import sip
+from PyQt5.QtGui import QTextCursor, QColor
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtWidgets import (
     QFrame,
     QListWidget,
     QListWidgetItem,
     QVBoxLayout,
-    QShortcut,
     QLabel,
     
 )
@@ -14,12 +14,20 @@ from PyQt5.QtWidgets import (
 
 
 class AutoCompleteSystem(QFrame):
+    """
+    Completion popup shared by every CodeEditor and PyCodeEditor.
 
-    def __init__(self, editor):
-        super().__init__(editor)
+    One instance exists per application (see completion_controller()); editors
+    attach() it when they get focus, so the popup, the doc popup, the debounce
+    timer and the textChanged connection exist once instead of once per cell.
+    Editors handle Ctrl+Space themselves and call activate_and_show().
+    """
+
+    def __init__(self):
+        super().__init__()
         self.setWindowFlags(Qt.WindowType.ToolTip | Qt.WindowType.WindowStaysOnTopHint)
 
-        self.editor = editor
+        self.editor = None
         self.active = False
         self.completions_cache = []
 
@@ -58,7 +66,7 @@ class AutoCompleteSystem(QFrame):
         layout.addWidget(self.list_widget)
 
         # Documentation popup
-        self.doc_popup = QFrame(editor)
+        self.doc_popup = QFrame()
         self.doc_popup.setWindowFlags(Qt.WindowType.ToolTip)
         self.doc_popup.setStyleSheet("""
             QFrame {
@@ -82,18 +90,38 @@ class AutoCompleteSystem(QFrame):
         doc_layout.setContentsMargins(4, 4, 4, 4)
         doc_layout.addWidget(self.doc_label)
 
-        self.text_change_timer = QTimer()
+        self.text_change_timer = QTimer(self)
         self.text_change_timer.setSingleShot(True)
         self.text_change_timer.timeout.connect(self.on_text_changed_delayed)
-        self.editor.textChanged.connect(self.text_change_timer.start)
-
-        # Ctrl+Space برای فعال‌سازی دستی
-        QShortcut(QKeySequence("Ctrl+Space"), editor, self.activate_and_show)
 
         self.hide()
         self.doc_popup.hide()
 
+    def attach(self, editor):
+        if editor is self.editor:
+            return
+        self.detach()
+        self.editor = editor
+        editor.textChanged.connect(self.text_change_timer.start)
+
+    def detach(self, editor=None):
+        if self.editor is None or (editor is not None and editor is not self.editor):
+            return
+        self.deactivate()
+        self.text_change_timer.stop()
+        if not sip.isdeleted(self.editor):
+            try:
+                self.editor.textChanged.disconnect(self.text_change_timer.start)
+            except TypeError:
+                pass
+        self.editor = None
+
+    def is_active_for(self, editor):
+        return self.active and self.editor is editor
+
     def activate_and_show(self):
+        if self.editor is None or sip.isdeleted(self.editor):
+            return
         self.active = True
         self.setVisible(True)
         self.show()
@@ -107,7 +135,7 @@ class AutoCompleteSystem(QFrame):
         self.setVisible(False)
 
     def on_text_changed_delayed(self):
-        if self.active:
+        if self.active and self.editor is not None and not sip.isdeleted(self.editor):
             self.show_completions()
 
     def get_current_word(self):
@@ -387,4 +415,12 @@ class AutoCompleteSystem(QFrame):
     def hideEvent(self, event):
         if hasattr(self, 'doc_popup'):
             self.doc_popup.hide()
-        super().hideEvent(event)
\ No newline at end of file
+        super().hideEvent(event)
+
+_controller = None
+
+def completion_controller():
+    global _controller
+    if _controller is None:
+        _controller = AutoCompleteSystem()
+    return _controller
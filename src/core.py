@@ -2,8 +2,10 @@
 import os
 import sys
 from PyQt5.QtGui import QFontDatabase
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication, QStyleFactory
 from MainWindow import MainWindow
+from StartupProfiler import StartupProfiler
 
 
 current_file = os.path.abspath(__file__)
@@ -14,68 +16,79 @@ if src_path not in sys.path:
 
 
 
+FONT_FILES = [
+    "JetBrainsMono-Light.ttf",
+    "Technology.ttf",
+    "SpaceMono-Regular.ttf",
+]
+
+_installed_fonts = {}  # font path -> family names, registered once per process
+
+def font_directory():
+    try:
+        from Uranus import font  # pip-installed package
+        return os.path.dirname(font.__file__)
+    except ImportError:
+        return os.path.join(os.path.dirname(current_file), "font")  # running from source
+
 def install_fonts():
     """
     Installs custom fonts required by Uranus IDE.
     Compatible with both source-based execution and pip-installed package mode.
-    """
 
-    try:
-        from Uranus import font
-    except ImportError:
-        print("❌ Font package not found. Ensure 'src/Uranus/font/' contains __init__.py.")
-        return
-
-    font_files = [
-        "JetBrainsMono-Light.ttf",          
-        "Technology.ttf",
-        "SpaceMono-Regular.ttf",
-
-    ]
-
-    existing_fonts = set(QFontDatabase().families())
-
-    for font_file in font_files:
-        font_path = os.path.join(os.path.dirname(font.__file__), font_file)
-        try:
-            with open(font_path, "rb") as f:
-                font_data = f.read()
-                font_id = QFontDatabase.addApplicationFontFromData(font_data)
-
-            if font_id == -1:
-                print(f"⚠️ Failed to load font: {font_file}")
-            else:
-                loaded_fonts = QFontDatabase.applicationFontFamilies(font_id)
-                print(f"✅ Font installed: {loaded_fonts[0] if loaded_fonts else font_file}")
-        except Exception as e:
-            print(f"❌ Error loading font '{font_file}': {e}")
-
-    updated_fonts = set(QFontDatabase().families())
-    newly_added = updated_fonts - existing_fonts
-
-    if newly_added:
-        print("\n📋 Fonts added by Uranus:")
-        for font in sorted(newly_added):
-            print(f"  • {font}")
-    else:
-        print("\nℹ️ No new fonts were added (they may already be installed).")
-
-def main():
-    app = QApplication(sys.argv)
+    Qt reads each file itself (addApplicationFont) and the families are taken
+    from the registration, so the system font database is never enumerated;
+    fonts registered before are skipped. Returns the installed family names.
+    """
+    font_dir = font_directory()
+    families = []
+    for font_file in FONT_FILES:
+        font_path = os.path.join(font_dir, font_file)
+        if font_path in _installed_fonts:
+            families.extend(_installed_fonts[font_path])
+            continue
+        if not os.path.isfile(font_path):
+            print(f"❌ Font not found: {font_path}")
+            continue
+        font_id = QFontDatabase.addApplicationFont(font_path)
+        if font_id == -1:
+            print(f"⚠️ Failed to load font: {font_file}")
+            continue
+        _installed_fonts[font_path] = QFontDatabase.applicationFontFamilies(font_id)
+        families.extend(_installed_fonts[font_path])
+        print(f"✅ Font installed: {', '.join(_installed_fonts[font_path]) or font_file}")
+    return families
+
+def main(profiler=None):
+    profiler = profiler or StartupProfiler(enabled=False)
+    with profiler.phase("QApplication"):
+        app = QApplication(sys.argv)
     # app.setStyle("Fusion")
-    install_fonts()
+    with profiler.phase("fonts"):
+        install_fonts()
     print("🎨 Available styles:", QStyleFactory.keys())
 
     # For Dark Mode
     #import qdarktheme
     #qdarktheme.setup_theme("dark")
 
-    window = MainWindow()
-    window.show()
+    with profiler.phase("main window"):
+        window = MainWindow()
+        window.show()
+
+    if profiler.enabled:
+        profiler.begin("first paint")
+
+        def report():
+            profiler.end()
+            profiler.stop_import_timing()
+            print(profiler.report())
+            app.exit(1 if profiler.over_budget() else 0)
+
+        # the first zero timer runs once the pending show/paint events are processed
+        QTimer.singleShot(0, report)
     sys.exit(app.exec_())
 
 
 if __name__ == "__main__":
     main()
-
-
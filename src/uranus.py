@@ -1,6 +1,7 @@
 import sys
 import os
 import subprocess
+import importlib.util
 
 sys.stdout.reconfigure(encoding='utf-8')
 
@@ -17,11 +18,13 @@ REQUIRED_PACKAGES = {
 
 
 def check_and_install(packages):
+    # find_spec locates a package without importing it, IPython alone takes ~200 ms to import
     missing = []
     for pkg_name, module_name in packages.items():
         try:
-            __import__(module_name)
-        except ImportError:
+            if importlib.util.find_spec(module_name) is None:
+                missing.append(pkg_name)
+        except (ImportError, ValueError):
             missing.append(pkg_name)
 
     if missing:
@@ -39,17 +42,39 @@ def check_and_install(packages):
             print(f"pip install {' '.join(missing)}")
             sys.exit(1)
 
-# Check dependencies before launching
-print("📦 Checking dependencies...")
-check_and_install(REQUIRED_PACKAGES)
+# worker processes of the headless runner import this module again, nothing may launch then
+if __name__ == "__main__":
+    # Headless: uranus run a.ipynb b.ipynb --jobs 8 --timeout 600
+    #           uranus sweep study.ipynb -p alpha=0.1,0.2 --collect score
+    # (before the checks below, stdout carries the JSON summary)
+    if sys.argv[1:2] == ["run"]:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from HeadlessRunner import main as run_main
+        sys.exit(run_main(sys.argv[2:]))
+    if sys.argv[1:2] == ["sweep"]:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from ParameterSweep import main as sweep_main
+        sys.exit(sweep_main(sys.argv[2:]))
 
-# Add src/ to sys.path
-project_root = os.path.dirname(os.path.abspath(__file__))
-src_path = os.path.join(project_root, "src")
-sys.path.insert(0, src_path)
+    # uranus --profile-startup[=MS]: start the IDE, print the timing breakdown after the first paint and exit
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from StartupProfiler import StartupProfiler, parse_profile_argument
+    budget = parse_profile_argument(sys.argv)
+    profiler = StartupProfiler(budget, enabled=True) if budget is not None else StartupProfiler(enabled=False)
+    profiler.start_import_timing()
 
-# Launch Uranus
-print("🚀 Launching Uranus IDE...")
-from core import main
-main()
+    # Check dependencies before launching
+    print("📦 Checking dependencies...")
+    with profiler.phase("dependency check"):
+        check_and_install(REQUIRED_PACKAGES)
 
+    # Add src/ to sys.path
+    project_root = os.path.dirname(os.path.abspath(__file__))
+    src_path = os.path.join(project_root, "src")
+    sys.path.insert(0, src_path)
+
+    # Launch Uranus
+    print("🚀 Launching Uranus IDE...")
+    with profiler.phase("imports"):
+        from core import main
+    main(profiler)
@@ -0,0 +1,4 @@
+import os, sys
+
+# the IDE modules import each other by their flat names, as they do when run from src
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
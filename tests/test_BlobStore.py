@@ -0,0 +1,73 @@
+# Tests for BlobStore.py
+import os, copy, base64
+import nbformat
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_output
+from BlobStore import BlobStore
+
+PNG = base64.b64encode(b"\x89PNG\r\n\x1a\n" + os.urandom(64)).decode("ascii")
+OTHER = base64.b64encode(b"\x89PNG\r\n\x1a\n" + os.urandom(64)).decode("ascii")
+
+
+def make_notebook():
+    return nbformat.v4.new_notebook(cells=[
+        new_code_cell("plot()", outputs=[
+            new_output("display_data", data={"image/png": PNG, "text/plain": "<Figure>"}),
+            new_output("stream", name="stdout", text="done"),
+        ]),
+        new_markdown_cell(f'<p>pasted <img src="data:image/png;base64,{PNG}"/></p>',
+                          metadata={"uranus": {"origin": "uranus"}}),
+        new_markdown_cell("![a](attachment:a.png)", attachments={"a.png": {"image/png": OTHER}}),
+    ])
+
+def test_externalize_then_inline_round_trip(tmp_path):
+    store = BlobStore(str(tmp_path / "nb.ipynb"))
+    original = make_notebook()
+    nb = copy.deepcopy(original)
+    used = store.externalize_notebook(nb)
+
+    # the same image in an output and a doc cell is stored once
+    assert len(used) == 2
+    assert sorted(os.listdir(store.directory)) == sorted(ref[len(store.prefix):] for ref in used)
+    assert nb.cells[0].outputs[0].data["image/png"].startswith(store.prefix)
+    assert nb.cells[0].outputs[0].data["text/plain"] == "<Figure>"
+    assert PNG not in nb.cells[1].source
+    assert nb.cells[2].attachments["a.png"]["image/png"].startswith(store.prefix)
+
+    # a fresh store, as when the notebook is opened again
+    BlobStore(str(tmp_path / "nb.ipynb")).inline_notebook(nb)
+    assert nb == original
+
+def test_externalize_leaves_shared_outputs_alone(tmp_path):
+    store = BlobStore(str(tmp_path / "nb.ipynb"))
+    nb = make_notebook()
+    output = nb.cells[0].outputs[0]
+    store.externalize_notebook(nb)
+    assert output.data["image/png"] == PNG  # the live cell's output is not changed
+
+def test_prune_removes_unused_blobs(tmp_path):
+    store = BlobStore(str(tmp_path / "nb.ipynb"))
+    first = store.put(PNG, "image/png")
+    second = store.put(OTHER, "image/png")
+    store.prune({second})
+    assert not os.path.exists(store.blob_path(first))
+    assert os.path.exists(store.blob_path(second))
+
+def test_missing_blob_keeps_the_reference(tmp_path):
+    store = BlobStore(str(tmp_path / "nb.ipynb"))
+    nb = make_notebook()
+    store.externalize_notebook(nb)
+    ref = nb.cells[0].outputs[0].data["image/png"]
+    os.remove(store.blob_path(ref))
+    BlobStore(str(tmp_path / "nb.ipynb")).inline_notebook(nb)
+    assert nb.cells[0].outputs[0].data["image/png"] == ref
+
+def test_dry_run_gives_the_same_references_without_writing(tmp_path):
+    store = BlobStore(str(tmp_path / "nb.ipynb"))
+    original = make_notebook()
+    dry = copy.deepcopy(original)
+    used = store.externalize_notebook(dry, write=False)
+    assert not os.path.exists(store.directory)
+
+    saved = copy.deepcopy(original)
+    assert store.externalize_notebook(saved) == used
+    assert dry == saved
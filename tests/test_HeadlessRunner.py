@@ -0,0 +1,68 @@
+# Tests for HeadlessRunner.py
+import nbformat
+from nbformat.v4 import new_code_cell, new_markdown_cell
+from HeadlessRunner import execute_notebook, inject_parameters
+from NotebookModel import NotebookModel
+from ResourceLimits import ResourceLimits
+
+
+def write_notebook(path, *cells):
+    with open(path, "w", encoding="utf-8") as f:
+        nbformat.write(nbformat.v4.new_notebook(cells=list(cells)), f)
+    return str(path)
+
+def test_execute_notebook_runs_cells_and_writes_outputs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = write_notebook(tmp_path / "nb.ipynb",
+                          new_markdown_cell("# Title"),
+                          new_code_cell("x = 6 * 7"),
+                          new_code_cell("print(x)"))
+    output = str(tmp_path / "out.ipynb")
+    records = []
+    summary = execute_notebook(path, output, report=records.append, collect=("x",))
+
+    assert summary["status"] == "ok"
+    assert summary["results"] == {"x": 42}
+    assert [record["index"] for record in records] == [1, 2]
+    nb = nbformat.read(output, as_version=4)
+    assert nb.cells[2].outputs[0]["text"].strip() == "42"
+    assert nb.cells[2].metadata["uranus"]["uid"] == records[1]["id"]
+
+def test_execute_notebook_reports_errors_and_stops_on_request(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = write_notebook(tmp_path / "nb.ipynb",
+                          new_code_cell("1 / 0"),
+                          new_code_cell("print('after')"))
+    summary = execute_notebook(path, stop_on_error=True)
+
+    assert summary["status"] == "failed"
+    assert len(summary["cells"]) == 1
+    assert summary["cells"][0]["ename"] == "ZeroDivisionError"
+    nb = nbformat.read(path, as_version=4)  # written in place
+    assert nb.cells[1].outputs == []
+
+def test_execute_notebook_parameters_and_cell_timeout(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = write_notebook(tmp_path / "nb.ipynb",
+                          new_code_cell("n = 1", metadata={"tags": ["parameters"]}),
+                          new_code_cell("result = n * 2"),
+                          new_code_cell("while True: pass"))
+    summary = execute_notebook(path, str(tmp_path / "out.ipynb"), parameters={"n": 5}, collect=("result",),
+                               limits=ResourceLimits(timeout=0.5))
+
+    assert summary["results"] == {"result": 10}
+    timed_out = summary["cells"][-1]
+    assert timed_out["ename"] == "CellTimeout"
+    assert timed_out["limit"]["kind"] == "timeout"
+
+def test_inject_parameters_follows_the_parameters_cell_and_replaces_earlier_injection():
+    nb = nbformat.v4.new_notebook(cells=[new_code_cell("import os"),
+                                         new_code_cell("a = 1", metadata={"tags": ["parameters"]}),
+                                         new_code_cell("print(a)")])
+    model = NotebookModel.from_notebook(nb)
+    inject_parameters(model, {"a": 2})
+    inject_parameters(model, {"a": 3, "name": "x"})
+
+    sources = [cell.source for cell in model.cells]
+    assert len(sources) == 4
+    assert sources[2] == "# Parameters\na = 3\nname = 'x'\n"
@@ -0,0 +1,47 @@
+# Tests for IPythonKernel.py
+import pytest
+from IPythonKernel import IPythonKernel
+
+
+@pytest.fixture
+def kernel():
+    # the shell is a process-wide singleton; every test diffs against its own snapshot
+    return IPythonKernel()
+
+def run(kernel, code):
+    kernel.run_cell(code, lambda out: None)
+
+def changed_names(diff):
+    return sorted(row["name"] for row in diff["changed"])
+
+def test_namespace_diff_reports_added_and_removed(kernel):
+    run(kernel, "x = 1\ny = [1, 2]")
+    first = kernel.inspect_namespace_diff()
+    assert {"x", "y"} <= {row["name"] for row in first["added"]}
+
+    run(kernel, "del x\nz = 3")
+    second = kernel.inspect_namespace_diff(first["snapshot"])
+    assert "x" in second["removed"]
+    assert [row["name"] for row in second["added"]] == ["z"]
+    assert second["changed"] == []
+
+def test_namespace_diff_sees_in_place_mutation(kernel):
+    run(kernel, "class P: pass\n"
+                "lst = [1, 2, 3]\nd = {'k': 1}\ns = {1, 2}\np = P()\np.v = 1\nuntouched = [0]")
+    snapshot = kernel.inspect_namespace_diff()["snapshot"]
+
+    run(kernel, "lst[0] = 99\nd['k'] = 'other'\ns.discard(1); s.add(5)\np.v = 2")
+    diff = kernel.inspect_namespace_diff(snapshot)
+    assert changed_names(diff) == ["d", "lst", "p", "p.v", "s"]
+    assert next(row for row in diff["changed"] if row["name"] == "lst")["value"][0] == 99
+
+def test_namespace_diff_sees_in_place_array_and_frame_changes(kernel):
+    pytest.importorskip("numpy")
+    pytest.importorskip("pandas")
+    run(kernel, "import numpy as np, pandas as pd\n"
+                "a = np.arange(10)\ngrid = np.zeros((500, 500))\ndf = pd.DataFrame({'c': [1, 2]})")
+    snapshot = kernel.inspect_namespace_diff()["snapshot"]
+    assert changed_names(kernel.inspect_namespace_diff(snapshot)) == []
+
+    run(kernel, "a += 5\ngrid[0, 0] = 1\ndf['c'] = [5, 6]")
+    assert changed_names(kernel.inspect_namespace_diff(snapshot)) == ["a", "df", "grid"]
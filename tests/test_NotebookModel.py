@@ -0,0 +1,76 @@
+# Tests for NotebookModel.py
+import nbformat
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_output
+from NotebookModel import CellModel, NotebookModel
+
+
+def make_notebook():
+    return nbformat.v4.new_notebook(cells=[
+        new_code_cell("x = 1\nprint(x)", outputs=[new_output("stream", name="stdout", text="1\n")],
+                      metadata={"uranus": {"uid": "first"}}),
+        new_markdown_cell("# Title", metadata={"uranus": {"origin": "uranus", "uid": "doc"}}),
+        new_markdown_cell("plain jupyter"),
+    ])
+
+def test_from_notebook_keeps_order_types_and_uids():
+    model = NotebookModel.from_notebook(make_notebook())
+    assert [cell.cell_type for cell in model.cells] == ["code", "doc_editor", "markdown"]
+    assert model.cells[0].id == "first"
+    assert model.find("doc") is model.cells[1]
+
+def test_snapshot_is_reused_until_a_change():
+    cell = CellModel("code", "a = 1")
+    first = cell.snapshot()
+    assert cell.snapshot() is first
+
+    cell.set_source("a = 1")  # same source, no change
+    assert cell.version == 0 and cell.snapshot() is first
+
+    cell.set_source("a = 2")
+    assert cell.version == 1
+    second = cell.snapshot()
+    assert second is not first and second.source == "a = 2"
+    assert first.source == "a = 1"  # published snapshots never change
+
+def test_listeners_see_structural_and_cell_events():
+    model = NotebookModel()
+    events = []
+    model.subscribe(lambda event, payload: events.append(event))
+    first, second = CellModel("code"), CellModel("code")
+    model.append(first)
+    model.append(second)
+    model.move(1, 0)
+    second.append_output(new_output("stream", name="stdout", text="hi"))
+    model.remove(0)
+    second.set_source("changed after removal")  # no longer reported
+    assert events == ["inserted", "inserted", "moved", "outputs", "removed"]
+
+def test_diff_by_id():
+    model = NotebookModel.from_notebook(make_notebook())
+    before = model.snapshot()
+    model.cells[0].set_source("x = 2")
+    model.move(2, 1)
+    model.append(CellModel("code", "new", cell_id="added"))
+    model.remove(model.cells.index(model.find("doc")))
+    diff = before.diff(model.snapshot())
+    assert diff["added"] == ["added"]
+    assert diff["removed"] == ["doc"]
+    assert diff["changed"] == [model.cells[0].id]
+    assert model.cells[1].id in diff["moved"]
+
+def test_to_notebook_round_trip_and_saved_outputs():
+    model = NotebookModel.from_notebook(make_notebook())
+    model.cells[0].append_output(new_output("display_data", data={"text/plain": "table"},
+                                            metadata={"editor": "output_data"}))
+    nb = model.snapshot().to_notebook()
+    nbformat.validate(nb)
+    assert [cell.source for cell in nb.cells] == ["x = 1\nprint(x)", "# Title", "plain jupyter"]
+    # tables refer to live kernel objects and are not written; all_outputs keeps them
+    assert [out.output_type for out in nb.cells[0].outputs] == ["stream"]
+    assert len(model.snapshot().to_notebook(all_outputs=True).cells[0].outputs) == 2
+
+def test_search():
+    snapshot = NotebookModel.from_notebook(make_notebook()).snapshot()
+    assert list(snapshot.search("PRINT")) == [("first", 2, "print(x)")]
+    assert list(snapshot.search(r"^#\s", regex=True)) == [("doc", 1, "# Title")]
+    assert list(snapshot.search("PRINT", case_sensitive=True)) == []
@@ -0,0 +1,42 @@
+# Tests for ParameterSweep.py
+import json
+import pytest
+import nbformat
+from nbformat.v4 import new_code_cell
+from ParameterSweep import parse_values, expand_grid, load_parameter_sets, sweep
+
+
+def test_parse_values():
+    assert parse_values("0.1,2,'a',name") == [0.1, 2, "a", "name"]
+
+def test_expand_grid_is_the_cartesian_product_in_order():
+    assert expand_grid({"a": [1, 2], "b": ["x", "y"]}) == [
+        {"a": 1, "b": "x"}, {"a": 1, "b": "y"}, {"a": 2, "b": "x"}, {"a": 2, "b": "y"}]
+    assert expand_grid({}) == [{}]
+
+def test_load_parameter_sets(tmp_path):
+    grid = tmp_path / "grid.json"
+    grid.write_text(json.dumps({"lr": [0.1, 0.01], "epochs": 3}))
+    assert load_parameter_sets(str(grid)) == [{"lr": 0.1, "epochs": 3}, {"lr": 0.01, "epochs": 3}]
+
+    runs = tmp_path / "runs.json"
+    runs.write_text(json.dumps([{"lr": 1}, {"lr": 2}]))
+    assert load_parameter_sets(str(runs)) == [{"lr": 1}, {"lr": 2}]
+
+    bad = tmp_path / "bad.json"
+    bad.write_text(json.dumps([1, 2]))
+    with pytest.raises(ValueError):
+        load_parameter_sets(str(bad))
+
+def test_sweep_runs_every_parameter_set(tmp_path):
+    notebook = tmp_path / "train.ipynb"
+    with open(notebook, "w", encoding="utf-8") as f:
+        nbformat.write(nbformat.v4.new_notebook(cells=[
+            new_code_cell("n = 1", metadata={"tags": ["parameters"]}),
+            new_code_cell("square = n * n"),
+        ]), f)
+    summary, rows = sweep(str(notebook), expand_grid({"n": [2, 3]}), str(tmp_path / "out"),
+                          collect=("square",), jobs=2)
+
+    assert [(row["n"], row["square"], row["status"]) for row in rows] == [(2, 4, "ok"), (3, 9, "ok")]
+    assert all(nbformat.read(row["output"], as_version=4).cells for row in rows)
@@ -0,0 +1,47 @@
+# Tests for RenderCache.py
+import os, time
+from RenderCache import RenderCache, inline_attachments
+
+
+def cache_files(cache):
+    return sorted(os.listdir(cache.directory))
+
+def test_render_hits_the_cache(tmp_path):
+    cache = RenderCache(str(tmp_path), 1024 * 1024)
+    html = cache.render("**bold**", "dark")
+    assert "<strong>bold</strong>" in html
+    assert len(cache_files(cache)) == 1
+    assert cache.render("**bold**", "dark") == html
+    assert len(cache_files(cache)) == 1
+    cache.render("**bold**", "light")  # the theme is part of the key
+    assert len(cache_files(cache)) == 2
+
+def test_data_uris_stay_out_of_entries(tmp_path):
+    cache = RenderCache(str(tmp_path), 1024 * 1024)
+    first = "data:image/png;base64," + "A" * 20000
+    second = "data:image/png;base64," + "B" * 20000
+    html = cache.render(f'<p>text <img src="{first}"/></p>')
+    assert first in html
+    assert cache.render(f'<p>text <img src="{second}"/></p>').count(second) == 1
+    # both share one small entry
+    entries = cache_files(cache)
+    assert len(entries) == 1
+    assert os.path.getsize(os.path.join(cache.directory, entries[0])) < 1000
+
+def test_eviction_keeps_the_cache_under_budget(tmp_path):
+    cache = RenderCache(str(tmp_path), 4000)
+    for index in range(20):
+        cache.render(f"entry {index} " + "x" * 400)
+        time.sleep(0.01)  # distinct mtimes
+    total = sum(os.path.getsize(os.path.join(cache.directory, name)) for name in cache_files(cache))
+    assert total <= 4000
+    # the newest entry survives, the oldest is gone
+    assert cache.get(cache.key("entry 19 " + "x" * 400, "")) is not None
+    assert cache.get(cache.key("entry 0 " + "x" * 400, "")) is None
+
+def test_inline_attachments():
+    html = '<img src="attachment:a.png"/><img src="attachment:missing.png"/>'
+    result = inline_attachments(html, {"a.png": {"image/jpeg": "JJJ", "image/png": "PPP"}})
+    assert 'src="data:image/png;base64,PPP"' in result
+    assert "attachment:missing.png" in result
+    assert inline_attachments(html, {}) == html
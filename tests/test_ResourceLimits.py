@@ -0,0 +1,56 @@
+# Tests for ResourceLimits.py
+import time
+import threading
+from ResourceLimits import (CellGuard, CellTimeout, CellOutputExceeded, ResourceLimits, output_size)
+from nbformat.v4 import new_output
+
+
+def kernel():
+    from IPythonKernel import IPythonKernel
+    return IPythonKernel()
+
+def run(code, limits=None, deadline=None):
+    guard = CellGuard(limits, deadline)
+    outputs = []
+    guard.run(kernel(), code, outputs.append)
+    return guard, outputs
+
+def test_limits_from_settings_treat_zero_as_off():
+    limits = ResourceLimits.from_settings({"Cell Timeout Seconds": 0, "Cell Output Limit KB": 4})
+    assert limits.timeout is None and limits.memory_mb is None and limits.output_kb == 4
+    assert limits.notebook_deadline() is None
+
+def test_output_size():
+    assert output_size(new_output("stream", name="stdout", text="abc")) == 3
+    assert output_size(new_output("display_data", data={"text/plain": "12345"})) == 5
+
+def test_timeout_breaks_a_loop_without_line_events():
+    start = time.monotonic()
+    guard, outputs = run("while True: pass", ResourceLimits(timeout=0.3))
+    assert time.monotonic() - start < 5
+    assert isinstance(guard.violation, CellTimeout)
+    assert outputs[-1].output_type == "error" and outputs[-1].ename == "CellTimeout"
+    assert guard.violation.to_metadata()["kind"] == "timeout"
+
+def test_notebook_deadline_bounds_the_cell():
+    guard, _ = run("x = 0\nwhile True:\n    x += 1", ResourceLimits(), deadline=time.monotonic() + 0.3)
+    assert isinstance(guard.violation, CellTimeout)
+
+def test_output_limit_drops_the_rest():
+    guard, outputs = run("for i in range(10000):\n    print('x' * 100)", ResourceLimits(output_kb=2))
+    assert isinstance(guard.violation, CellOutputExceeded)
+    assert outputs[-1].ename == "CellOutputExceeded"
+    assert sum(output_size(out) for out in outputs[:-1]) <= 2 * 1024
+
+def test_user_stop_is_not_a_violation():
+    guard = CellGuard(ResourceLimits())
+    threading.Timer(0.3, guard.request_stop).start()
+    outputs = []
+    guard.run(kernel(), "while True: pass", outputs.append)
+    assert guard.violation is None
+    assert not any(out.output_type == "error" for out in outputs)
+
+def test_a_cell_within_its_limits_runs_normally():
+    guard, outputs = run("print('done')", ResourceLimits(timeout=5, output_kb=1))
+    assert guard.violation is None
+    assert [out.text.strip() for out in outputs] == ["done"]
@@ -0,0 +1,36 @@
+# Tests for SizeEstimator.py
+import sys
+import time
+import pytest
+from SizeEstimator import SizeEstimator
+
+
+def test_containers_count_their_items_once():
+    item = "x" * 1000
+    size, exact = SizeEstimator().estimate([item, item, item])
+    assert exact
+    assert size == sys.getsizeof([item, item, item]) + sys.getsizeof(item)
+
+def test_long_containers_are_sampled():
+    values = [str(i) * 10 for i in range(10_000)]
+    size, exact = SizeEstimator(sample_size=100).estimate(values)
+    assert not exact
+    real = sys.getsizeof(values) + sum(sys.getsizeof(v) for v in values)
+    assert 0.8 * real < size < 1.2 * real
+
+def test_object_arrays_are_sampled_without_copying():
+    np = pytest.importorskip("numpy")
+    grid = np.empty((2000, 2000), dtype=object)
+    grid[:] = [[str(i) for i in range(2000)]]
+    view = grid.T[::2]  # not contiguous
+    start = time.perf_counter()
+    size, exact = SizeEstimator(sample_size=200).estimate(view)
+    assert time.perf_counter() - start < 0.5
+    assert not exact and size > view.nbytes
+
+def test_depth_and_deadline_stop_the_walk():
+    np = pytest.importorskip("numpy")
+    nested = [np.array(["a" * 100] * 10, dtype=object)]
+    assert SizeEstimator(max_depth=1).estimate(nested)[1] is False
+    size, exact = SizeEstimator(deadline=time.perf_counter() - 1).estimate(nested)
+    assert not exact and size > 0